@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+月季花动画性能基准测试
+在 SDL dummy 视频驱动下用固定种子运行 SeasonalRose，测量：
+- 完整循环中每个生命阶段（bloom/maintain/wither/dead/reset）的更新和绘制耗时
+- 花瓣数量扫描（84 → 10000 片）的更新和绘制耗时
+- 粒子数量扫描（120 → 100000 个）的更新和绘制耗时
+- 花园花朵数量扫描（10 → 1000 朵）的批量更新和绘制耗时
+结果写成 JSON；compare 模式对比基线结果并标出变慢的指标。
+
+用法示例：
+    python benchmark.py --output baseline.json
+    python benchmark.py --output current.json --compare baseline.json
+    python benchmark.py --quick --compare baseline.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+# 必须在导入 pygame 之前设置，才能在没有显示器的机器上运行
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from rose_animation import (SCREEN_WIDTH, SCREEN_HEIGHT, RANDOM_SEED, PARTICLE_TYPES, PETAL_LAYER_COUNTS,
+                            SeasonalRose)
+from rose_garden import PetalTemplate, RoseGarden
+
+STAGES = ("bloom", "maintain", "wither", "dead", "reset")
+DEFAULT_PETAL_COUNTS = (84, 500, 2000, 10000)
+DEFAULT_PARTICLE_COUNTS = (120, 1000, 10000, 100000)
+DEFAULT_GARDEN_COUNTS = (10, 100, 1000)
+SWEEP_START_FRAME = 300  # 扫描从维持期开始（花瓣完全展开、粒子最多）
+
+def timing_stats(samples) -> dict:
+    """毫秒样本的统计值"""
+    samples = np.asarray(samples, dtype=np.float64)
+    if samples.size == 0:
+        return {"frames": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0}
+    return {
+        "frames": int(samples.size),
+        "mean_ms": float(samples.mean()),
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p95_ms": float(np.percentile(samples, 95)),
+    }
+
+def create_target() -> pygame.Surface:
+    """离屏绘制目标（dummy 驱动下先设置 1x1 显示模式确定像素格式）"""
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+    return pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+
+def create_rose(petal_count: int = None, seed: int = RANDOM_SEED) -> SeasonalRose:
+    """创建固定种子的月季花；指定 petal_count 时按默认层次比例重建花瓣"""
+    rose = SeasonalRose(seed)
+    if petal_count is None or petal_count == len(rose.petals):
+        return rose
+
+    scale = petal_count / sum(PETAL_LAYER_COUNTS)
+    rose.rebuild_petals([max(1, round(count * scale)) for count in PETAL_LAYER_COUNTS])
+    return rose
+
+def bench_stages(frames: int, seed: int = RANDOM_SEED) -> dict:
+    """逐帧运行完整循环，按生命阶段统计更新和绘制耗时"""
+    target = create_target()
+    rose = create_rose(seed=seed)
+    update_times = {stage: [] for stage in STAGES}
+    draw_times = {stage: [] for stage in STAGES}
+
+    for _ in range(frames):
+        start = time.perf_counter()
+        rose.update()
+        updated = time.perf_counter()
+        rose.draw(target)
+        drawn = time.perf_counter()
+
+        update_times[rose.life_stage].append((updated - start) * 1000.0)
+        draw_times[rose.life_stage].append((drawn - updated) * 1000.0)
+
+    return {stage: {"update": timing_stats(update_times[stage]), "draw": timing_stats(draw_times[stage])}
+            for stage in STAGES}
+
+def bench_petals(counts, frames: int, seed: int = RANDOM_SEED) -> list:
+    """花瓣数量扫描：完整更新耗时和花瓣绘制耗时"""
+    target = create_target()
+    results = []
+    for count in counts:
+        rose = create_rose(count, seed)
+        rose.seek(SWEEP_START_FRAME)
+        update_times = []
+        draw_times = []
+        for _ in range(frames):
+            start = time.perf_counter()
+            rose.update()
+            updated = time.perf_counter()
+            rose.draw_petals(target)
+            drawn = time.perf_counter()
+            update_times.append((updated - start) * 1000.0)
+            draw_times.append((drawn - updated) * 1000.0)
+
+        results.append({"petals": len(rose.petals), "update": timing_stats(update_times),
+                        "draw": timing_stats(draw_times)})
+    return results
+
+def bench_particles(counts, frames: int, seed: int = RANDOM_SEED) -> list:
+    """粒子数量扫描：每帧补满到目标数量，测量向量化更新和分层绘制耗时"""
+    target = create_target()
+    results = []
+    for count in counts:
+        rose = create_rose(seed=seed)
+        rose.seek(SWEEP_START_FRAME)
+        rng = np.random.default_rng(seed)
+        colors = rose.get_current_season_colors()
+        update_times = []
+        draw_times = []
+        for _ in range(frames):
+            # 按类型轮流补充粒子，位置均匀分布在屏幕上
+            missing = count - len(rose.particles)
+            per_type = math.ceil(missing / len(PARTICLE_TYPES)) if missing > 0 else 0
+            for particle_type in PARTICLE_TYPES:
+                if per_type:
+                    rose.particles.spawn(particle_type,
+                                         rng.uniform(0, SCREEN_WIDTH, per_type),
+                                         rng.uniform(0, SCREEN_HEIGHT, per_type),
+                                         per_type, colors)
+
+            start = time.perf_counter()
+            rose.particles.update()
+            updated = time.perf_counter()
+            rose.draw_particles_optimized(target)
+            drawn = time.perf_counter()
+            update_times.append((updated - start) * 1000.0)
+            draw_times.append((drawn - updated) * 1000.0)
+
+        results.append({"particles": count, "update": timing_stats(update_times),
+                        "draw": timing_stats(draw_times)})
+    return results
+
+def bench_garden(counts, frames: int, seed: int = RANDOM_SEED) -> list:
+    """花园扫描：所有花朵的批量更新耗时和花瓣、花心的绘制耗时"""
+    target = create_target()
+    template = PetalTemplate.from_seed(seed)
+    results = []
+    for count in counts:
+        garden = RoseGarden(template)
+        garden.scatter(count, seed=seed)
+        update_times = []
+        draw_times = []
+        for _ in range(frames):
+            start = time.perf_counter()
+            garden.update()
+            updated = time.perf_counter()
+            garden.draw(target)
+            drawn = time.perf_counter()
+            update_times.append((updated - start) * 1000.0)
+            draw_times.append((drawn - updated) * 1000.0)
+
+        results.append({"roses": count, "update": timing_stats(update_times),
+                        "draw": timing_stats(draw_times)})
+    return results
+
+def run_benchmarks(cycle_frames: int = 900, sweep_frames: int = 60, petal_counts=DEFAULT_PETAL_COUNTS,
+                   particle_counts=DEFAULT_PARTICLE_COUNTS, seed: int = RANDOM_SEED,
+                   garden_counts=DEFAULT_GARDEN_COUNTS) -> dict:
+    """运行全部基准测试，返回可写成 JSON 的结果"""
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "numpy": np.__version__,
+            "seed": seed,
+            "cycle_frames": cycle_frames,
+            "sweep_frames": sweep_frames,
+        },
+        "stages": bench_stages(cycle_frames, seed),
+        "petal_sweep": bench_petals(petal_counts, sweep_frames, seed),
+        "particle_sweep": bench_particles(particle_counts, sweep_frames, seed),
+        "garden_sweep": bench_garden(garden_counts, sweep_frames, seed),
+    }
+
+def flatten_metrics(results: dict) -> dict:
+    """把结果展开成 {指标路径: p50毫秒}，例如 stages.bloom.update、petal_sweep.2000.draw"""
+    metrics = {}
+    for stage, timings in results.get("stages", {}).items():
+        for phase, stats in timings.items():
+            if stats["frames"]:  # 帧数不够时有的阶段没有样本
+                metrics[f"stages.{stage}.{phase}"] = stats["p50_ms"]
+    for sweep, key in (("petal_sweep", "petals"), ("particle_sweep", "particles"), ("garden_sweep", "roses")):
+        for row in results.get(sweep, []):
+            for phase in ("update", "draw"):
+                metrics[f"{sweep}.{row[key]}.{phase}"] = row[phase]["p50_ms"]
+    return metrics
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.10,
+                    min_delta_ms: float = 0.05) -> list:
+    """对比两次结果（p50），返回 (指标, 基线, 当前, 变化比例, 是否变慢) 列表
+
+    变慢超过 threshold 且绝对差值超过 min_delta_ms 才算回退，避免亚微秒级抖动误报。
+    """
+    old = flatten_metrics(baseline)
+    new = flatten_metrics(current)
+    rows = []
+    for name in sorted(old.keys() & new.keys()):
+        before, after = old[name], new[name]
+        change = (after - before) / before if before > 0 else 0.0
+        regressed = change > threshold and after - before > min_delta_ms
+        rows.append((name, before, after, change, regressed))
+    return rows
+
+def print_results(results: dict):
+    """打印结果摘要"""
+    print("\n📊 各阶段耗时（p50 毫秒）")
+    for stage, timings in results["stages"].items():
+        print(f"  {stage:<10} 更新 {timings['update']['p50_ms']:7.3f}   绘制 {timings['draw']['p50_ms']:7.3f}"
+              f"   ({timings['update']['frames']} 帧)")
+
+    for sweep, key, label in (("petal_sweep", "petals", "花瓣"), ("particle_sweep", "particles", "粒子"),
+                              ("garden_sweep", "roses", "花朵")):
+        print(f"\n📈 {label}数量扫描（p50 毫秒）")
+        for row in results.get(sweep, []):
+            print(f"  {row[key]:>7} {label}   更新 {row['update']['p50_ms']:8.3f}   绘制 {row['draw']['p50_ms']:8.3f}")
+
+def print_comparison(rows: list, threshold: float) -> int:
+    """打印对比结果，返回变慢的指标数量"""
+    print(f"\n🔍 与基线对比（变慢超过 {threshold:.0%} 标记为回退）")
+    regressions = 0
+    for name, before, after, change, regressed in rows:
+        mark = "❌" if regressed else "✅"
+        print(f"  {mark} {name:<32} {before:9.3f} → {after:9.3f} ms  ({change:+.1%})")
+        regressions += regressed
+    if regressions:
+        print(f"\n❌ {regressions} 项指标变慢")
+    else:
+        print("\n✅ 没有发现性能回退")
+    return regressions
+
+def parse_counts(text: str):
+    """解析逗号分隔的数量列表"""
+    try:
+        counts = tuple(int(part) for part in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"应为逗号分隔的整数，例如 84,1000,10000: {text}")
+    if any(count <= 0 for count in counts):
+        raise argparse.ArgumentTypeError(f"数量必须为正数: {text}")
+    return counts
+
+def main(argv=None):
+    """命令行入口：运行基准测试，或用 --compare 对比基线"""
+    parser = argparse.ArgumentParser(description="月季花动画性能基准测试")
+    parser.add_argument("--output", "-o", default=None, help="结果 JSON 文件路径")
+    parser.add_argument("--compare", metavar="BASELINE", default=None, help="对比的基线 JSON 文件")
+    parser.add_argument("--current", metavar="RESULTS", default=None,
+                        help="与 --compare 一起使用：直接对比已有结果，不重新运行")
+    parser.add_argument("--threshold", type=float, default=0.10, help="判定回退的变慢比例（默认 0.10）")
+    parser.add_argument("--frames", type=int, default=900, help="阶段测试的帧数（默认一个完整循环）")
+    parser.add_argument("--sweep-frames", type=int, default=60, help="每个扫描点的帧数")
+    parser.add_argument("--petals", type=parse_counts, default=DEFAULT_PETAL_COUNTS, help="花瓣数量扫描点")
+    parser.add_argument("--particles", type=parse_counts, default=DEFAULT_PARTICLE_COUNTS, help="粒子数量扫描点")
+    parser.add_argument("--roses", type=parse_counts, default=DEFAULT_GARDEN_COUNTS, help="花园花朵数量扫描点")
+    parser.add_argument("--quick", action="store_true", help="快速模式：较少的帧数和扫描点")
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED, help="随机种子")
+    args = parser.parse_args(argv)
+
+    if args.current:
+        if not args.compare:
+            parser.error("--current 需要和 --compare 一起使用")
+        with open(args.current, encoding="utf-8") as f:
+            results = json.load(f)
+    else:
+        if args.quick:
+            args.sweep_frames = 20
+            args.petals, args.particles, args.roses = args.petals[:2], args.particles[:2], args.roses[:2]
+        results = run_benchmarks(args.frames, args.sweep_frames, args.petals, args.particles, args.seed,
+                                 args.roses)
+        print_results(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 结果已保存到 {args.output}")
+
+    status = 0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if print_comparison(compare_results(baseline, results, args.threshold), args.threshold):
+            status = 1
+
+    pygame.quit()
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
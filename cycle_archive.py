@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+烘焙的循环存档
+月季花的生命周期每 total_cycle_duration（900）帧重复一次，可以把一个完整循环预先渲染成存档，
+播放时只解码像素，不再模拟和绘制。
+
+随机种子、脉动和计时器都由循环位置派生，粒子寿命也短于一个循环，预热一个循环后
+整个画面每 900 帧严格重复，从第二个循环烘焙的存档首尾无缝衔接。
+
+存档格式（小端）：
+    文件头  魔数、宽、高、帧数、关键帧间隔、RGB 掩码、帧索引的偏移
+    帧数据  每帧一条记录，逐帧顺序存放
+    帧索引  帧数 + 1 条 (偏移, 长度, 类型)，最后一条是从末帧回到首帧的回绕差分
+
+帧的类型：
+    KEY  - 关键帧：zlib 压缩的完整像素（用于跳转）
+    RUNS - 稀疏差分：与上一帧按像素异或，只保存非零的连续段 (起点, 长度, 异或值)，再 zlib 压缩
+    XOR  - 稠密差分：变化的像素太多（例如季节交叉淡化）时直接压缩整帧异或结果
+
+像素按 32 位整数存放（与烘焙时的表面格式相同），播放时 mmap 打开存档，
+解码到像素缓冲区后整块复制到显示表面。
+
+用法示例：
+    python cycle_archive.py bake rose_cycle.archive
+    python cycle_archive.py play rose_cycle.archive
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+import pygame
+
+ARCHIVE_MAGIC = b"ROSECYC1"
+ARCHIVE_HEADER = struct.Struct("<8sIIIIIIIQ")  # 魔数, 宽, 高, 帧数, 关键帧间隔, R/G/B 掩码, 索引偏移
+INDEX_DTYPE = np.dtype([("offset", "<u8"), ("size", "<u4"), ("kind", "<u4")])
+
+FRAME_KEY, FRAME_RUNS, FRAME_XOR = 0, 1, 2
+KEYFRAME_INTERVAL = 300       # 关键帧间隔（只影响跳转速度，顺序播放只解差分）
+DENSE_DELTA_FRACTION = 0.25   # 变化像素超过这个比例时改存整帧异或
+ARCHIVE_COMPRESS_LEVEL = 6
+
+def surface_pixels(surface: pygame.Surface) -> np.ndarray:
+    """32 位表面像素的 (高, 宽) uint32 视图（持有视图期间表面处于锁定状态）"""
+    if surface.get_bytesize() != 4:
+        raise ValueError(f"只支持 32 位表面，当前为 {surface.get_bitsize()} 位")
+    width, height = surface.get_size()
+    rows = np.frombuffer(surface.get_view("0"), dtype=np.uint8).reshape(height, surface.get_pitch())
+    return rows[:, :width * 4].view(np.uint32)
+
+def encode_delta(current: np.ndarray, previous: np.ndarray, level: int = ARCHIVE_COMPRESS_LEVEL) -> tuple:
+    """编码两帧之间的差分，返回 (类型, 数据)"""
+    xor = np.bitwise_xor(current, previous)
+    changed = xor != 0
+    if changed.mean() > DENSE_DELTA_FRACTION:
+        return FRAME_XOR, zlib.compress(xor.data, level)
+
+    edges = np.diff(changed.view(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1).astype(np.uint32)
+    lengths = (np.flatnonzero(edges == -1) - starts).astype(np.uint32)
+    payload = b"".join((struct.pack("<I", starts.size), starts.data, lengths.data, xor[changed].data))
+    return FRAME_RUNS, zlib.compress(payload, level)
+
+def apply_runs(pixels: np.ndarray, payload: bytes):
+    """把稀疏差分异或到像素上"""
+    count, = struct.unpack_from("<I", payload)
+    runs = np.frombuffer(payload, dtype=np.uint32, count=2 * count, offset=4)
+    starts, lengths = runs[:count].astype(np.intp), runs[count:].astype(np.intp)
+    values = np.frombuffer(payload, dtype=np.uint32, offset=4 + 8 * count)
+
+    # 每个变化像素的下标：各段起点展开后加上段内偏移
+    total = int(lengths.sum())
+    index = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(total)
+    pixels[index] ^= values
+
+class CycleArchiveWriter:
+    """逐帧写入存档：第 0 帧和每隔 keyframe_interval 帧存关键帧，其余存与上一帧的差分"""
+
+    def __init__(self, path: str, size, masks, keyframe_interval: int = KEYFRAME_INTERVAL,
+                 level: int = ARCHIVE_COMPRESS_LEVEL):
+        self.path = path
+        self.size = tuple(size)
+        self.masks = tuple(masks[:3])
+        self.keyframe_interval = keyframe_interval
+        self.level = level
+        self.records = []
+        self.first = None
+        self.previous = None
+        self.file = open(path, "wb")
+        self.file.write(b"\0" * ARCHIVE_HEADER.size)  # 文件头在 close 时补写
+
+    def _write(self, kind: int, data):
+        self.records.append((self.file.tell(), len(data), kind))
+        self.file.write(data)
+
+    def add(self, pixels: np.ndarray):
+        """追加一帧（(高, 宽) 或展平的 uint32 像素）"""
+        current = np.array(pixels, dtype=np.uint32).reshape(-1)
+        if current.size != self.size[0] * self.size[1]:
+            raise ValueError("帧尺寸与存档不一致")
+        if len(self.records) % self.keyframe_interval == 0:
+            self._write(FRAME_KEY, zlib.compress(current.data, self.level))
+        else:
+            self._write(*encode_delta(current, self.previous, self.level))
+        if self.first is None:
+            self.first = current
+        self.previous = current
+
+    def close(self) -> int:
+        """写回绕差分、帧索引和文件头，返回文件大小"""
+        frames = len(self.records)
+        if frames == 0:
+            raise ValueError("存档中没有帧")
+        self._write(*encode_delta(self.first, self.previous, self.level))
+
+        index_offset = self.file.tell()
+        self.file.write(np.array(self.records, dtype=INDEX_DTYPE).tobytes())
+        self.file.seek(0)
+        self.file.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, self.size[0], self.size[1], frames,
+                                            self.keyframe_interval, *self.masks, index_offset))
+        size = self.file.seek(0, os.SEEK_END)
+        self.file.close()
+        return size
+
+class CycleArchive:
+    """mmap 打开的存档：顺序播放时逐帧应用差分，末帧之后回绕到首帧"""
+
+    def __init__(self, path: str):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, width, height, self.frames, self.keyframe_interval,
+         rmask, gmask, bmask, index_offset) = ARCHIVE_HEADER.unpack_from(self.map)
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError(f"不是循环存档: {path}")
+        self.size = (width, height)
+        self.masks = (rmask, gmask, bmask)
+        self.index = np.frombuffer(self.map, dtype=INDEX_DTYPE, count=self.frames + 1, offset=index_offset)
+        self.pixels = np.zeros(width * height, dtype=np.uint32)
+        self.position = None  # 像素缓冲区中当前是第几帧
+        self.scratch = None   # 显示表面格式不同时使用的中转表面（存档的像素格式）
+
+    def _payload(self, record: int) -> bytes:
+        offset, size = int(self.index[record]["offset"]), int(self.index[record]["size"])
+        return zlib.decompress(self.map[offset:offset + size])
+
+    def _apply(self, record: int):
+        kind = self.index[record]["kind"]
+        payload = self._payload(record)
+        if kind == FRAME_KEY:
+            self.pixels[:] = np.frombuffer(payload, dtype=np.uint32)
+        elif kind == FRAME_XOR:
+            np.bitwise_xor(self.pixels, np.frombuffer(payload, dtype=np.uint32), out=self.pixels)
+        else:
+            apply_runs(self.pixels, payload)
+
+    def seek(self, frame: int) -> np.ndarray:
+        """解码第 frame 帧（从最近的关键帧开始应用差分）"""
+        frame %= self.frames
+        if self.position is None or not (frame - self.keyframe_interval < self.position <= frame):
+            self.position = frame - frame % self.keyframe_interval
+            self._apply(self.position)
+        while self.position < frame:
+            self.position += 1
+            self._apply(self.position)
+        return self.pixels
+
+    def next_frame(self) -> np.ndarray:
+        """解码下一帧（末帧之后用回绕差分回到第 0 帧，像素与第 0 帧完全相同）"""
+        if self.position is None:
+            return self.seek(0)
+        if self.position == self.frames - 1:
+            self._apply(self.frames)
+            self.position = 0
+            return self.pixels
+        return self.seek(self.position + 1)
+
+    def blit_to(self, surface: pygame.Surface):
+        """把当前帧复制到表面（格式相同时直接写入像素，否则经转换后 blit）"""
+        width, height = self.size
+        if surface.get_bytesize() == 4 and tuple(surface.get_masks()[:3]) == self.masks:
+            target = surface_pixels(surface)
+            target[:height, :width] = self.pixels.reshape(height, width)
+            del target
+        else:
+            if self.scratch is None:
+                self.scratch = pygame.Surface(self.size, 0, 32, self.masks + (0,))
+            target = surface_pixels(self.scratch)
+            target[:] = self.pixels.reshape(height, width)
+            del target
+            surface.blit(self.scratch, (0, 0))
+
+    def close(self):
+        del self.index
+        self.map.close()
+        self.file.close()
+
+def bake(path: str, start: int = None, with_ui: bool = True,
+         keyframe_interval: int = KEYFRAME_INTERVAL) -> dict:
+    """渲染一个完整循环并写入存档
+
+    默认从第二个循环开始烘焙：首个循环开始时屏幕上还没有粒子，预热一个循环后
+    模拟状态按周期重复，末帧之后的下一帧与首帧完全相同，循环播放没有跳变。
+    """
+    import headless_render  # 设置 dummy 视频驱动，只在烘焙时需要
+
+    animation = headless_render.create_renderer()
+    rose = animation.rose
+    cycle = rose.total_cycle_duration
+    start = cycle + 1 if start is None else start
+
+    begin = time.perf_counter()
+    writer = CycleArchiveWriter(path, animation.screen.get_size(), animation.screen.get_masks(),
+                                keyframe_interval)
+    rose.seek(start - 1)
+    for _ in range(cycle):
+        rose.update()
+        rose.draw(animation.screen)
+        if with_ui:
+            animation.draw_ui()
+        pixels = surface_pixels(animation.screen)
+        writer.add(pixels)
+        del pixels
+    size = writer.close()
+    return {"frames": cycle, "bytes": size, "seconds": time.perf_counter() - begin}
+
+def play(path: str, fps: int = 60):
+    """全屏循环播放存档（ESC 退出）"""
+    archive = CycleArchive(path)
+    pygame.init()
+    screen = pygame.display.set_mode(archive.size)
+    pygame.display.set_caption("增强季节循环月季花动画")
+    clock = pygame.time.Clock()
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+        archive.next_frame()
+        archive.blit_to(screen)
+        pygame.display.flip()
+        clock.tick(fps)
+
+    archive.close()
+    pygame.quit()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="烘焙并播放月季花动画的循环存档")
+    commands = parser.add_subparsers(dest="command")
+
+    bake_parser = commands.add_parser("bake", help="渲染一个完整循环写入存档")
+    bake_parser.add_argument("archive", help="存档路径")
+    bake_parser.add_argument("--start", type=int, default=None, help="起始帧号（默认第二个循环的第一帧）")
+    bake_parser.add_argument("--keyframe-interval", type=int, default=KEYFRAME_INTERVAL,
+                             help=f"关键帧间隔（默认 {KEYFRAME_INTERVAL}）")
+    bake_parser.add_argument("--no-ui", action="store_true", help="不绘制标题、数据面板和进度条")
+
+    play_parser = commands.add_parser("play", help="循环播放存档")
+    play_parser.add_argument("archive", help="存档路径")
+    play_parser.add_argument("--fps", type=int, default=60, help="播放帧率（默认 60）")
+
+    args = parser.parse_args(argv)
+    if args.command == "bake":
+        result = bake(args.archive, args.start, not args.no_ui, args.keyframe_interval)
+        print(f"✅ 已烘焙 {result['frames']} 帧到 {args.archive}"
+              f"（{result['bytes'] / 1e6:.1f} MB，{result['seconds']:.1f}秒）")
+    elif args.command == "play":
+        play(args.archive, args.fps)
+    else:
+        parser.print_help()
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异步帧捕获
+渲染线程每帧只把屏幕像素整块复制到复用的缓冲区（一次内存拷贝，不做格式转换），
+通过有界队列交给后台写入线程；写入线程转换成 RGB，编码为 PNG 或原始 RGB 写到磁盘。
+
+写入线程跟不上时按策略处理：
+    drop  - 没有空闲缓冲区时丢弃本帧，渲染循环不等待（默认，适合现场录制）
+    block - 等待写入线程腾出缓冲区（不丢帧，但会拖慢渲染）
+
+PNG 用 numpy + zlib 编码而不是 pygame.image.save：后者编码期间一直持有 GIL，
+会让渲染线程停顿几十毫秒；zlib 压缩时会释放 GIL。
+"""
+
+import os
+import queue
+import struct
+import sys
+import threading
+import zlib
+
+import numpy as np
+import pygame
+
+FRAME_FORMATS = ("png", "rgb")
+CAPTURE_POLICIES = ("drop", "block")
+CAPTURE_QUEUE_SIZE = 8     # 等待写入的帧数上限
+PNG_COMPRESS_LEVEL = 3     # zlib 压缩级别（级别越高文件越小，但编码更慢）
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+def frame_path(output_dir: str, frame: int, fmt: str) -> str:
+    """帧文件路径（按帧号编号）"""
+    return os.path.join(output_dir, f"frame_{frame:06d}.{fmt}")
+
+def _png_chunk(tag: bytes, data) -> bytes:
+    return struct.pack(">I", len(data)) + tag + bytes(data) + struct.pack(">I", zlib.crc32(data, zlib.crc32(tag)))
+
+def encode_png(rgb: np.ndarray, level: int = PNG_COMPRESS_LEVEL) -> bytes:
+    """把 (高, 宽, 3) 的 uint8 数组编码为 PNG（每行不做预测滤波）"""
+    height, width, _ = rgb.shape
+    rows = np.zeros((height, width * 3 + 1), dtype=np.uint8)  # 每行开头一个滤波类型字节（0）
+    rows[:, 1:] = rgb.reshape(height, width * 3)
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)  # 8 位 RGB
+    return (PNG_SIGNATURE + _png_chunk(b"IHDR", header) +
+            _png_chunk(b"IDAT", zlib.compress(rows.data, level)) + _png_chunk(b"IEND", b""))
+
+class FrameCapture:
+    """异步帧捕获：capture() 在渲染线程调用，编码和写盘在后台线程完成
+
+    缓冲区一共 queue_size + 1 个（队列里最多 queue_size 帧，写入线程手上一帧），
+    用完后放回空闲列表复用，捕获过程中不分配新的内存。
+    """
+
+    def __init__(self, output_dir: str, fmt: str = "png", policy: str = "drop",
+                 queue_size: int = CAPTURE_QUEUE_SIZE, stream: bool = False):
+        if fmt not in FRAME_FORMATS:
+            raise ValueError(f"未知的帧格式: {fmt}")
+        if policy not in CAPTURE_POLICIES:
+            raise ValueError(f"未知的队列策略: {policy}")
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.policy = policy
+        self.queue_size = queue_size
+        self.stream = stream and fmt == "rgb"  # rgb 帧可以依次拼接到一个 frames.rgb 文件
+
+        self.pending = queue.Queue(maxsize=queue_size)
+        self.free = queue.Queue()
+        self.layout = None   # 像素布局：(尺寸, 每行字节数, 每像素字节数, RGB 字节偏移)
+        self.error = None    # 写入线程中的异常，在渲染线程重新抛出
+
+        self.frame = 0       # 已提交的帧数（含丢弃的帧），也是帧文件的编号
+        self.written = 0
+        self.dropped = 0
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.thread = threading.Thread(target=self._writer, name="frame-capture", daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def pixel_layout(surface: pygame.Surface) -> tuple:
+        """表面的像素布局，RGB 三个通道在每个像素里的字节偏移由颜色位移算出"""
+        bytesize = surface.get_bytesize()
+        if bytesize not in (3, 4):
+            raise ValueError(f"只支持 24/32 位表面，当前为 {surface.get_bitsize()} 位")
+        offsets = []
+        for shift in surface.get_shifts()[:3]:
+            offset = shift // 8
+            offsets.append(offset if sys.byteorder == "little" else bytesize - 1 - offset)
+        return (surface.get_size(), surface.get_pitch(), bytesize, tuple(offsets))
+
+    def capture(self, surface: pygame.Surface) -> bool:
+        """提交一帧，返回是否被接收（drop 策略下写入线程跟不上时返回 False）"""
+        if self.error is not None:
+            raise self.error
+        self.frame += 1
+
+        if self.layout is None:
+            self.layout = self.pixel_layout(surface)
+            for _ in range(self.queue_size + 1):
+                self.free.put(bytearray(surface.get_pitch() * surface.get_height()))
+        elif self.pixel_layout(surface) != self.layout:
+            raise ValueError("捕获过程中表面的尺寸或像素格式发生了变化")
+
+        try:
+            buffer = self.free.get(block=self.policy == "block")
+        except queue.Empty:
+            self.dropped += 1
+            return False
+
+        memoryview(buffer)[:] = surface.get_view("0")  # 整块复制原始像素
+        self.pending.put((self.frame, buffer))
+        return True
+
+    def to_rgb(self, buffer: bytearray) -> np.ndarray:
+        """把原始像素转换为 (高, 宽, 3) 的 RGB 数组"""
+        (width, height), pitch, bytesize, offsets = self.layout
+        pixels = np.frombuffer(buffer, dtype=np.uint8).reshape(height, pitch)[:, :width * bytesize]
+        pixels = pixels.reshape(height, width, bytesize)
+        rgb = np.empty((height, width, 3), dtype=np.uint8)
+        for channel, offset in enumerate(offsets):
+            rgb[..., channel] = pixels[..., offset]
+        return rgb
+
+    def write_frame(self, frame: int, buffer: bytearray, stream=None):
+        """编码一帧并写到磁盘（在写入线程中调用）"""
+        rgb = self.to_rgb(buffer)
+        if stream is not None:
+            stream.write(rgb.data)
+            return
+        data = encode_png(rgb) if self.fmt == "png" else rgb.data
+        with open(frame_path(self.output_dir, frame, self.fmt), "wb") as f:
+            f.write(data)
+
+    def _writer(self):
+        """写入线程：依次取出帧写盘，收到 None 时退出"""
+        stream = open(os.path.join(self.output_dir, "frames.rgb"), "wb") if self.stream else None
+        try:
+            while True:
+                item = self.pending.get()
+                if item is None:
+                    return
+                frame, buffer = item
+                try:
+                    if self.error is None:
+                        self.write_frame(frame, buffer, stream)
+                        self.written += 1
+                except Exception as e:
+                    self.error = e
+                finally:
+                    self.free.put(buffer)
+        finally:
+            if stream is not None:
+                stream.close()
+
+    def close(self) -> dict:
+        """等待队列中的帧写完并结束写入线程，返回统计"""
+        if self.thread.is_alive():
+            self.pending.put(None)
+            self.thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.stats()
+
+    def stats(self) -> dict:
+        return {"frames": self.frame, "written": self.written, "dropped": self.dropped,
+                "queued": self.pending.qsize()}
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+帧耗时分析器
+用具名计时区间记录每帧各阶段的耗时，保存在环形缓冲区中，
+提供 p50/p95/p99 统计、屏幕叠加显示和 CSV/JSONL 导出。
+关闭时每个区间只多一次属性判断，几乎没有开销。
+"""
+
+import csv
+import json
+import time
+
+import numpy as np
+import pygame
+
+class _NullScope:
+    """关闭分析时使用的空区间"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SCOPE = _NullScope()
+
+class _Scope:
+    """计时区间：退出时把耗时累加到本帧"""
+
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+        return False
+
+class FrameProfiler:
+    """帧耗时分析器
+
+    同一帧内同名区间的耗时会累加（例如一帧补了多步模拟），end_frame 时
+    把本帧各区间的总耗时（毫秒）写入各自的环形缓冲区。
+    """
+
+    FRAME_SCOPE = "frame"  # 整帧耗时（begin_frame 到 end_frame）
+
+    def __init__(self, enabled: bool = False, capacity: int = 600):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.buffers = {}   # 区间名 -> 环形缓冲区（毫秒）
+        self.counts = {}    # 区间名 -> 累计写入的帧数
+        self.current = {}   # 本帧各区间累计的秒数
+        self.frame_start = None
+        self.show_overlay = False
+        self.font = None
+
+    def scope(self, name: str):
+        """计时区间（with 语句使用）"""
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def add(self, name: str, seconds: float):
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """结束本帧，把各区间耗时写入环形缓冲区"""
+        if not self.enabled:
+            return
+        if self.frame_start is not None:
+            self.add(self.FRAME_SCOPE, time.perf_counter() - self.frame_start)
+            self.frame_start = None
+
+        for name, seconds in self.current.items():
+            buffer = self.buffers.get(name)
+            if buffer is None:
+                buffer = np.zeros(self.capacity)
+                self.buffers[name] = buffer
+                self.counts[name] = 0
+            buffer[self.counts[name] % self.capacity] = seconds * 1000.0
+            self.counts[name] += 1
+        self.current.clear()
+
+    def samples(self, name: str) -> np.ndarray:
+        """某个区间最近的耗时样本（毫秒，不保证时间顺序）"""
+        return self.buffers[name][:min(self.counts[name], self.capacity)]
+
+    def stats(self) -> dict:
+        """每个区间的统计：样本数、平均值和 p50/p95/p99/最大值（毫秒）"""
+        result = {}
+        for name in sorted(self.buffers):
+            samples = self.samples(name)
+            p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+            result[name] = {
+                "samples": int(samples.size),
+                "mean_ms": float(samples.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(samples.max()),
+            }
+        return result
+
+    def dump(self, path: str):
+        """导出统计结果：.jsonl 每行一个区间，其它扩展名写 CSV"""
+        stats = self.stats()
+        if path.endswith(".jsonl"):
+            with open(path, "w", encoding="utf-8") as f:
+                for name, row in stats.items():
+                    f.write(json.dumps(dict(scope=name, **row)) + "\n")
+        else:
+            fields = ["scope", "samples", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                for name, row in stats.items():
+                    writer.writerow(dict(scope=name, **row))
+
+    def toggle_overlay(self):
+        """切换屏幕叠加显示（打开时顺便启用计时）"""
+        self.show_overlay = not self.show_overlay
+        if self.show_overlay:
+            self.enabled = True
+
+    def draw_overlay(self, screen: pygame.Surface, position=(20, 20)) -> pygame.Rect:
+        """在屏幕上绘制各区间的 p50/p95/p99，返回覆盖的区域"""
+        if not self.show_overlay or not self.buffers:
+            return None
+        if self.font is None:
+            self.font = pygame.font.SysFont("consolas,couriernew,monospace", 14)
+
+        lines = [f"{'scope':<24}{'p50':>8}{'p95':>8}{'p99':>8}"]
+        for name, row in self.stats().items():
+            lines.append(f"{name:<24}{row['p50_ms']:>8.2f}{row['p95_ms']:>8.2f}{row['p99_ms']:>8.2f}")
+        surfaces = [self.font.render(line, True, (240, 240, 240)) for line in lines]
+
+        line_height = self.font.get_linesize()
+        width = max(surface.get_width() for surface in surfaces) + 20
+        height = line_height * len(surfaces) + 20
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, surface in enumerate(surfaces):
+            panel.blit(surface, (10, 10 + i * line_height))
+        return screen.blit(panel, position)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+月季花动画无窗口渲染脚本
+在 SDL dummy 视频驱动下逐帧模拟并绘制到离屏表面，导出编号的 PNG 或 RGB 原始帧，
+不受 clock.tick 限速，适合在渲染服务器上批量生成展示内容。
+
+用法示例：
+    python headless_render.py --output frames --start 1 --count 900
+    python headless_render.py --output frames --size 3840x2560 --format rgb --no-ui
+    python headless_render.py --output frames --workers 4 --format rgb --stream
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import time
+
+# 必须在导入 pygame 之前设置，才能在没有显示器的机器上运行
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from frame_capture import FRAME_FORMATS, frame_path
+from rose_animation import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, ANIMATION_TIME_MAPPING, EnhancedRoseAnimation
+
+# 一个完整循环的帧数（15秒 × 60帧）
+CYCLE_FRAMES = FPS * ANIMATION_TIME_MAPPING["total_animation_cycle_seconds"]
+
+# pygame 2.1.3 起提供 tobytes，旧版本只有 tostring
+_surface_to_bytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+
+def parse_size(text: str):
+    """解析 "宽x高" 格式的分辨率"""
+    try:
+        width, height = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"分辨率格式应为 宽x高，例如 1920x1080: {text}")
+    if width <= 0 or height <= 0:
+        raise argparse.ArgumentTypeError(f"分辨率必须为正数: {text}")
+    return (width, height)
+
+def write_frame(surface: pygame.Surface, path: str, fmt: str):
+    """把一帧写到磁盘"""
+    if fmt == "png":
+        pygame.image.save(surface, path)
+    else:
+        with open(path, "wb") as f:
+            f.write(_surface_to_bytes(surface, "RGB"))
+
+def create_renderer() -> EnhancedRoseAnimation:
+    """创建绘制到离屏表面的动画对象"""
+    if pygame.display.get_surface() is None:
+        # dummy 驱动下的 1x1 显示模式只用于确定像素格式，真正的绘制目标是离屏表面
+        pygame.display.set_mode((1, 1))
+    offscreen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    # UI面板每帧都检查绑定的值：导出的每一帧都显示当帧的数值，分段并行时也与串行结果一致
+    return EnhancedRoseAnimation(screen=offscreen, ui_refresh_intervals={})
+
+def stream_path(output_dir: str, fmt: str) -> str:
+    """连续帧流文件路径（所有帧依次拼接在一个文件里）"""
+    return os.path.join(output_dir, f"frames.{fmt}")
+
+def render_range(output_dir: str, start: int, end: int, size=None, fmt: str = "png",
+                 with_ui: bool = True, stream=None) -> int:
+    """渲染帧号 [start, end) 的画面，返回写出的帧数
+    
+    帧号等于 SeasonalRose.frame_count，即第 N 帧是第 N 次 update 之后的画面。
+    起点之前用 seek 只模拟不绘制，模拟状态按循环重复，快进最多两个循环。
+    stream 为已打开的二进制文件时，帧依次追加到该文件，否则每帧写成一个编号文件。
+    """
+    animation = create_renderer()
+    rose = animation.rose
+    output = pygame.Surface(size).convert() if size and tuple(size) != animation.screen.get_size() else None
+    
+    # 快进到起始帧（只模拟，不绘制）
+    rose.seek(start - 1)
+    
+    written = 0
+    while rose.frame_count < end - 1:
+        rose.update()
+        rose.draw(animation.screen)
+        if with_ui:
+            animation.draw_ui()
+        
+        frame = animation.screen
+        if output is not None:
+            pygame.transform.smoothscale(frame, output.get_size(), output)
+            frame = output
+        
+        if stream is not None:
+            stream.write(_surface_to_bytes(frame, "RGB"))
+        else:
+            write_frame(frame, frame_path(output_dir, rose.frame_count, fmt), fmt)
+        written += 1
+    return written
+
+def split_chunks(start: int, end: int, workers: int):
+    """把帧号区间 [start, end) 切成 workers 段连续区间"""
+    count = end - start
+    workers = max(1, min(workers, count))
+    bounds = [start + count * i // workers for i in range(workers + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def _render_chunk(task) -> int:
+    """进程池任务：独立创建动画并渲染一段帧（随机流按帧号派生，与串行结果一致）"""
+    output_dir, start, end, size, fmt, with_ui, part_path = task
+    try:
+        if part_path is None:
+            return render_range(output_dir, start, end, size, fmt, with_ui)
+        with open(part_path, "wb") as stream:
+            return render_range(output_dir, start, end, size, fmt, with_ui, stream)
+    finally:
+        pygame.quit()
+
+def render_frames(output_dir: str, start: int = 1, count: int = None, size=None,
+                  fmt: str = "png", with_ui: bool = True, verbose: bool = True,
+                  workers: int = 1, stream: bool = False) -> int:
+    """渲染帧号 [start, start + count) 的画面并写到 output_dir
+    
+    workers > 1 时把区间切成连续的几段交给进程池，每个进程用 seek 快进到自己的起点；
+    stream 为 True 时 rgb 帧拼接成一个 frames.rgb 文件，分段结果按顺序合并。
+    返回写出的帧数。
+    """
+    if fmt not in FRAME_FORMATS:
+        raise ValueError(f"不支持的帧格式: {fmt}")
+    if stream and fmt != "rgb":
+        raise ValueError("只有 rgb 格式支持连续帧流输出")
+    
+    if count is None:
+        count = CYCLE_FRAMES
+    end = start + count
+    os.makedirs(output_dir, exist_ok=True)
+    
+    started = time.perf_counter()
+    chunks = split_chunks(start, end, workers)
+    if len(chunks) == 1:
+        if stream:
+            with open(stream_path(output_dir, fmt), "wb") as f:
+                written = render_range(output_dir, start, end, size, fmt, with_ui, f)
+        else:
+            written = render_range(output_dir, start, end, size, fmt, with_ui)
+    else:
+        path = stream_path(output_dir, fmt)
+        tasks = [(output_dir, chunk_start, chunk_end, size, fmt, with_ui,
+                  f"{path}.part{index:03d}" if stream else None)
+                 for index, (chunk_start, chunk_end) in enumerate(chunks)]
+        # spawn 启动的子进程不继承父进程的 SDL 状态
+        with multiprocessing.get_context("spawn").Pool(len(tasks)) as pool:
+            written = sum(pool.map(_render_chunk, tasks))
+        
+        if stream:
+            with open(path, "wb") as f:
+                for task in tasks:
+                    with open(task[-1], "rb") as part:
+                        shutil.copyfileobj(part, f)
+                    os.remove(task[-1])
+    
+    if verbose:
+        elapsed = time.perf_counter() - started
+        fps = written / elapsed if elapsed > 0 else 0.0
+        print(f"✅ 已导出 {written} 帧到 {output_dir}（{len(chunks)} 个进程，{elapsed:.1f}秒，{fps:.1f} 帧/秒）")
+    return written
+
+def main(argv=None):
+    """命令行入口"""
+    parser = argparse.ArgumentParser(description="无窗口导出月季花动画帧序列")
+    parser.add_argument("--output", "-o", default="frames", help="输出目录")
+    parser.add_argument("--start", type=int, default=1, help="起始帧号（默认 1）")
+    parser.add_argument("--count", type=int, default=None, help="导出帧数（默认一个完整循环）")
+    parser.add_argument("--size", type=parse_size, default=None,
+                        help=f"输出分辨率，例如 1920x1080（默认 {SCREEN_WIDTH}x{SCREEN_HEIGHT}）")
+    parser.add_argument("--format", choices=FRAME_FORMATS, default="png", help="帧格式：png 或 rgb 原始数据")
+    parser.add_argument("--no-ui", action="store_true", help="不绘制标题、数据面板和进度条")
+    parser.add_argument("--workers", type=int, default=1, help="并行渲染的进程数（默认 1）")
+    parser.add_argument("--stream", action="store_true", help="rgb 帧拼接成一个 frames.rgb 文件")
+    args = parser.parse_args(argv)
+    
+    if args.start < 1 or (args.count is not None and args.count < 1) or args.workers < 1:
+        parser.error("起始帧号、帧数和进程数必须为正数")
+    if args.stream and args.format != "rgb":
+        parser.error("--stream 只能和 --format rgb 一起使用")
+    
+    render_frames(args.output, args.start, args.count, args.size, args.format, not args.no_ui,
+                  workers=args.workers, stream=args.stream)
+    pygame.quit()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+物候观测数据
+把多站点、多年份的逐日观测数据（CSV 或 JSON）转换成紧凑的列式二进制文件，
+播放动画时 mmap 打开，通过 (站点, 日期) 索引 O(1) 取出当天的记录，不把整份数据读进 Python 字典。
+
+输入字段：date (YYYY-MM-DD), site, temperature, humidity, sunlight, soil_temperature, phase
+缺失的数值记为 NaN，phase 为生长阶段名称（如 budding、bloom、dormancy）。
+
+文件格式（小端）：
+    文件头  魔数、记录数、元数据长度
+    元数据  JSON：站点名、阶段名、起始日、天数跨度、各列和索引的偏移（相对数据区开头）
+    列数据  从元数据之后的 8 字节对齐处开始，每列连续存放，按 (站点, 日期) 排序
+    索引    (站点数, 天数跨度) 的 int32 表，值为记录行号，-1 表示当天没有观测
+
+用法示例：
+    python phenology_data.py convert phenology.bin observations_2020.csv observations_2021.json
+    python phenology_data.py show phenology.bin --site Beijing --date 2021-04-12
+"""
+
+import argparse
+import csv
+import datetime
+import json
+import math
+import mmap
+import struct
+import sys
+
+import numpy as np
+
+PHENOLOGY_MAGIC = b"ROSEPHN1"
+PHENOLOGY_HEADER = struct.Struct("<8sIQ")  # 魔数, 记录数, 元数据长度
+
+# 列名和类型；day 为公历序数日（date.toordinal()），site 和 phase 为名称表中的编号
+COLUMNS = (("day", "<i4"), ("site", "<u2"), ("temperature", "<f4"), ("humidity", "<f4"),
+           ("sunlight", "<f4"), ("soil_temperature", "<f4"), ("phase", "u1"))
+VALUE_COLUMNS = ("temperature", "humidity", "sunlight", "soil_temperature")
+
+def _align(offset: int, alignment: int = 8) -> int:
+    return (offset + alignment - 1) // alignment * alignment
+
+def _parse_value(text) -> float:
+    """数值字段，空值记为 NaN"""
+    if text is None or text == "":
+        return math.nan
+    return float(text)
+
+def read_observations(path: str) -> list:
+    """读取一个 CSV 或 JSON 观测文件，返回记录字典的列表"""
+    if path.endswith(".json"):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data["records"] if isinstance(data, dict) else data
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+def convert(sources: list, output: str) -> dict:
+    """把观测文件合并转换为列式二进制文件，返回记录数、站点数和天数跨度"""
+    rows = []
+    for path in sources:
+        rows.extend(read_observations(path))
+    if not rows:
+        raise ValueError("没有观测记录")
+
+    sites = sorted({str(row["site"]) for row in rows})
+    phases = sorted({str(row.get("phase") or "") for row in rows})
+    site_ids = {name: i for i, name in enumerate(sites)}
+    phase_ids = {name: i for i, name in enumerate(phases)}
+    if len(sites) > 0xFFFF or len(phases) > 0xFF:
+        raise ValueError("站点或生长阶段的种类过多")
+
+    columns = {name: np.empty(len(rows), dtype=dtype) for name, dtype in COLUMNS}
+    for i, row in enumerate(rows):
+        columns["day"][i] = datetime.date.fromisoformat(str(row["date"])).toordinal()
+        columns["site"][i] = site_ids[str(row["site"])]
+        columns["phase"][i] = phase_ids[str(row.get("phase") or "")]
+        for name in VALUE_COLUMNS:
+            columns[name][i] = _parse_value(row.get(name))
+
+    # 按 (站点, 日期) 排序，同一站点同一天只能有一条记录
+    order = np.lexsort((columns["day"], columns["site"]))
+    columns = {name: column[order] for name, column in columns.items()}
+    duplicate = (np.diff(columns["day"]) == 0) & (np.diff(columns["site"]) == 0)
+    if duplicate.any():
+        i = int(np.flatnonzero(duplicate)[0])
+        raise ValueError(f"重复的观测: {sites[columns['site'][i]]} "
+                         f"{datetime.date.fromordinal(int(columns['day'][i]))}")
+
+    first_day = int(columns["day"].min())
+    span = int(columns["day"].max()) - first_day + 1
+    index = np.full((len(sites), span), -1, dtype=np.int32)
+    index[columns["site"], columns["day"] - first_day] = np.arange(len(rows), dtype=np.int32)
+
+    meta = {"sites": sites, "phases": phases, "first_day": first_day, "span": span, "columns": {}}
+    offset = 0
+    for name, column in columns.items():
+        meta["columns"][name] = offset
+        offset = _align(offset + column.nbytes)
+    meta["index"] = offset
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+
+    with open(output, "wb") as f:
+        f.write(PHENOLOGY_HEADER.pack(PHENOLOGY_MAGIC, len(rows), len(meta_bytes)))
+        f.write(meta_bytes)
+        data_start = _align(f.tell())
+        for name, column in columns.items():
+            f.write(b"\0" * (data_start + meta["columns"][name] - f.tell()))
+            f.write(column.tobytes())
+        f.write(b"\0" * (data_start + meta["index"] - f.tell()))
+        f.write(index.tobytes())
+    return {"records": len(rows), "sites": len(sites), "days": span}
+
+class PhenologyStore:
+    """mmap 打开的物候数据：列是只读的 numpy 视图，(站点, 日期) 查表取行号"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, meta_size = PHENOLOGY_HEADER.unpack_from(self.map)
+        if magic != PHENOLOGY_MAGIC:
+            raise ValueError(f"不是物候数据文件: {path}")
+        meta_end = PHENOLOGY_HEADER.size + meta_size
+        meta = json.loads(self.map[PHENOLOGY_HEADER.size:meta_end].decode("utf-8"))
+        data_start = _align(meta_end)
+
+        self.sites = meta["sites"]
+        self.phases = meta["phases"]
+        self.site_ids = {name: i for i, name in enumerate(self.sites)}
+        self.first_day = meta["first_day"]
+        self.span = meta["span"]
+        self.columns = {name: np.frombuffer(self.map, dtype=dtype, count=self.count,
+                                           offset=data_start + meta["columns"][name])
+                        for name, dtype in COLUMNS}
+        self.index = np.frombuffer(self.map, dtype=np.int32, count=len(self.sites) * self.span,
+                                   offset=data_start + meta["index"]).reshape(len(self.sites), self.span)
+
+    def row(self, site: str, when: datetime.date) -> int:
+        """(站点, 日期) 对应的行号，没有观测时返回 -1"""
+        site_id = self.site_ids.get(site)
+        day = when.toordinal() - self.first_day
+        if site_id is None or not 0 <= day < self.span:
+            return -1
+        return int(self.index[site_id, day])
+
+    def record(self, site: str, when: datetime.date) -> dict:
+        """某站点某天的观测记录，没有观测时返回 None"""
+        row = self.row(site, when)
+        if row < 0:
+            return None
+        record = {"site": site, "date": when, "phase": self.phases[self.columns["phase"][row]]}
+        for name in VALUE_COLUMNS:
+            record[name] = float(self.columns[name][row])
+        return record
+
+    def date_range(self, site: str = None) -> tuple:
+        """有观测的第一天和最后一天（指定站点时只看该站点）"""
+        if site is None:
+            days = (self.first_day, self.first_day + self.span - 1)
+        else:
+            observed = np.flatnonzero(self.index[self.site_ids[site]] >= 0)
+            days = (self.first_day + int(observed[0]), self.first_day + int(observed[-1]))
+        return tuple(datetime.date.fromordinal(day) for day in days)
+
+    def close(self):
+        self.columns = self.index = None
+        self.map.close()
+        self.file.close()
+
+class PhenologyFeed:
+    """把动画的循环和真实天数映射到某个站点的观测日期
+
+    第 1 天对应 start（默认该站点第一年的 3 月 1 日，春季开花期开始），
+    每个循环往后推一年，超出数据范围后回到第一年。
+    """
+
+    def __init__(self, store: PhenologyStore, site: str = None, start: datetime.date = None):
+        self.store = store
+        self.site = site if site is not None else store.sites[0]
+        if self.site not in store.site_ids:
+            raise ValueError(f"数据中没有站点: {self.site}")
+        first, last = store.date_range(self.site)
+        self.start = start if start is not None else datetime.date(first.year, 3, 1)
+        self.years = max(1, last.year - self.start.year + 1)
+
+    def date_for(self, cycle: int, day: int) -> datetime.date:
+        """第 cycle 个循环的第 day 天对应的日期"""
+        year = self.start.year + cycle % self.years
+        try:
+            start = self.start.replace(year=year)
+        except ValueError:  # 2 月 29 日
+            start = self.start.replace(year=year, day=28)
+        return start + datetime.timedelta(days=day - 1)
+
+    def record(self, cycle: int, day: int) -> dict:
+        return self.store.record(self.site, self.date_for(cycle, day))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="物候观测数据转换和查询")
+    commands = parser.add_subparsers(dest="command")
+
+    convert_parser = commands.add_parser("convert", help="把 CSV/JSON 观测数据转换为列式二进制文件")
+    convert_parser.add_argument("output", help="输出文件")
+    convert_parser.add_argument("sources", nargs="+", help="观测数据文件（.csv 或 .json）")
+
+    show_parser = commands.add_parser("show", help="查询某站点某天的记录")
+    show_parser.add_argument("data", help="转换后的数据文件")
+    show_parser.add_argument("--site", default=None, help="站点名（默认第一个站点）")
+    show_parser.add_argument("--date", type=datetime.date.fromisoformat, default=None,
+                             help="日期 YYYY-MM-DD（默认该站点第一天）")
+
+    args = parser.parse_args(argv)
+    if args.command == "convert":
+        result = convert(args.sources, args.output)
+        print(f"✅ 已转换 {result['records']} 条记录（{result['sites']} 个站点，{result['days']} 天）到 {args.output}")
+    elif args.command == "show":
+        store = PhenologyStore(args.data)
+        site = args.site if args.site is not None else store.sites[0]
+        when = args.date if args.date is not None else store.date_range(site)[0]
+        print(store.record(site, when) or f"{site} {when} 没有观测")
+        store.close()
+    else:
+        parser.print_help()
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,22 @@
 import pygame
+import argparse
+import bisect
+import datetime
+import heapq
 import math
+import os
 import random
+from collections import OrderedDict, deque
 from typing import List, Tuple
+
+import numpy as np
+from frame_capture import CAPTURE_POLICIES, CAPTURE_QUEUE_SIZE, FRAME_FORMATS, FrameCapture
+from frame_profiler import FrameProfiler
+from phenology_data import PhenologyFeed, PhenologyStore
 from real_data_config import REAL_ROSE_DATA, ANIMATION_TIME_MAPPING, DATA_SOURCES, SHOW_REAL_DATA, DATA_DISPLAY_POSITION, DATA_FONT_SIZE
 
-# 设置随机种子确保花瓣形状一致性
-random.seed(42)  # 固定种子，确保所有用户看到相同的花瓣排列
+# 随机种子（花瓣布局、粒子发射、天气各自派生独立的随机流）
+RANDOM_SEED = 42  # 固定种子，确保所有用户看到相同的花瓣排列
 
 # 初始化Pygame
 pygame.init()
@@ -20,6 +31,149 @@ SCREEN_HEIGHT = 800
 FPS = 60
 SCREEN_CENTER = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
 
+# 季节渐变背景（顶部颜色, 底部颜色）
+SEASON_GRADIENTS = {
+    "spring": ((135, 206, 235), (240, 255, 240)),  # 天空蓝 → 淡绿
+    "summer": ((255, 215, 0), (255, 250, 240)),    # 金色 → 米色
+    "autumn": ((255, 140, 0), (255, 248, 220)),    # 橙色 → 秋日米色
+    "winter": ((176, 196, 222), (240, 248, 255)),  # 钢蓝色 → 淡蓝白
+}
+MAX_PARTICLES = 120          # 粒子数量上限
+PETAL_LAYER_COUNTS = (8, 12, 16, 20, 16, 12)  # 每层花瓣数量（从内到外，共84片）
+MAX_STEPS_PER_FRAME = 8      # 渲染卡顿时每帧最多补的模拟步数（超出的时间直接丢弃）
+KEYFRAME_INTERVAL = 60       # 每隔多少帧保存一个关键帧快照（跳帧时从最近的关键帧开始模拟）
+MAX_KEYFRAMES = 240          # 最多保留的关键帧数量（第 0 帧始终保留）
+SEASON_FADE_FRAMES = 45  # 季节切换时背景交叉淡化的帧数（0.75秒）
+PALETTE_BLEND_STEPS = 32  # 季节过渡时混合配色的级数
+WORLD_BOUNDS = (-100, -100, SCREEN_WIDTH + 100, SCREEN_HEIGHT + 100)  # 粒子存活的世界范围 (左, 上, 右, 下)
+PARTICLE_CULL_MARGIN = 40  # 粒子视口裁剪的外扩距离（世界坐标，覆盖最大的精灵半径）
+
+# 季节环境光（RGB颜色, 单位强度下的最大透明度）
+SEASON_LIGHT_COLORS = {
+    "spring": ((255, 255, 255), 50),  # 白光
+    "summer": ((255, 255, 200), 60),  # 暖黄光
+    "autumn": ((255, 200, 150), 40),  # 橙光
+    "winter": ((200, 220, 255), 30),  # 冷蓝光
+}
+LIGHT_RING_RADII = tuple(range(50, 300, 20))  # 中心光源的同心光环半径
+LIGHT_FALLOFF_RADIUS = 300                   # 光照衰减到0的半径
+
+# 画质档位（从低到高）：粒子上限、花瓣轮廓点数、全局光晕层数、环境光环半径
+QUALITY_TIERS = (
+    {"name": "low", "max_particles": 40, "petal_points": 5, "glow_layers": 1,
+     "light_rings": tuple(range(50, 300, 50))},
+    {"name": "medium", "max_particles": 80, "petal_points": 6, "glow_layers": 2,
+     "light_rings": tuple(range(50, 300, 30))},
+    {"name": "high", "max_particles": MAX_PARTICLES, "petal_points": 8, "glow_layers": 3,
+     "light_rings": LIGHT_RING_RADII},
+    {"name": "ultra", "max_particles": 200, "petal_points": 12, "glow_layers": 4,
+     "light_rings": tuple(range(50, 300, 10))},
+)
+DEFAULT_QUALITY_TIER = 2  # high：与固定配置时的效果相同
+
+# UI面板的刷新间隔（帧）：绑定的值变化后，最多隔这么多帧才重画一次
+UI_REFRESH_INTERVALS = {
+    "title": 1,
+    "info": 6,       # 粒子数每帧都在变，约每0.1秒刷新一次就够了
+    "progress": 1,   # 进度条要跟得上动画
+    "controls": 1,
+    "data": 30,      # 只随季节变化
+    "phenology": 10, # 观测数据每个真实日（约9.5帧）变化一次
+}
+
+def _season_day_spans(time_mapping: dict) -> dict:
+    """各季节对应的真实天数区间 (第一天, 天数)，春夏秋依次相接；冬季休眠期不在其中"""
+    spans = {}
+    first_day = 1
+    for season in ("spring", "summer", "autumn"):
+        days = time_mapping[f"{season}_real_days"]
+        spans[season] = (first_day, days)
+        first_day += days
+    return spans
+
+# 由 ANIMATION_TIME_MAPPING 推出的季节天数区间；冬季休眠期固定为最后一天
+SEASON_DAY_SPANS = _season_day_spans(ANIMATION_TIME_MAPPING)
+TOTAL_REAL_DAYS = ANIMATION_TIME_MAPPING["total_real_cycle_days"]
+
+def _display_format(surface: pygame.Surface, alpha: bool = False) -> pygame.Surface:
+    """已设置显示模式时转换为显示像素格式，加快后续blit"""
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+# === 粒子引擎参数表 ===
+# 粒子类型（类型id即元组中的索引）
+PARTICLE_TYPES = (
+    "sparkle", "glow", "pollen", "magic", "falling_petal",
+    "spring_blossom", "summer_firefly", "autumn_leaf", "winter_snow",
+    "spring_rain", "summer_light", "autumn_wind",
+)
+PARTICLE_TYPE_IDS = {name: type_id for type_id, name in enumerate(PARTICLE_TYPES)}
+
+# 运动模型
+MOTION_GRAVITY = 0  # 重力/阻力（附带随机飘动和飘摆）
+MOTION_FLUTTER = 1  # 飞舞
+MOTION_ORBIT = 2    # 萤火虫绕圈
+MOTION_SWING = 3    # 落叶摆动
+MOTION_DRIFT = 4    # 雪花漂移
+MOTION_WIND = 5     # 秋风螺旋
+
+# 渲染层
+PARTICLE_LAYER_IDS = {"background": 0, "mid": 1, "foreground": 2}
+PARTICLE_LAYER_SCOPES = {layer: f"draw.particles.{layer}" for layer in PARTICLE_LAYER_IDS}  # 耗时分析区间名
+
+# 每种粒子的生成和运动参数（与 EnhancedParticle 的行为一致）
+# velocity: ("radial", 速度范围, 向上偏移) 或 ("box", vx范围, vy范围)
+# color: 季节配色键 / 固定颜色 / 候选颜色列表
+PARTICLE_SPECS = {
+    "sparkle": {"velocity": ("radial", (3, 8), 0), "size": (1, 5), "decay": (0.005, 0.02),
+                "color": (255, 255, 255), "motion": MOTION_GRAVITY, "gravity": 0.1,
+                "drag": (0.99, 0.99), "layer": "mid"},
+    "glow": {"velocity": ("box", (-0.5, 0.5), (-2, 0)), "size": (1, 5), "decay": (0.005, 0.02),
+             "color": "bloom", "motion": MOTION_GRAVITY, "gravity": 0.05, "layer": "mid"},
+    "pollen": {"velocity": ("radial", (1, 4), -1), "size": (1, 5), "decay": (0.005, 0.02),
+               "color": "glow", "motion": MOTION_GRAVITY, "gravity": 0.02, "jitter": 0.1, "layer": "mid"},
+    "magic": {"velocity": ("radial", (2, 6), 0), "size": (1, 5), "decay": (0.005, 0.02),
+              "color": "glow", "motion": MOTION_GRAVITY, "spin": 1.0, "layer": "foreground"},
+    "falling_petal": {"velocity": ("box", (-1, 1), (1, 3)), "size": (1, 5), "decay": (0.005, 0.02),
+                      "color": "bud_light", "motion": MOTION_GRAVITY, "gravity": 0.1, "sway": 0.1,
+                      "layer": "mid"},
+    "spring_blossom": {"velocity": ("radial", (1, 3), -0.5), "size": (3, 8), "decay": (0.005, 0.015),
+                       "color": (255, 182, 193), "motion": MOTION_FLUTTER, "gravity": 0.03,
+                       "phase_speed": (0.1, 0.4), "layer": "mid"},
+    "summer_firefly": {"velocity": ("box", (-1, 1), (-1, 1)), "size": (2, 5), "decay": (0.003, 0.008),
+                       "color": [(255, 255, 140), (144, 238, 144)], "motion": MOTION_ORBIT,
+                       "phase_speed": (0.05, 0.15), "phase2_speed": (0.2, 0.5), "radius": (10, 30),
+                       "layer": "foreground"},
+    "autumn_leaf": {"velocity": ("box", (-2, 2), (1, 4)), "size": (3, 8), "decay": (0.005, 0.015),
+                    "color": [(255, 140, 0), (255, 69, 0), (218, 165, 32), (139, 69, 19)],
+                    "motion": MOTION_SWING, "gravity": 0.08, "phase_speed": (0.1, 0.3),
+                    "phase2_speed": (0.1, 0.4), "layer": "mid"},
+    "winter_snow": {"velocity": ("box", (-0.5, 0.5), (0.5, 2)), "size": (2, 5), "decay": (0.003, 0.008),
+                    "color": (240, 248, 255), "motion": MOTION_DRIFT, "gravity": 0.02,
+                    "phase_speed": (0.05, 0.05), "layer": "background"},
+    "spring_rain": {"velocity": ("box", (-0.5, 0.5), (8, 15)), "size": (1, 3), "decay": (0.02, 0.05),
+                    "color": (173, 216, 230), "motion": MOTION_GRAVITY, "gravity": 0.2,
+                    "drag": (0.98, 1.0), "layer": "background"},
+    "summer_light": {"velocity": ("radial", (0.5, 2), 0), "size": (5, 12), "decay": (0.005, 0.02),
+                     "color": (255, 255, 224), "motion": MOTION_GRAVITY, "drag": (0.95, 0.95),
+                     "shimmer": 1.0, "layer": "foreground"},
+    "autumn_wind": {"velocity": ("box", (3, 8), (-1, 1)), "size": (1, 2), "decay": (0.02, 0.05),
+                    "color": (210, 180, 140), "motion": MOTION_WIND, "drag": (0.98, 1.0),
+                    "layer": "background"},
+}
+
+# 按类型id展开的查表数组（供向量化更新使用）
+PARTICLE_MOTION = np.array([PARTICLE_SPECS[t]["motion"] for t in PARTICLE_TYPES], dtype=np.int8)
+PARTICLE_GRAVITY = np.array([PARTICLE_SPECS[t].get("gravity", 0.0) for t in PARTICLE_TYPES], dtype=np.float32)
+PARTICLE_DRAG = np.array([PARTICLE_SPECS[t].get("drag", (1.0, 1.0)) for t in PARTICLE_TYPES], dtype=np.float32)
+PARTICLE_JITTER = np.array([PARTICLE_SPECS[t].get("jitter", 0.0) for t in PARTICLE_TYPES], dtype=np.float32)
+PARTICLE_SWAY = np.array([PARTICLE_SPECS[t].get("sway", 0.0) for t in PARTICLE_TYPES], dtype=np.float32)
+PARTICLE_SPIN = np.array([PARTICLE_SPECS[t].get("spin", 0.0) for t in PARTICLE_TYPES], dtype=np.float32)
+PARTICLE_SHIMMER = np.array([PARTICLE_SPECS[t].get("shimmer", 0.0) for t in PARTICLE_TYPES], dtype=np.float32)
+PARTICLE_LAYER = np.array([PARTICLE_LAYER_IDS[PARTICLE_SPECS[t]["layer"]] for t in PARTICLE_TYPES], dtype=np.int8)
+PARTICLE_ROTATED_IDS = np.array([PARTICLE_TYPE_IDS["autumn_leaf"]])
+
 # 缓动函数
 def ease_out_cubic(t):
     """三次缓出函数 - 快速开始，缓慢结束"""
@@ -52,6 +206,62 @@ def ease_in_out_sine(t):
     """正弦缓入缓出函数"""
     return -(math.cos(math.pi * t) - 1) / 2
 
+EASING_SAMPLES = 4096   # 缓动查找表的采样数
+COLOR_RAMP_STEPS = 256  # 颜色梯度表的级数
+
+class EasingTable:
+    """缓动查找表 - 在 [0, 1] 上等距采样一次，之后查表并线性插值
+    
+    scalar(t) 是给逐个花瓣用的标量版本（t 必须在 [0, 1] 内），lookup(t) 是
+    数组版本（自动夹到 [0, 1]）。4096 个采样点的插值误差在 1e-5 以下。
+    """
+    
+    def __init__(self, func, samples: int = EASING_SAMPLES):
+        self.func = func
+        self.samples = samples
+        self.scale = samples - 1
+        values = [func(i / self.scale) for i in range(samples)]
+        values.append(values[-1])  # 多存一项，t = 1 时插值不越界
+        self.values = np.array(values, dtype=np.float64)
+        self.scalar = self._make_scalar(values)
+    
+    def _make_scalar(self, values: list):
+        # 闭包里的局部变量比实例属性查找快，标量版本每帧要调用几百次
+        scale = self.scale
+        
+        def scalar(t: float) -> float:
+            x = t * scale
+            i = int(x)
+            a = values[i]
+            return a + (values[i + 1] - a) * (x - i)
+        return scalar
+    
+    def lookup(self, t) -> np.ndarray:
+        """数组查表"""
+        x = np.clip(t, 0.0, 1.0) * self.scale
+        i = x.astype(np.intp)
+        a = self.values[i]
+        return a + (self.values[i + 1] - a) * (x - i)
+
+# 花瓣生命周期用到的缓动查找表
+EASE_OUT_CUBIC = EasingTable(ease_out_cubic)
+EASE_IN_OUT_CUBIC = EasingTable(ease_in_out_cubic)
+EASE_OUT_ELASTIC = EasingTable(ease_out_elastic)
+EASE_OUT_BACK = EasingTable(ease_out_back)
+
+class ColorRamp:
+    """颜色梯度表 - 预先算好 color1 → color2 的 steps + 1 个颜色，按 t 取最近的一级"""
+    
+    __slots__ = ("colors", "steps")
+    
+    def __init__(self, color1: Tuple[int, int, int], color2: Tuple[int, int, int], steps: int = COLOR_RAMP_STEPS):
+        self.steps = steps
+        self.colors = [SeasonalBloomColors.interpolate_color(color1, color2, i / steps) for i in range(steps + 1)]
+    
+    def at(self, t: float) -> Tuple[int, int, int]:
+        """t 在 [0, 1] 内"""
+        return self.colors[int(t * self.steps + 0.5)]
+
 # 季节颜色系统
 class SeasonalBloomColors:
     """季节性花朵颜色系统"""
@@ -93,53 +303,327 @@ class SeasonalBloomColors:
         b = int(color1[2] * (1 - t) + color2[2] * t)
         return (r, g, b)
     
+    _petal_ramps = {}
+    _highlights = {}
+    
     @staticmethod
-    def get_season_colors(season_phase: str):
-        """根据季节阶段获取颜色"""
-        if season_phase == "spring":
-            return {
-                'bud_deep': SeasonalBloomColors.SPRING_BUD_DEEP,
-                'bud_light': SeasonalBloomColors.SPRING_BUD_LIGHT,
-                'bloom': SeasonalBloomColors.SPRING_BLOOM,
-                'glow': SeasonalBloomColors.SPRING_GLOW,
-                'bg': SeasonalBloomColors.SPRING_BG
-            }
-        elif season_phase == "summer":
-            return {
-                'bud_deep': SeasonalBloomColors.SUMMER_BUD_DEEP,
-                'bud_light': SeasonalBloomColors.SUMMER_BUD_LIGHT,
-                'bloom': SeasonalBloomColors.SUMMER_BLOOM,
-                'glow': SeasonalBloomColors.SUMMER_GLOW,
-                'bg': SeasonalBloomColors.SUMMER_BG
-            }
-        elif season_phase == "autumn":
-            return {
-                'bud_deep': SeasonalBloomColors.AUTUMN_BUD_DEEP,
-                'bud_light': SeasonalBloomColors.AUTUMN_BUD_LIGHT,
-                'bloom': SeasonalBloomColors.AUTUMN_BLOOM,
-                'glow': SeasonalBloomColors.AUTUMN_GLOW,
-                'bg': SeasonalBloomColors.AUTUMN_BG
-            }
-        else:  # winter
-            return {
-                'bud_deep': SeasonalBloomColors.WINTER_BUD_DEEP,
-                'bud_light': SeasonalBloomColors.WINTER_BUD_LIGHT,
-                'bloom': SeasonalBloomColors.WINTER_BLOOM,
-                'glow': SeasonalBloomColors.WINTER_GLOW,
-                'bg': SeasonalBloomColors.WINTER_BG
-            }
+    def petal_ramps(season_colors: dict) -> Tuple[ColorRamp, ColorRamp, ColorRamp]:
+        """季节配色对应的花瓣颜色梯度：(内层 花苞深色→盛开色, 外层 花苞浅色→光晕色, 凋零 盛开色→暗色)"""
+        key = (season_colors['bud_deep'], season_colors['bud_light'], season_colors['bloom'], season_colors['glow'])
+        ramps = SeasonalBloomColors._petal_ramps.get(key)
+        if ramps is None:
+            bud_deep, bud_light, bloom, glow = key
+            ramps = (ColorRamp(bud_deep, bloom), ColorRamp(bud_light, glow),
+                     ColorRamp(bloom, tuple(c // 2 for c in bloom)))
+            SeasonalBloomColors._petal_ramps[key] = ramps
+        return ramps
+    
+    @staticmethod
+    def highlight_color(color: Tuple[int, int, int]) -> Tuple[int, int, int]:
+        """花瓣高光色（向白色混合30%），按颜色缓存"""
+        highlight = SeasonalBloomColors._highlights.get(color)
+        if highlight is None:
+            highlight = SeasonalBloomColors.interpolate_color(color, (255, 255, 255), 0.3)
+            SeasonalBloomColors._highlights[color] = highlight
+        return highlight
+    
+    @staticmethod
+    def get_season_colors(season_phase: str) -> dict:
+        """根据季节阶段获取颜色（返回新字典；逐帧代码请直接使用 SEASON_PALETTES）"""
+        return SEASON_PALETTES.get(season_phase).as_dict()
+
+class SeasonPalette:
+    """一套不可变的季节配色，花瓣颜色梯度在创建时一并算好
+    
+    逐帧代码用属性取色（palette.glow）；按名字取色（palette['glow']）
+    保留给粒子配置这类用字符串指定颜色角色的地方。
+    """
+    
+    ROLES = ("bud_deep", "bud_light", "bloom", "glow", "bg")
+    __slots__ = ROLES + ("ramps",)
+    
+    def __init__(self, bud_deep: tuple, bud_light: tuple, bloom: tuple, glow: tuple, bg: tuple):
+        for role, color in zip(self.ROLES, (bud_deep, bud_light, bloom, glow, bg)):
+            object.__setattr__(self, role, tuple(color))
+        object.__setattr__(self, "ramps", SeasonalBloomColors.petal_ramps(self))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("SeasonPalette is immutable")
+    
+    def __getitem__(self, role: str) -> Tuple[int, int, int]:
+        return getattr(self, role)
+    
+    def as_dict(self) -> dict:
+        return {role: getattr(self, role) for role in self.ROLES}
+    
+    def blend(self, other: "SeasonPalette", t: float) -> "SeasonPalette":
+        """逐个颜色角色向 other 混合 t"""
+        return SeasonPalette(*(SeasonalBloomColors.interpolate_color(getattr(self, role), getattr(other, role), t)
+                               for role in self.ROLES))
+
+class PaletteRegistry:
+    """季节配色注册表 - 每个季节的配色只构建一次
+    
+    resolve() 给出每帧使用的配色：季节过渡期间返回两季配色的混合，
+    混合进度量化为 blend_steps 级，混合结果同样只构建一次。
+    """
+    
+    def __init__(self, palettes: dict, blend_steps: int = PALETTE_BLEND_STEPS):
+        self.palettes = dict(palettes)
+        self.blend_steps = blend_steps
+        self.blends = {}  # (上一季, 当前季, 级数) -> SeasonPalette
+    
+    @classmethod
+    def from_season_colors(cls) -> "PaletteRegistry":
+        """由 SeasonalBloomColors 的颜色常量构建（SPRING_BUD_DEEP 等）"""
+        return cls({season: SeasonPalette(*(getattr(SeasonalBloomColors, f"{season.upper()}_{role.upper()}")
+                                            for role in SeasonPalette.ROLES))
+                    for season in ("spring", "summer", "autumn", "winter")})
+    
+    def __getitem__(self, season: str) -> SeasonPalette:
+        return self.palettes[season]
+    
+    def get(self, season: str) -> SeasonPalette:
+        """未知季节按冬季处理（与原来的 get_season_colors 一致）"""
+        return self.palettes.get(season, self.palettes["winter"])
+    
+    def resolve(self, season: str, previous: str = None, t: float = 1.0) -> SeasonPalette:
+        """本帧配色：从 previous 过渡到 season，进度 t（0 = 上一季，1 = 当前季）"""
+        palette = self.palettes[season]
+        if previous is None or t >= 1.0:
+            return palette
+        step = int(t * self.blend_steps)
+        key = (previous, season, step)
+        blended = self.blends.get(key)
+        if blended is None:
+            blended = self.palettes[previous].blend(palette, step / self.blend_steps)
+            self.blends[key] = blended
+        return blended
+
+SEASON_PALETTES = PaletteRegistry.from_season_colors()
+
+class SeasonalBackground:
+    """季节背景层 - 每个季节的渐变只烘焙一次，切换季节时交叉淡化"""
+    
+    def __init__(self, size: Tuple[int, int] = (SCREEN_WIDTH, SCREEN_HEIGHT),
+                 fade_frames: int = SEASON_FADE_FRAMES):
+        self.size = size
+        self.fade_frames = fade_frames
+        self.baked = {}  # 季节 -> 烘焙好的渐变表面
+        
+        self.current_season = None
+        self.previous_season = None
+        self.fade_progress = 1.0  # 1.0 表示没有进行中的淡化
+        self.needs_redraw = True  # 季节变化后需要至少一次整屏绘制
+    
+    def get_surface(self, season: str) -> pygame.Surface:
+        """获取季节背景表面（首次使用时烘焙）"""
+        surface = self.baked.get(season)
+        if surface is None:
+            top_color, bottom_color = SEASON_GRADIENTS[season]
+            surface = _display_format(self._bake_gradient(top_color, bottom_color))
+            self.baked[season] = surface
+        return surface
+    
+    def _bake_gradient(self, top_color: tuple, bottom_color: tuple) -> pygame.Surface:
+        """烘焙垂直渐变：先绘制单像素宽的色带，再横向拉伸"""
+        width, height = self.size
+        column = pygame.Surface((1, height))
+        for y in range(height):
+            ratio = y / height
+            r = int(top_color[0] * (1 - ratio) + bottom_color[0] * ratio)
+            g = int(top_color[1] * (1 - ratio) + bottom_color[1] * ratio)
+            b = int(top_color[2] * (1 - ratio) + bottom_color[2] * ratio)
+            column.set_at((0, y), (r, g, b))
+        return pygame.transform.scale(column, (width, height))
+    
+    def set_season(self, season: str):
+        """切换季节，必要时开始交叉淡化"""
+        if season == self.current_season:
+            return
+        
+        if self.current_season is None or self.fade_frames <= 0:
+            self.previous_season = None
+            self.fade_progress = 1.0
+        else:
+            self.previous_season = self.current_season
+            self.fade_progress = 0.0
+        self.current_season = season
+        self.needs_redraw = True
+    
+    @property
+    def is_fading(self) -> bool:
+        return self.previous_season is not None and self.fade_progress < 1.0
+    
+    def update(self):
+        """推进交叉淡化（每帧调用一次）"""
+        if self.is_fading:
+            self.fade_progress = min(1.0, self.fade_progress + 1.0 / self.fade_frames)
+            if self.fade_progress >= 1.0:
+                self.previous_season = None
+    
+    def get_state(self) -> tuple:
+        return (self.current_season, self.previous_season, self.fade_progress)
+    
+    def set_state(self, state: tuple):
+        """恢复季节和淡化进度（恢复后需要整屏重绘）"""
+        self.current_season, self.previous_season, self.fade_progress = state
+        self.needs_redraw = True
+    
+    def draw(self, screen: pygame.Surface, dirty: "DirtyRectTracker" = None):
+        """绘制背景：平时一次blit，淡化期间两次
+        
+        脏矩形模式下只恢复上一帧画过的区域；淡化期间背景整体在变，必须整屏重绘。
+        """
+        current = self.get_surface(self.current_season)
+        
+        if dirty is not None:
+            if self.needs_redraw:
+                dirty.invalidate()
+            elif not dirty.full_redraw:
+                dirty.restore(screen, current)
+                return
+        
+        self.needs_redraw = self.is_fading
+        if not self.is_fading:
+            screen.blit(current, (0, 0))
+            return
+        
+        screen.blit(self.get_surface(self.previous_season), (0, 0))
+        current.set_alpha(int(255 * ease_in_out_sine(self.fade_progress)))
+        screen.blit(current, (0, 0))
+        current.set_alpha(None)
+
+class AmbientLightCache:
+    """环境光精灵缓存 - 每个季节的光环只渲染一次
+    
+    精灵按单位强度烘焙（光环透明度按0-255计算），绘制时把强度量化为
+    整数表面透明度，因此每个季节只需一张精灵，不必为每个强度级别复制一份。
+    """
+    
+    def __init__(self, ring_radii: Tuple[int, ...] = LIGHT_RING_RADII,
+                 falloff_radius: int = LIGHT_FALLOFF_RADIUS):
+        self.ring_radii = tuple(ring_radii)
+        self.falloff_radius = falloff_radius
+        self.sprites = {}  # 季节 -> 单位强度光照精灵
+        self.scaled = {}   # (季节, 缩放) -> 按相机缩放后的精灵
+    
+    def set_rings(self, ring_radii: Tuple[int, ...]):
+        """更换光环配置（清空已烘焙的精灵）"""
+        ring_radii = tuple(ring_radii)
+        if ring_radii != self.ring_radii:
+            self.ring_radii = ring_radii
+            self.sprites.clear()
+            self.scaled.clear()
+    
+    def get_sprite(self, season: str, scale: float = 1.0) -> pygame.Surface:
+        """获取季节光照精灵（首次使用时烘焙；scale 不为 1 时缓存缩放后的副本）"""
+        sprite = self.sprites.get(season)
+        if sprite is None:
+            sprite = _display_format(self._bake(SEASON_LIGHT_COLORS[season][0]), alpha=True)
+            self.sprites[season] = sprite
+        if scale == 1.0:
+            return sprite
+        
+        scaled = self.scaled.get((season, scale))
+        if scaled is None:
+            # 相机缩放时只保留当前缩放级别的副本
+            self.scaled = {key: value for key, value in self.scaled.items() if key[1] == scale}
+            size = max(1, round(sprite.get_width() * scale))
+            scaled = pygame.transform.smoothscale(sprite, (size, size))
+            self.scaled[(season, scale)] = scaled
+        return scaled
+    
+    def _bake(self, color: Tuple[int, int, int]) -> pygame.Surface:
+        """按原来逐帧绘制的顺序由内向外画同心光环（后画的大圆覆盖小圆，效果与原来相同）"""
+        radius = max(self.ring_radii) if self.ring_radii else 1
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        for ring in sorted(self.ring_radii):
+            alpha = int(255 * (self.falloff_radius - ring) / self.falloff_radius)
+            if alpha > 0:
+                pygame.draw.circle(sprite, (*color, alpha), (radius, radius), ring)
+        return sprite
+    
+    def level(self, season: str, intensity: float) -> int:
+        """把光照强度量化为表面透明度级别"""
+        return max(0, min(255, int(intensity * SEASON_LIGHT_COLORS[season][1])))
+    
+    def draw(self, screen: pygame.Surface, season: str, intensity: float,
+             center: Tuple[int, int], scale: float = 1.0) -> pygame.Rect:
+        """在光源位置（屏幕坐标）合成光照精灵，返回受影响的区域"""
+        level = self.level(season, intensity)
+        radius = (max(self.ring_radii) if self.ring_radii else 1) * scale
+        if level <= 0 or not screen.get_rect().colliderect(
+                (center[0] - radius, center[1] - radius, radius * 2, radius * 2)):
+            return pygame.Rect(center, (0, 0))
+        
+        sprite = self.get_sprite(season, scale)
+        sprite.set_alpha(level)
+        rect = sprite.get_rect(center=center)
+        return screen.blit(sprite, rect)
+
+class RandomStreams:
+    """确定性随机流 - 花瓣布局、粒子发射、天气各用一条独立的随机流
+    
+    布局流在创建花瓣时按种子顺序取数；发射流、天气流和粒子属性流每帧由
+    (种子, 流编号, 帧号) 重新派生，任意一帧的随机数只取决于帧号，
+    不依赖之前消耗了多少随机数，因此可以从任意帧开始分段渲染。
+    SeasonalRose 传入的是循环内位置，随机数每个循环重复一次。
+    """
+    
+    STREAMS = ("layout", "emission", "weather", "particles")
+    
+    def __init__(self, seed: int = RANDOM_SEED):
+        self.seed = seed
+        self.frame = 0
+        self.layout = random.Random(seed)
+        self.emission = random.Random()
+        self.weather = random.Random()
+        self.particles = np.random.default_rng()
+        self.begin_frame(0)
+    
+    def stream_seed(self, stream: str, frame: int) -> int:
+        """由种子、流编号和帧号派生出该帧的种子"""
+        index = self.STREAMS.index(stream)
+        return (self.seed << 40) | (index << 32) | (frame & 0xFFFFFFFF)
+    
+    def begin_frame(self, frame: int):
+        """为指定帧重新派生发射、天气和粒子属性随机流"""
+        self.frame = frame
+        self.emission.seed(self.stream_seed("emission", frame))
+        self.weather.seed(self.stream_seed("weather", frame))
+        self.particles = np.random.Generator(np.random.PCG64([self.seed, self.STREAMS.index("particles"), frame]))
+    
+    def get_state(self) -> dict:
+        """保存随机流状态（检查点）"""
+        return {"seed": self.seed, "frame": self.frame, "layout": self.layout.getstate()}
+    
+    def set_state(self, state: dict):
+        """从检查点恢复随机流状态"""
+        self.seed = state["seed"]
+        self.layout.setstate(state["layout"])
+        self.begin_frame(state["frame"])
 
 class EnhancedPetal:
     """增强版花瓣类 - 包含发光效果和更多细节"""
     
-    def __init__(self, layer: int, petal_index: int, total_petals_in_layer: int):
+    # 随生命周期变化的字段（快照只保存这些）
+    STATE_FIELDS = ("length", "width", "bloom_progress", "wither_progress", "rotation",
+                    "bend_factor", "distance", "glow_intensity", "glow_size", "life_stage",
+                    "current_colors", "color_ramp", "wither_ramp",
+                    "is_falling", "fall_x", "fall_y", "fall_speed", "fall_rotation")
+    
+    def __init__(self, layer: int, petal_index: int, total_petals_in_layer: int,
+                 rng: random.Random = None, center: Tuple[float, float] = SCREEN_CENTER):
+        rng = rng if rng is not None else random
+        self.center = center  # 花朵中心（世界坐标）
         self.layer = layer
         self.petal_index = petal_index
         self.total_petals = total_petals_in_layer
         
         # 基础位置和角度
         self.base_angle = (2 * math.pi * petal_index / total_petals_in_layer)
-        self.angle_offset = random.uniform(-0.15, 0.15)
+        self.angle_offset = rng.uniform(-0.15, 0.15)
         
         # 花瓣尺寸（一开始就有初始大小）
         self.base_length = 18 + layer * 12
@@ -158,13 +642,17 @@ class EnhancedPetal:
         # 发光效果（一开始就有微弱发光）
         self.glow_intensity = 0.2
         self.glow_size = 0.0
-        self.glow_pulse = random.uniform(0, 2 * math.pi)
+        self.glow_pulse = rng.uniform(0, 2 * math.pi)
         
         # 个性化参数（加快动画速度）
-        self.bloom_delay = layer * 0.05 + random.uniform(0, 0.04)  # 减少绽放延迟
-        self.wither_delay = (5 - layer) * 0.05 + random.uniform(0, 0.05)  # 减少凋零延迟
-        self.rotation_speed = random.uniform(0.7, 1.3)
-        self.bend_amplitude = random.uniform(0.2, 0.6)
+        self.bloom_delay = layer * 0.05 + rng.uniform(0, 0.04)  # 减少绽放延迟
+        self.wither_delay = (5 - layer) * 0.05 + rng.uniform(0, 0.05)  # 减少凋零延迟
+        self.rotation_speed = rng.uniform(0.7, 1.3)
+        self.bend_amplitude = rng.uniform(0.2, 0.6)
+        
+        # 飘落参数（创建时确定，每个循环的飘落轨迹相同）
+        self.fall_speed_base = rng.uniform(1, 3)
+        self.fall_rotation_base = rng.uniform(-0.05, 0.05)
         
         # 形状控制点
         self.control_points = []
@@ -173,6 +661,8 @@ class EnhancedPetal:
         # 生命周期状态（一开始就在盛开）
         self.life_stage = "bloom"  # 直接从盛开开始
         self.current_colors = {}
+        self.color_ramp = None   # 盛开颜色梯度（内外层不同）
+        self.wither_ramp = None  # 凋零变暗的颜色梯度
         
         # 飘落状态
         self.is_falling = False
@@ -181,10 +671,9 @@ class EnhancedPetal:
         self.fall_speed = 0
         self.fall_rotation = 0
         
-    def generate_enhanced_petal_shape(self):
-        """生成简化的花瓣形状（优化性能）"""
+    def generate_enhanced_petal_shape(self, num_points: int = 8):
+        """生成简化的花瓣形状（优化性能，默认8个控制点，由画质档位调整）"""
         points = []
-        num_points = 8  # 减少精度（从16减到8）
         
         for i in range(num_points):
             t = i / (num_points - 1)
@@ -204,21 +693,25 @@ class EnhancedPetal:
         
         self.control_points = points
     
-    def update_lifecycle(self, stage: str, stage_progress: float, season_colors: dict):
-        """更新生命周期状态"""
+    def get_state(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.STATE_FIELDS)
+    
+    def set_state(self, state: tuple):
+        for name, value in zip(self.STATE_FIELDS, state):
+            setattr(self, name, value)
+    
+    def update_lifecycle(self, stage: str, stage_progress: float, season_colors: dict, ramps: tuple = None):
+        """更新生命周期状态（ramps 为 SeasonalBloomColors.petal_ramps 的结果，不传时按配色查找）"""
         self.life_stage = stage
         self.current_colors = season_colors
-        
-        if stage == "bud":
-            self.update_bud_stage(stage_progress)
-        elif stage == "bloom":
-            self.update_bloom_stage(stage_progress)
-        elif stage == "maintain":
-            self.update_maintain_stage(stage_progress)
-        elif stage == "wither":
-            self.update_wither_stage(stage_progress)
-        elif stage == "dead":
-            self.update_dead_stage(stage_progress)
+        if ramps is None:
+            ramps = SeasonalBloomColors.petal_ramps(season_colors)
+        self.color_ramp = ramps[0] if self.layer <= 2 else ramps[1]
+        self.wither_ramp = ramps[2]
+        
+        updater = self.STAGE_UPDATERS.get(stage)
+        if updater is not None:
+            updater(self, stage_progress)
     
     def update_bud_stage(self, progress: float):
         """花苞阶段更新"""
@@ -236,22 +729,22 @@ class EnhancedPetal:
         self.bloom_progress = min(1.0, adjusted_progress / (1.0 - self.bloom_delay)) if self.bloom_delay < 1.0 else 0
         
         if self.bloom_progress > 0:
-            # 尺寸动画
-            size_progress = ease_out_elastic(self.bloom_progress)
+            # 尺寸动画（缓动曲线查表）
+            size_progress = EASE_OUT_ELASTIC.scalar(self.bloom_progress)
             self.length = self.base_length * size_progress
             self.width = self.base_width * size_progress
             
             # 旋转和距离
-            rotation_progress = ease_out_back(self.bloom_progress)
+            rotation_progress = EASE_OUT_BACK.scalar(self.bloom_progress)
             self.rotation = math.pi * 0.4 * rotation_progress * self.rotation_speed
             if self.petal_index % 2 == 1:
                 self.rotation *= -1
             
-            distance_progress = ease_out_cubic(self.bloom_progress)
+            distance_progress = EASE_OUT_CUBIC.scalar(self.bloom_progress)
             self.distance = self.max_distance * distance_progress
             
             # 弯曲
-            self.bend_factor = 1.0 - self.bend_amplitude * ease_in_out_cubic(self.bloom_progress)
+            self.bend_factor = 1.0 - self.bend_amplitude * EASE_IN_OUT_CUBIC.scalar(self.bloom_progress)
             
             # 发光效果
             self.glow_intensity = self.bloom_progress * 0.8
@@ -284,9 +777,9 @@ class EnhancedPetal:
         # 开始飘落
         if self.wither_progress > 0.3 and not self.is_falling:
             self.is_falling = True
-            self.fall_speed = random.uniform(1, 3)
+            self.fall_speed = self.fall_speed_base
             self.fall_x, self.fall_y = self.get_world_position()
-            self.fall_rotation = random.uniform(-0.05, 0.05)
+            self.fall_rotation = self.fall_rotation_base
         
         if self.is_falling:
             # 飘落动画
@@ -308,14 +801,18 @@ class EnhancedPetal:
         if self.is_falling:
             self.fall_y += self.fall_speed * 0.5
     
+    # 各阶段的更新方法（reset 阶段不更新花瓣）
+    STAGE_UPDATERS = {"bud": update_bud_stage, "bloom": update_bloom_stage, "maintain": update_maintain_stage,
+                      "wither": update_wither_stage, "dead": update_dead_stage}
+    
     def get_world_position(self) -> Tuple[float, float]:
         """获取花瓣世界坐标"""
         if self.is_falling:
             return (self.fall_x, self.fall_y)
         
         angle = self.base_angle + self.angle_offset
-        x = SCREEN_CENTER[0] + math.cos(angle) * self.distance
-        y = SCREEN_CENTER[1] + math.sin(angle) * self.distance
+        x = self.center[0] + math.cos(angle) * self.distance
+        y = self.center[1] + math.sin(angle) * self.distance
         return (x, y)
     
     def get_petal_vertices(self) -> List[Tuple[float, float]]:
@@ -356,23 +853,255 @@ class EnhancedPetal:
         if self.life_stage == "bud":
             return self.current_colors['bud_deep']
         elif self.life_stage in ["bloom", "maintain"]:
-            if self.layer <= 2:  # 内层
-                base_color = self.current_colors['bud_deep']
-                target_color = self.current_colors['bloom']
-            else:  # 外层
-                base_color = self.current_colors['bud_light']
-                target_color = self.current_colors['glow']
-            
+            # 内层从花苞深色到盛开色，外层从花苞浅色到光晕色（查颜色梯度表）
             progress = self.bloom_progress if self.life_stage == "bloom" else 1.0
-            return SeasonalBloomColors.interpolate_color(base_color, target_color, progress)
+            return self.color_ramp.at(progress)
         elif self.life_stage == "wither":
             # 凋零时颜色变暗
-            base_color = self.current_colors['bloom']
-            dark_color = tuple(c // 2 for c in base_color)
-            return SeasonalBloomColors.interpolate_color(base_color, dark_color, self.wither_progress)
+            return self.wither_ramp.at(self.wither_progress)
         else:  # dead
             return (100, 100, 100)
 
+class PetalBatch:
+    """花瓣批处理层 - 把所有花瓣的几何状态放进数组，一次广播算出全部顶点
+    
+    所有花瓣共享同一条单位轮廓（由 generate_enhanced_petal_shape 生成），
+    每片花瓣只是一个"缩放 → 旋转 → 平移"矩阵，顶点计算就是一次矩阵乘法。
+    """
+    
+    def __init__(self, petals: List[EnhancedPetal], center: Tuple[float, float] = SCREEN_CENTER):
+        self.center = np.array(center, dtype=np.float64)
+        self.count = len(petals)
+        
+        # 静态数据：花瓣朝向和层次
+        self.angle = np.array([p.base_angle + p.angle_offset for p in petals], dtype=np.float64)
+        self.layer = np.array([p.layer for p in petals], dtype=np.int32)
+        self.max_distance = np.array([p.max_distance for p in petals], dtype=np.float64)
+        self.direction = np.stack([np.cos(self.angle), np.sin(self.angle)], axis=1) if petals else np.zeros((0, 2))
+        self.outline = self.build_outline(petals[0].control_points) if petals else np.zeros((0, 2))
+        
+        # 动态数据（每帧从花瓣对象收集）
+        self.length = np.zeros(self.count)
+        self.width = np.zeros(self.count)
+        self.rotation = np.zeros(self.count)
+        self.distance = np.zeros(self.count)
+        self.bend_factor = np.ones(self.count)
+        self.is_falling = np.zeros(self.count, dtype=bool)
+        self.fall_pos = np.zeros((self.count, 2))
+        
+        # 上一步和当前步的完整状态 (N, 8)，用于渲染插值
+        self.previous = np.zeros((self.count, 8))
+        self.current = np.zeros((self.count, 8))
+        
+        self.pull(petals)
+        self.settle()
+    
+    @staticmethod
+    def build_outline(control_points: List[Tuple[float, float]]) -> np.ndarray:
+        """把控制点展开成闭合的单位轮廓（左侧轮廓 + 反向的右侧轮廓）"""
+        left = [(length_factor, -width_factor * 0.5) for length_factor, width_factor in control_points]
+        right = [(length_factor, width_factor * 0.5) for length_factor, width_factor in reversed(control_points[:-1])]
+        return np.array(left + right, dtype=np.float64)
+    
+    def set_outline(self, control_points: List[Tuple[float, float]]):
+        """更换共享的花瓣轮廓"""
+        self.outline = self.build_outline(control_points)
+    
+    def pull(self, petals: List[EnhancedPetal]):
+        """从花瓣对象收集本帧的几何状态"""
+        if not petals:
+            return
+        state = np.array([(p.length, p.width, p.rotation, p.distance, p.bend_factor,
+                           p.is_falling, p.fall_x, p.fall_y) for p in petals], dtype=np.float64)
+        self.previous = self.current
+        self.current = state
+        self._assign(state)
+    
+    def settle(self):
+        """丢弃上一步状态（跳帧后没有可插值的上一步）"""
+        self.previous = self.current
+    
+    def interpolate(self, alpha: float):
+        """把几何状态设为上一步和当前步之间的插值（alpha=1 即当前步）"""
+        if alpha >= 1.0:
+            self._assign(self.current)
+            return
+        state = self.previous + (self.current - self.previous) * alpha
+        # 刚开始飘落或刚复位的花瓣位置是跳变的，不插值
+        jumped = self.previous[:, 5] != self.current[:, 5]
+        state[jumped] = self.current[jumped]
+        self._assign(state)
+    
+    def _assign(self, state: np.ndarray):
+        self.length = state[:, 0]
+        self.width = state[:, 1]
+        self.rotation = state[:, 2]
+        self.distance = state[:, 3]
+        self.bend_factor = state[:, 4]
+        self.is_falling = state[:, 5] > 0
+        self.fall_pos = state[:, 6:8]
+    
+    def world_positions(self) -> np.ndarray:
+        """所有花瓣的世界坐标 (N, 2)"""
+        positions = self.center + self.direction * self.distance[:, None]
+        return np.where(self.is_falling[:, None], self.fall_pos, positions)
+    
+    def visible(self) -> np.ndarray:
+        """有面积可画的花瓣掩码"""
+        return (self.length > 0) & (self.width > 0)
+    
+    def transforms(self, indices: np.ndarray = None) -> np.ndarray:
+        """每片花瓣的 2x2 变换矩阵：旋转(朝向+自转) · 缩放(长度, 宽度×弯曲)"""
+        if indices is None:
+            indices = slice(None)
+        theta = self.angle[indices] + self.rotation[indices]
+        cos_t = np.cos(theta)
+        sin_t = np.sin(theta)
+        scale_x = self.length[indices]
+        scale_y = self.width[indices] * self.bend_factor[indices]
+        matrices = np.empty((len(theta), 2, 2))
+        matrices[:, 0, 0] = cos_t * scale_x
+        matrices[:, 0, 1] = -sin_t * scale_y
+        matrices[:, 1, 0] = sin_t * scale_x
+        matrices[:, 1, 1] = cos_t * scale_y
+        return matrices
+    
+    def vertices(self, indices: np.ndarray = None) -> np.ndarray:
+        """一次广播算出所有（或 indices 指定的）花瓣的多边形顶点 (N, 轮廓点数, 2)"""
+        positions = self.world_positions()
+        if indices is not None:
+            positions = positions[indices]
+        return self.outline @ self.transforms(indices).transpose(0, 2, 1) + positions[:, None, :]
+
+class PetalTracks:
+    """烘焙的花瓣轨道 - 盛开期和维持期每片花瓣的状态只取决于阶段内帧号和花瓣的固定参数
+    
+    创建时按帧一次算出这两个阶段的全部状态，存成 (帧, 花瓣, 字段) 的 float32 数组，
+    模拟时直接取出一帧的切片。凋零期（飘落）和其它阶段仍然逐帧模拟。
+    """
+    
+    STAGES = ("bloom", "maintain")
+    FIELDS = ("length", "width", "rotation", "distance", "bend_factor",
+              "bloom_progress", "glow_intensity", "glow_size")
+    
+    def __init__(self, petals: List[EnhancedPetal], bloom_duration: int, maintain_duration: int):
+        def column(name):
+            return np.array([getattr(p, name) for p in petals], dtype=np.float64)
+        
+        self.count = len(petals)
+        self.inner = [p.layer <= 2 for p in petals]
+        base_length, base_width = column("base_length"), column("base_width")
+        max_distance = column("max_distance")
+        
+        # 盛开期：展开进度经缓动曲线得到尺寸、旋转、距离和弯曲（与 update_bloom_stage 相同）
+        progress = (np.arange(bloom_duration) / bloom_duration)[:, None]
+        delay = column("bloom_delay")
+        bloom_progress = np.where(delay < 1.0, np.minimum(1.0, np.maximum(0, progress - delay) / (1.0 - delay)), 0)
+        rotation_sign = np.array([-1.0 if p.petal_index % 2 == 1 else 1.0 for p in petals])
+        size = EASE_OUT_ELASTIC.lookup(bloom_progress)
+        self.bloom = self._stack(
+            base_length * size, base_width * size,
+            math.pi * 0.4 * EASE_OUT_BACK.lookup(bloom_progress) * column("rotation_speed") * rotation_sign,
+            max_distance * EASE_OUT_CUBIC.lookup(bloom_progress),
+            1.0 - column("bend_amplitude") * EASE_IN_OUT_CUBIC.lookup(bloom_progress),
+            bloom_progress, bloom_progress * 0.8, base_length * 0.3 * bloom_progress)
+        # 还没开始展开的花瓣除了展开进度都保持原来的状态
+        self.bloom_opened = bloom_progress > 0
+        
+        # 维持期：完全展开，呼吸发光和微风摆动；旋转和弯曲保持盛开期最后一帧
+        progress = (np.arange(maintain_duration) / maintain_duration)[:, None]
+        breath = np.sin(progress * 12 + column("glow_pulse")) * 0.1 + 1
+        held = self.bloom[-1]
+        self.maintain = self._stack(
+            base_length, base_width, held[:, 2], max_distance + np.sin(progress * 16 + column("angle_offset")) * 2,
+            held[:, 4], 1.0, 0.9 * breath, base_length * 0.4 * breath)
+        self.tracks = {"bloom": self.bloom, "maintain": self.maintain}
+    
+    def _stack(self, *fields) -> np.ndarray:
+        frames = max(np.shape(field)[0] for field in fields if np.ndim(field) == 2)
+        track = np.empty((frames, self.count, len(fields)), dtype=np.float32)
+        for i, field in enumerate(fields):
+            track[:, :, i] = field
+        return track
+    
+    def apply(self, stage: str, frame: int, petals: List[EnhancedPetal], season_colors, ramps: tuple):
+        """把阶段内第 frame 帧的状态写回花瓣对象"""
+        if len(petals) != self.count:
+            raise ValueError(f"花瓣数量 ({len(petals)}) 与烘焙轨道 ({self.count}) 不一致，花瓣重建后需要重新烘焙")
+        rows = self.tracks[stage][frame].tolist()
+        opened = self.bloom_opened[frame].tolist() if stage == "bloom" else [True] * self.count
+        inner_ramp, outer_ramp, wither_ramp = ramps
+        for petal, row, is_opened, inner in zip(petals, rows, opened, self.inner):
+            petal.life_stage = stage
+            petal.current_colors = season_colors
+            petal.color_ramp = inner_ramp if inner else outer_ramp
+            petal.wither_ramp = wither_ramp
+            if is_opened:
+                (petal.length, petal.width, petal.rotation, petal.distance, petal.bend_factor,
+                 petal.bloom_progress, petal.glow_intensity, petal.glow_size) = row
+            else:
+                petal.bloom_progress = row[5]
+        if stage == "maintain":
+            for petal in petals:
+                petal.wither_progress = 0
+
+class PetalDrawOrder:
+    """花瓣绘制顺序索引 - 静态花瓣的层次顺序持久保存
+    
+    排序键是 (-层次, y)。静态花瓣的 y 只在花瓣几何变化（盛开期展开）时刷新；
+    开始飘落的花瓣用实时 y 二分插入到飘落序列中，之后每帧只把位置变得乱序的
+    飘落花瓣重新二分插入，再把两个有序序列归并，不对全部花瓣做完整排序。
+    """
+    
+    def __init__(self, layers: np.ndarray, static_y: np.ndarray):
+        self.layer_keys = [-int(layer) for layer in layers]
+        self.static = []
+        self.falling = []  # 飘落花瓣 (-层次, 实时y, 索引)，保持有序
+        self.falling_set = set()
+        self.set_static_y(static_y)
+    
+    def set_static_y(self, static_y):
+        """按当前 y 刷新静态花瓣的排序键（上一次的顺序几乎有序，timsort 近似线性）"""
+        self.static_keys = [(key, y, i) for i, (key, y) in enumerate(zip(self.layer_keys, np.asarray(static_y).tolist()))]
+        if self.static:
+            self.static = sorted(self.static_keys[i] for _, _, i in self.static)
+        else:
+            self.static = sorted(key for key in self.static_keys if key[2] not in self.falling_set)
+        self.static_order = [i for _, _, i in self.static]
+    
+    def update(self, is_falling: np.ndarray, positions: np.ndarray) -> List[int]:
+        """根据飘落状态和位置返回从后往前的绘制顺序"""
+        falling_now = set(np.flatnonzero(is_falling).tolist())
+        if falling_now != self.falling_set:
+            self._update_membership(falling_now, positions)
+        
+        if not self.falling:
+            return self.static_order
+        
+        # 飘落花瓣的 y 每帧都在变：原地更新排序键，只把跑到前一项之前的条目重新二分插入
+        falling = self.falling
+        for n, (key, _, i) in enumerate(falling):
+            falling[n] = (key, float(positions[i, 1]), i)
+        for n in range(1, len(falling)):
+            if falling[n] < falling[n - 1]:
+                bisect.insort(falling, falling.pop(n), 0, n)
+        return [i for _, _, i in heapq.merge(self.static, falling)]
+    
+    def _update_membership(self, falling_now: set, positions: np.ndarray):
+        """把开始飘落的花瓣移入飘落序列，把复位的花瓣放回静态序列"""
+        landed = self.falling_set - falling_now
+        if landed:
+            self.falling = [entry for entry in self.falling if entry[2] not in landed]
+            for i in landed:
+                bisect.insort(self.static, self.static_keys[i])
+        
+        for i in sorted(falling_now - self.falling_set):
+            self.static.remove(self.static_keys[i])
+            bisect.insort(self.falling, (self.static_keys[i][0], float(positions[i, 1]), i))
+        
+        self.falling_set = falling_now
+        self.static_order = [i for _, _, i in self.static]
+
 class EnhancedParticle:
     """增强版粒子类 - 支持季节特效"""
     
@@ -602,137 +1331,777 @@ class EnhancedParticle:
         """检查粒子是否还活着"""
         return self.life > 0 and self.size > 0.1 and self.y < SCREEN_HEIGHT + 100
     
-    def draw(self, screen: pygame.Surface):
-        """绘制粒子（增强季节特效版本）"""
+    def get_render_alpha(self) -> int:
+        """获取当前绘制透明度（包含闪烁效果）"""
+        alpha = int(255 * self.life / self.max_life)
+        if self.type == "summer_firefly":
+            # 萤火虫闪烁
+            alpha = int(alpha * (0.5 + 0.5 * math.sin(self.blink_phase)))
+        elif self.type == "summer_light":
+            # 光斑微光
+            alpha = int(alpha * (0.7 + 0.3 * math.sin(self.shimmer_phase)))
+        return alpha
+    
+    def get_sprite(self, atlas: "ParticleSpriteAtlas") -> Tuple[pygame.Surface, Tuple[float, float]]:
+        """从精灵图集获取粒子精灵及其左上角绘制位置"""
+        sprite, (offset_x, offset_y) = atlas.get(self.type, self.color, max(1, int(self.size)),
+                                                 self.get_render_alpha(), self.rotation)
+        return sprite, (self.x - offset_x, self.y - offset_y)
+    
+    def draw(self, screen: pygame.Surface, atlas: "ParticleSpriteAtlas" = None):
+        """绘制粒子（使用预渲染精灵）"""
         if not self.is_alive():
             return
         
-        alpha = int(255 * self.life / self.max_life)
-        current_size = max(1, int(self.size))
+        sprite, position = self.get_sprite(atlas or ParticleSpriteAtlas.shared())
+        screen.blit(sprite, position)
+
+class ParticleSpriteAtlas:
+    """粒子精灵图集 - 按类型、颜色、尺寸、透明度和旋转分桶预渲染
+    
+    每种粒子的形状只在第一次用到某个桶时光栅化一次，之后所有同桶粒子
+    直接复用同一张精灵，渲染层可以把整层粒子交给一次 Surface.blits 调用。
+    """
+    
+    ALPHA_BUCKETS = 16     # 透明度分桶数
+    ROTATION_BUCKETS = 16  # 旋转分桶数（只有落叶需要旋转）
+    MAX_SPRITES = 2048     # 缓存的精灵数量上限（LRU淘汰）
+    
+    ROTATED_TYPES = ("autumn_leaf",)
+    
+    _shared = None
+    
+    def __init__(self, max_sprites: int = MAX_SPRITES):
+        self.max_sprites = max_sprites
+        self.sprites = OrderedDict()  # 桶键 -> (精灵, 中心偏移)
+    
+    @classmethod
+    def shared(cls) -> "ParticleSpriteAtlas":
+        """模块共享的图集（供单独绘制的粒子使用）"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+    
+    def bucket(self, kind: str, color: tuple, size: int, alpha: int, rotation: float) -> tuple:
+        """把连续参数量化为桶键"""
+        step = 256 // self.ALPHA_BUCKETS
+        alpha_bucket = max(0, min(self.ALPHA_BUCKETS - 1, alpha // step))
+        if kind in self.ROTATED_TYPES:
+            turns = rotation / (2 * math.pi)
+            rotation_bucket = int(round((turns - math.floor(turns)) * self.ROTATION_BUCKETS)) % self.ROTATION_BUCKETS
+        else:
+            rotation_bucket = 0
+        return (kind, color, size, alpha_bucket, rotation_bucket)
+    
+    def get(self, kind: str, color: tuple, size: int, alpha: int,
+            rotation: float = 0.0) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        """获取精灵和它的中心偏移（绘制位置 = 粒子位置 - 偏移）"""
+        return self.get_bucket(self.bucket(kind, color, size, alpha, rotation))
+    
+    def get_bucket(self, key: tuple) -> Tuple[pygame.Surface, Tuple[int, int]]:
+        """按已经量化好的桶键获取精灵"""
+        entry = self.sprites.get(key)
+        if entry is not None:
+            self.sprites.move_to_end(key)
+            return entry
+        
+        kind, color, size, alpha_bucket, rotation_bucket = key
+        bucket_alpha = min(255, (alpha_bucket + 1) * (256 // self.ALPHA_BUCKETS) - 1)
+        bucket_rotation = 2 * math.pi * rotation_bucket / self.ROTATION_BUCKETS
+        sprite = _display_format(self._rasterize(kind, color, size, bucket_alpha, bucket_rotation), alpha=True)
+        entry = (sprite, (sprite.get_width() // 2, sprite.get_height() // 2))
+        
+        self.sprites[key] = entry
+        if len(self.sprites) > self.max_sprites:
+            self.sprites.popitem(last=False)
+        return entry
+    
+    def _rasterize(self, kind: str, color: tuple, size: int, alpha: int, rotation: float) -> pygame.Surface:
+        """把一个粒子形状绘制到居中的透明精灵上"""
+        rgba = (*color, alpha)
+        
+        if kind == "spring_blossom":
+            # 春季花瓣 - 椭圆形
+            sprite = pygame.Surface((size * 2, size * 3), pygame.SRCALPHA)
+            pygame.draw.ellipse(sprite, rgba, sprite.get_rect())
+        elif kind == "summer_firefly":
+            # 夏季萤火虫 - 外发光加内核
+            glow_size = max(size, int(size * 1.5))
+            sprite = pygame.Surface((glow_size * 2, glow_size * 2), pygame.SRCALPHA)
+            center = (glow_size, glow_size)
+            pygame.draw.circle(sprite, (*color, alpha // 3), center, glow_size)
+            pygame.draw.circle(sprite, rgba, center, size)
+        elif kind == "autumn_leaf":
+            # 秋季落叶 - 旋转的椭圆
+            leaf = pygame.Surface((size * 4, size * 6), pygame.SRCALPHA)
+            pygame.draw.ellipse(leaf, rgba, leaf.get_rect())
+            sprite = pygame.transform.rotate(leaf, math.degrees(rotation))
+        elif kind == "winter_snow":
+            # 冬季雪花 - 十字形
+            sprite = pygame.Surface((size * 2 + 3, size * 2 + 3), pygame.SRCALPHA)
+            c = size + 1
+            pygame.draw.line(sprite, rgba, (c - size, c), (c + size, c), 2)
+            pygame.draw.line(sprite, rgba, (c, c - size), (c, c + size), 2)
+            pygame.draw.line(sprite, rgba, (c - size // 2, c - size // 2), (c + size // 2, c + size // 2), 1)
+            pygame.draw.line(sprite, rgba, (c - size // 2, c + size // 2), (c + size // 2, c - size // 2), 1)
+        elif kind == "spring_rain":
+            # 春雨 - 细长椭圆
+            sprite = pygame.Surface((size, size * 4), pygame.SRCALPHA)
+            pygame.draw.ellipse(sprite, rgba, sprite.get_rect())
+        elif kind == "summer_light":
+            # 夏日光斑 - 由外向内的发光圆环
+            radius = size + 4
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            for i in reversed(range(3)):
+                pygame.draw.circle(sprite, (*color, alpha // (i + 2)), (radius, radius), size + i * 2)
+        elif kind == "autumn_wind":
+            # 秋风 - 短线条
+            sprite = pygame.Surface((size * 4 + 1, 3), pygame.SRCALPHA)
+            pygame.draw.line(sprite, rgba, (0, 1), (size * 4, 1), 2)
+        else:
+            # 默认圆形粒子（sparkle / glow / pollen / magic / falling_petal / 背景点）
+            sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, rgba, (size, size), size)
         
-        if current_size <= 0:
+        return sprite
+
+class ParticleStore:
+    """NumPy 结构数组粒子引擎 - 所有粒子状态按字段存放在连续数组中
+    
+    每个运动模型（重力/阻力、飞舞、绕圈、摆动、漂移、螺旋风）对整批粒子做
+    一次向量化更新，死亡粒子用掩码一次性压缩掉，不再逐个调用 Python 对象。
+    """
+    
+    # 字段名 -> (数据类型, 每个粒子的分量数)
+    FIELDS = {
+        "pos": (np.float32, 2),           # 位置
+        "vel": (np.float32, 2),           # 速度
+        "prev_pos": (np.float32, 2),      # 上一步的位置（渲染插值用）
+        "origin": (np.float32, 2),        # 生成位置（萤火虫绕圈中心）
+        "life": (np.float32, 1),          # 剩余生命 (0-1)
+        "decay": (np.float32, 1),         # 每帧生命衰减
+        "size": (np.float32, 1),          # 当前尺寸
+        "max_size": (np.float32, 1),      # 初始尺寸
+        "phase": (np.float32, 1),         # 主运动相位（飞舞/绕圈/摆动/漂移）
+        "phase_speed": (np.float32, 1),
+        "phase2": (np.float32, 1),        # 次相位（萤火虫闪烁/落叶翻转）
+        "phase2_speed": (np.float32, 1),
+        "radius": (np.float32, 1),        # 绕圈半径
+        "shimmer": (np.float32, 1),       # 闪烁相位
+        "pulse_speed": (np.float32, 1),
+        "rotation": (np.float32, 1),
+        "rotation_speed": (np.float32, 1),
+        "color": (np.uint16, 1),          # 颜色表索引
+        "type_id": (np.uint8, 1),         # 粒子类型id
+    }
+    
+    def __init__(self, capacity: int = 256, rng: np.random.Generator = None,
+                 bounds: Tuple[float, float, float, float] = WORLD_BOUNDS):
+        self.capacity = 0
+        self.active = 0
+        self.rng = rng if rng is not None else np.random.default_rng(42)
+        self.bounds = bounds  # 离开这个世界范围的粒子提前回收
+        
+        # 颜色表（粒子只保存索引）
+        self.colors: List[Tuple[int, int, int]] = []
+        self.color_ids = {}
+        
+        for name, (dtype, width) in self.FIELDS.items():
+            shape = (0, width) if width > 1 else (0,)
+            setattr(self, name, np.zeros(shape, dtype=dtype))
+        self._grow(capacity)
+    
+    def __len__(self) -> int:
+        return self.active
+    
+    def _grow(self, capacity: int):
+        """扩容所有字段数组（保留已有粒子）"""
+        for name, (dtype, width) in self.FIELDS.items():
+            old = getattr(self, name)
+            shape = (capacity, width) if width > 1 else (capacity,)
+            new = np.zeros(shape, dtype=dtype)
+            new[:self.active] = old[:self.active]
+            setattr(self, name, new)
+        self.capacity = capacity
+    
+    def _reserve(self, count: int) -> slice:
+        """为新粒子预留空间，返回它们所在的切片"""
+        if self.active + count > self.capacity:
+            self._grow(max(self.capacity * 2, self.active + count))
+        start = self.active
+        self.active += count
+        return slice(start, self.active)
+    
+    def _color_id(self, color: Tuple[int, int, int]) -> int:
+        """登记颜色并返回颜色表索引"""
+        color = tuple(color)
+        color_id = self.color_ids.get(color)
+        if color_id is None:
+            color_id = len(self.colors)
+            self.colors.append(color)
+            self.color_ids[color] = color_id
+        return color_id
+    
+    def count(self, particle_type: str) -> int:
+        """统计某种类型的存活粒子数量"""
+        return int(np.count_nonzero(self.type_id[:self.active] == PARTICLE_TYPE_IDS[particle_type]))
+    
+    def clear(self):
+        self.active = 0
+    
+    def get_state(self) -> dict:
+        """复制所有存活粒子的字段（颜色表只增不减，索引始终有效）"""
+        return {name: getattr(self, name)[:self.active].copy() for name in self.FIELDS}
+    
+    def set_state(self, state: dict):
+        """从 get_state 的结果恢复粒子"""
+        count = len(state["life"])
+        if count > self.capacity:
+            self._grow(count)
+        for name in self.FIELDS:
+            getattr(self, name)[:count] = state[name]
+        self.active = count
+    
+    def spawn(self, particle_type: str, x, y, count: int = 1, season_colors: dict = None):
+        """批量生成粒子（x、y 可以是标量或长度为 count 的数组）"""
+        if count <= 0:
             return
-            
-        # 根据粒子类型绘制不同效果
-        if self.type == "falling_petal":
-            # 简化的花瓣形状
-            pygame.draw.circle(screen, (*self.color, alpha), 
-                             (int(self.x), int(self.y)), current_size)
-        elif self.type == "spring_blossom":
-            # 春季花瓣 - 多层花瓣效果
-            self._draw_blossom_petal(screen, alpha, current_size)
-        elif self.type == "summer_firefly":
-            # 夏季萤火虫 - 闪烁发光效果
-            self._draw_firefly(screen, alpha, current_size)
-        elif self.type == "autumn_leaf":
-            # 秋季落叶 - 叶子形状
-            self._draw_leaf(screen, alpha, current_size)
-        elif self.type == "winter_snow":
-            # 冬季雪花 - 雪花形状
-            self._draw_snowflake(screen, alpha, current_size)
-        elif self.type == "spring_rain":
-            # 春雨 - 雨滴形状
-            self._draw_raindrop(screen, alpha, current_size)
-        elif self.type == "summer_light":
-            # 夏日光斑 - 发光圆形
-            self._draw_light_orb(screen, alpha, current_size)
-        elif self.type == "autumn_wind":
-            # 秋风 - 细线条效果
-            self._draw_wind_streak(screen, alpha, current_size)
+        
+        spec = PARTICLE_SPECS[particle_type]
+        rng = self.rng
+        new = self._reserve(count)
+        
+        self.pos[new, 0] = x
+        self.pos[new, 1] = y
+        self.origin[new] = self.pos[new]
+        self.prev_pos[new] = self.pos[new]
+        
+        # 初速度
+        velocity = spec["velocity"]
+        if velocity[0] == "radial":
+            _, speed_range, lift = velocity
+            angle = rng.uniform(0, 2 * math.pi, count)
+            speed = rng.uniform(*speed_range, count)
+            self.vel[new, 0] = np.cos(angle) * speed
+            self.vel[new, 1] = np.sin(angle) * speed + lift
         else:
-            # 默认圆形粒子
-            temp_surface = pygame.Surface((current_size * 4, current_size * 4), pygame.SRCALPHA)
-            pygame.draw.circle(temp_surface, (*self.color, alpha),
-                             (current_size * 2, current_size * 2), current_size)
-            screen.blit(temp_surface, (self.x - current_size * 2, self.y - current_size * 2))
-    
-    def _draw_blossom_petal(self, screen: pygame.Surface, alpha: int, size: int):
-        """绘制春季花瓣"""
-        # 简化的花瓣形状 - 椭圆形
-        petal_rect = pygame.Rect(0, 0, size * 2, size * 3)
-        petal_rect.center = (int(self.x), int(self.y))
-        pygame.draw.ellipse(screen, (*self.color, alpha), petal_rect)
-        
-    def _draw_firefly(self, screen: pygame.Surface, alpha: int, size: int):
-        """绘制夏季萤火虫"""
-        # 闪烁效果
-        blink_alpha = int(alpha * (0.5 + 0.5 * math.sin(self.blink_phase)))
-        glow_size = int(size * 1.5)
-        
-        # 外发光
-        if glow_size > 0:
-            temp_surface = pygame.Surface((glow_size * 4, glow_size * 4), pygame.SRCALPHA)
-            pygame.draw.circle(temp_surface, (*self.color, blink_alpha // 3),
-                             (glow_size * 2, glow_size * 2), glow_size)
-            screen.blit(temp_surface, (self.x - glow_size * 2, self.y - glow_size * 2))
-        
-        # 内核
-        pygame.draw.circle(screen, (*self.color, blink_alpha), 
-                         (int(self.x), int(self.y)), size)
-    
-    def _draw_leaf(self, screen: pygame.Surface, alpha: int, size: int):
-        """绘制秋季落叶"""
-        # 简化的叶子形状 - 旋转的椭圆
-        leaf_surface = pygame.Surface((size * 4, size * 6), pygame.SRCALPHA)
-        pygame.draw.ellipse(leaf_surface, (*self.color, alpha), 
-                          (0, 0, size * 4, size * 6))
-        
-        # 旋转叶子
-        rotated_leaf = pygame.transform.rotate(leaf_surface, math.degrees(self.rotation))
-        screen.blit(rotated_leaf, (self.x - rotated_leaf.get_width() // 2, 
-                                 self.y - rotated_leaf.get_height() // 2))
-    
-    def _draw_snowflake(self, screen: pygame.Surface, alpha: int, size: int):
-        """绘制冬季雪花"""
-        # 简化的雪花 - 十字形
-        x, y = int(self.x), int(self.y)
-        color_with_alpha = (*self.color, alpha)
-        
-        # 水平线
-        pygame.draw.line(screen, color_with_alpha, (x - size, y), (x + size, y), 2)
-        # 垂直线
-        pygame.draw.line(screen, color_with_alpha, (x, y - size), (x, y + size), 2)
-        # 斜线
-        pygame.draw.line(screen, color_with_alpha, 
-                        (x - size//2, y - size//2), (x + size//2, y + size//2), 1)
-        pygame.draw.line(screen, color_with_alpha, 
-                        (x - size//2, y + size//2), (x + size//2, y - size//2), 1)
-    
-    def _draw_raindrop(self, screen: pygame.Surface, alpha: int, size: int):
-        """绘制春雨雨滴"""
-        # 简化的雨滴 - 细长椭圆
-        rain_rect = pygame.Rect(0, 0, size, size * 4)
-        rain_rect.center = (int(self.x), int(self.y))
-        pygame.draw.ellipse(screen, (*self.color, alpha), rain_rect)
-    
-    def _draw_light_orb(self, screen: pygame.Surface, alpha: int, size: int):
-        """绘制夏日光斑"""
-        # 发光球体效果
-        shimmer_alpha = int(alpha * (0.7 + 0.3 * math.sin(self.shimmer_phase)))
-        
-        # 外发光
-        for i in range(3):
-            glow_size = size + i * 2
-            glow_alpha = shimmer_alpha // (i + 2)
-            if glow_alpha > 0:
-                pygame.draw.circle(screen, (*self.color, glow_alpha), 
-                                 (int(self.x), int(self.y)), glow_size)
-    
-    def _draw_wind_streak(self, screen: pygame.Surface, alpha: int, size: int):
-        """绘制秋风条纹"""
-        # 简化的风条纹 - 短线条
-        start_x = int(self.x - size * 2)
-        end_x = int(self.x + size * 2)
-        y = int(self.y)
-        pygame.draw.line(screen, (*self.color, alpha), (start_x, y), (end_x, y), 2)
+            _, vx_range, vy_range = velocity
+            self.vel[new, 0] = rng.uniform(*vx_range, count)
+            self.vel[new, 1] = rng.uniform(*vy_range, count)
+        
+        # 尺寸和生命
+        self.size[new] = rng.uniform(*spec["size"], count)
+        self.max_size[new] = self.size[new]
+        self.life[new] = 1.0
+        self.decay[new] = rng.uniform(*spec["decay"], count)
+        
+        # 颜色（没有季节配色时统一为白色）
+        color = spec["color"]
+        if not season_colors:
+            self.color[new] = self._color_id((255, 255, 255))
+        elif isinstance(color, str):
+            self.color[new] = self._color_id(season_colors[color])
+        elif isinstance(color, list):
+            choices = np.array([self._color_id(c) for c in color], dtype=np.uint16)
+            self.color[new] = choices[rng.integers(0, len(choices), count)]
+        else:
+            self.color[new] = self._color_id(color)
+        
+        # 特效参数
+        self.rotation[new] = 0.0
+        self.rotation_speed[new] = rng.uniform(-0.1, 0.1, count)
+        self.shimmer[new] = rng.uniform(0, 2 * math.pi, count)
+        self.pulse_speed[new] = rng.uniform(0.1, 0.3, count)
+        self.phase[new] = rng.uniform(0, 2 * math.pi, count)
+        self.phase_speed[new] = rng.uniform(*spec.get("phase_speed", (0.0, 0.0)), count)
+        self.phase2[new] = rng.uniform(0, 2 * math.pi, count)
+        self.phase2_speed[new] = rng.uniform(*spec.get("phase2_speed", (0.0, 0.0)), count)
+        self.radius[new] = rng.uniform(*spec.get("radius", (0.0, 0.0)), count)
+        self.type_id[new] = PARTICLE_TYPE_IDS[particle_type]
+    
+    def update(self):
+        """向量化更新所有粒子，并压缩掉死亡粒子"""
+        n = self.active
+        if n == 0:
+            return
+        
+        pos = self.pos[:n]
+        vel = self.vel[:n]
+        type_id = self.type_id[:n]
+        motion = PARTICLE_MOTION[type_id]
+        
+        # 位置更新
+        self.prev_pos[:n] = pos
+        pos += vel
+        
+        # 重力和阻力（所有类型共用，系数按类型查表）
+        vel[:, 1] += PARTICLE_GRAVITY[type_id]
+        vel[:, 0] *= PARTICLE_DRAG[type_id, 0]
+        vel[:, 1] *= PARTICLE_DRAG[type_id, 1]
+        
+        self._update_gravity(np.nonzero(motion == MOTION_GRAVITY)[0], type_id)
+        self._update_flutter(np.nonzero(motion == MOTION_FLUTTER)[0])
+        self._update_orbit(np.nonzero(motion == MOTION_ORBIT)[0])
+        self._update_swing(np.nonzero(motion == MOTION_SWING)[0])
+        self._update_drift(np.nonzero(motion == MOTION_DRIFT)[0])
+        self._update_wind(np.nonzero(motion == MOTION_WIND)[0])
+        
+        # 生命周期和视觉效果
+        life = self.life[:n]
+        life -= self.decay[:n]
+        self.size[:n] = self.max_size[:n] * np.maximum(life, 0.0)
+        self.shimmer[:n] += self.pulse_speed[:n] * (1.0 + PARTICLE_SHIMMER[type_id])
+        self.rotation[:n] += self.rotation_speed[:n] * (1.0 + PARTICLE_SPIN[type_id])
+        
+        left, top, right, bottom = self.bounds
+        inside = (pos[:, 0] >= left) & (pos[:, 0] <= right) & (pos[:, 1] >= top) & (pos[:, 1] < bottom)
+        self.compact((life > 0) & (self.size[:n] > 0.1) & inside)
+    
+    def _update_gravity(self, idx: np.ndarray, type_id: np.ndarray):
+        """重力/阻力模型的附加效果：花粉随机飘动、落花飘摆"""
+        if idx.size == 0:
+            return
+        jitter = PARTICLE_JITTER[type_id[idx]]
+        self.vel[idx, 0] += (self.rng.random(idx.size) - 0.5) * jitter
+        sway = PARTICLE_SWAY[type_id[idx]]
+        self.vel[idx, 0] += np.sin(self.pos[idx, 1] * 0.01) * sway
+    
+    def _update_flutter(self, idx: np.ndarray):
+        """春季花瓣飞舞 - 轻盈飘舞"""
+        if idx.size == 0:
+            return
+        self.phase[idx] += self.phase_speed[idx]
+        phase = self.phase[idx]
+        self.vel[idx, 0] += np.sin(phase) * 0.2
+        self.vel[idx, 1] += np.cos(phase * 0.7) * 0.1
+    
+    def _update_orbit(self, idx: np.ndarray):
+        """夏季萤火虫 - 绕生成点飞行并闪烁"""
+        if idx.size == 0:
+            return
+        self.phase[idx] += self.phase_speed[idx]
+        angle = self.phase[idx]
+        radius = self.radius[idx]
+        target_x = self.origin[idx, 0] + np.cos(angle) * radius
+        target_y = self.origin[idx, 1] + np.sin(angle) * radius * 0.5
+        self.pos[idx, 0] += (target_x - self.pos[idx, 0]) * 0.1
+        self.pos[idx, 1] += (target_y - self.pos[idx, 1]) * 0.1
+        self.phase2[idx] += self.phase2_speed[idx]
+    
+    def _update_swing(self, idx: np.ndarray):
+        """秋季落叶 - 左右摆动并翻转下落"""
+        if idx.size == 0:
+            return
+        self.phase[idx] += self.phase_speed[idx]
+        self.vel[idx, 0] += np.sin(self.phase[idx]) * 0.3
+        self.phase2[idx] += self.phase2_speed[idx]
+        self.rotation[idx] += np.sin(self.phase2[idx]) * 0.1
+    
+    def _update_drift(self, idx: np.ndarray):
+        """冬季雪花 - 缓慢漂移和旋转"""
+        if idx.size == 0:
+            return
+        self.phase[idx] += self.phase_speed[idx]
+        self.vel[idx, 0] += np.sin(self.phase[idx]) * 0.05
+        self.rotation[idx] += 0.02
+    
+    def _update_wind(self, idx: np.ndarray):
+        """秋风 - 横向流动加螺旋扰动"""
+        if idx.size == 0:
+            return
+        self.vel[idx, 1] += self.rng.uniform(-0.1, 0.1, idx.size)
+        rotation = self.rotation[idx]
+        self.pos[idx, 0] += np.cos(rotation) * 2
+        self.pos[idx, 1] += np.sin(rotation) * 2
+    
+    def compact(self, keep: np.ndarray):
+        """按掩码保留粒子，压缩到数组前部"""
+        kept = int(np.count_nonzero(keep))
+        if kept == self.active:
+            return
+        for name in self.FIELDS:
+            array = getattr(self, name)
+            array[:kept] = array[:self.active][keep]
+        self.active = kept
+    
+    def blit_sequence(self, atlas: ParticleSpriteAtlas, layer: str, blend: float = 1.0,
+                      camera: "Camera" = None) -> list:
+        """生成某个渲染层的 (精灵, 位置) 序列，供 Surface.blits 一次提交
+        
+        blend < 1 时显示位置取上一步和当前步之间的插值。传入 camera 时先剔除
+        视口外的粒子，再按相机缩放精灵尺寸、换算屏幕位置。
+        """
+        n = self.active
+        if n == 0:
+            return []
+        
+        idx = np.nonzero(PARTICLE_LAYER[self.type_id[:n]] == PARTICLE_LAYER_IDS[layer])[0]
+        if camera is not None and idx.size:
+            idx = idx[camera.contains(self.pos[idx], PARTICLE_CULL_MARGIN)]
+        if idx.size == 0:
+            return []
+        zoom = camera.zoom if camera is not None else 1.0
+        
+        type_id = self.type_id[idx].astype(np.int64)
+        life = self.life[idx]
+        
+        if layer == "background":
+            # 背景粒子统一用更淡、稍小的圆点
+            alpha = (255 * life * 0.6).astype(np.int64)
+            size = np.maximum(1, (self.size[idx] * 0.8 * zoom).astype(np.int64))
+            kind = np.full(idx.size, len(PARTICLE_TYPES), dtype=np.int64)
+        else:
+            alpha = (255 * life).astype(np.int64)
+            firefly = type_id == PARTICLE_TYPE_IDS["summer_firefly"]
+            alpha[firefly] = (alpha[firefly] * (0.5 + 0.5 * np.sin(self.phase2[idx][firefly]))).astype(np.int64)
+            light = type_id == PARTICLE_TYPE_IDS["summer_light"]
+            alpha[light] = (alpha[light] * (0.7 + 0.3 * np.sin(self.shimmer[idx][light]))).astype(np.int64)
+            size = np.maximum(1, (self.size[idx] * zoom).astype(np.int64))
+            kind = type_id
+        
+        # 量化成图集桶，并打包成整数键以便去重
+        alpha_bucket = np.clip(alpha // (256 // atlas.ALPHA_BUCKETS), 0, atlas.ALPHA_BUCKETS - 1)
+        turns = self.rotation[idx] / (2 * math.pi)
+        rotation_bucket = np.rint((turns - np.floor(turns)) * atlas.ROTATION_BUCKETS).astype(np.int64) % atlas.ROTATION_BUCKETS
+        rotation_bucket[~np.isin(type_id, PARTICLE_ROTATED_IDS)] = 0
+        size = np.minimum(size, 255)
+        color = self.color[idx].astype(np.int64)
+        
+        keys = ((((kind * 65536 + color) * 256 + size) * atlas.ALPHA_BUCKETS + alpha_bucket)
+                * atlas.ROTATION_BUCKETS + rotation_bucket)
+        unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        
+        kind_names = PARTICLE_TYPES + ("dot",)
+        sprites = []
+        offsets = np.empty((unique_keys.size, 2), dtype=np.float32)
+        for i, j in enumerate(first.tolist()):
+            sprite, offset = atlas.get_bucket((kind_names[kind[j]], self.colors[color[j]], int(size[j]),
+                                               int(alpha_bucket[j]), int(rotation_bucket[j])))
+            sprites.append(sprite)
+            offsets[i] = offset
+        
+        inverse = inverse.reshape(-1)
+        pos = self.pos[idx]
+        if blend < 1.0:
+            previous = self.prev_pos[idx]
+            pos = previous + (pos - previous) * blend
+        if camera is not None:
+            pos = camera.to_screen(pos)
+        destinations = (pos - offsets[inverse]).tolist()
+        return list(zip([sprites[i] for i in inverse.tolist()], destinations))
+
+class DirtyRectTracker:
+    """脏矩形跟踪器 - 记录每帧改动过的屏幕区域，只把这些区域推送到显示器
+    
+    上一帧画过的区域在本帧开始时用缓存背景恢复，本帧绘制的区域再登记进来，
+    两者的并集就是需要 pygame.display.update 的全部区域。
+    
+    UI面板是静态区域：合成一次后留在屏幕上，不进入 previous，也就不会每帧被擦除。
+    半透明面板不能叠画在自己上面，所以只有和恢复区域重叠或内容变化的面板，
+    才在本帧开始时整块恢复、在场景之后重新合成并推送。粒子刚移入面板的那一帧
+    面板没有被恢复，粒子会盖在面板上面，下一帧该区域被恢复后即纠正。
+    """
+    
+    FULL_UPDATE_RATIO = 0.6  # 脏区域面积超过屏幕的60%时直接整屏刷新
+    MAX_RECTS = 256          # 单次登记的矩形过多时合并为一个包围盒
+    
+    def __init__(self, size: Tuple[int, int] = (SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.screen_rect = pygame.Rect((0, 0), size)
+        self.previous: List[pygame.Rect] = []  # 上一帧绘制过的区域
+        self.current: List[pygame.Rect] = []   # 本帧绘制的区域
+        self.static: List[pygame.Rect] = []    # 静态区域（UI面板）
+        self.expired: List[pygame.Rect] = []   # 内容变化、本帧要整块恢复的静态区域
+        self.restored: List[pygame.Rect] = []  # 本帧开始时恢复过的区域
+        self.pushed: List[pygame.Rect] = []    # 本帧重新合成的静态区域（只推送，不擦除）
+        self.full_redraw = True                # 首帧和失效后需要整屏重绘
+    
+    def invalidate(self):
+        """要求下一帧整屏重绘（窗口被遮挡、季节淡化、跳转等）"""
+        self.full_redraw = True
+    
+    def begin_frame(self):
+        self.current = []
+    
+    def add(self, rect):
+        """登记本帧改动的一个区域"""
+        if rect is None:
+            return
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width > 0 and rect.height > 0:
+            self.current.append(rect)
+    
+    def add_all(self, rects: list):
+        """登记一批区域（数量过多时合并为包围盒）"""
+        if len(rects) > self.MAX_RECTS:
+            self.add(rects[0].unionall(rects[1:]))
+        else:
+            for rect in rects:
+                self.add(rect)
+    
+    def add_static(self, rect):
+        """登记一个静态区域（UI面板）"""
+        self.static.append(pygame.Rect(rect).clip(self.screen_rect))
+    
+    def expire(self, rect):
+        """静态区域的内容变了，本帧开始时要整块恢复（在 restore 之前调用）"""
+        self.expired.append(pygame.Rect(rect).clip(self.screen_rect))
+    
+    def restore(self, screen: pygame.Surface, background: pygame.Surface):
+        """用背景表面擦除上一帧画过的区域，以及被波及或内容变化的静态区域"""
+        restored = list(self.previous)
+        pending = list(self.static)
+        # 面板之间可能重叠，恢复一块面板会擦掉相邻面板的一部分，反复扩展直到没有新的面板被波及
+        grew = True
+        while grew:
+            hit = [rect for rect in pending if rect in self.expired or rect.collidelist(restored) != -1]
+            pending = [rect for rect in pending if rect not in hit]
+            restored.extend(hit)
+            grew = bool(hit)
+        self.restored = restored
+        screen.blits([(background, rect, rect) for rect in restored], False)
+    
+    def needs_compose(self, rect) -> bool:
+        """静态区域本帧是否要重新合成（整屏重绘，或本帧开始时被恢复过）"""
+        return self.full_redraw or pygame.Rect(rect).collidelist(self.restored) != -1
+    
+    def push(self, rect):
+        """登记本帧重新合成的静态区域：推送到显示器，但下一帧不擦除"""
+        if rect is not None:
+            self.pushed.append(pygame.Rect(rect).clip(self.screen_rect))
+    
+    def end_frame(self):
+        """结束本帧，返回需要更新的矩形列表；返回 None 表示整屏刷新"""
+        rects = list({tuple(rect): rect for rect in self.previous + self.current + self.pushed}.values())
+        self.previous = self.current
+        self.pushed = []
+        self.expired = []
+        self.restored = []
+        
+        if self.full_redraw:
+            self.full_redraw = False
+            return None
+        
+        area = sum(rect.width * rect.height for rect in rects)
+        if area > self.FULL_UPDATE_RATIO * self.screen_rect.width * self.screen_rect.height:
+            return None
+        return rects
+
+class Camera:
+    """世界坐标相机 - 平移和缩放
+    
+    世界坐标到屏幕坐标：(p - center) * zoom + 视口中心。默认相机对准屏幕中心、
+    不缩放，此时直接返回原坐标，绘制结果与没有相机时完全相同。
+    """
+    
+    MIN_ZOOM = 0.25
+    MAX_ZOOM = 8.0
+    
+    def __init__(self, viewport: Tuple[int, int] = (SCREEN_WIDTH, SCREEN_HEIGHT),
+                 center: Tuple[float, float] = None, zoom: float = 1.0):
+        self.viewport = viewport
+        self.viewport_center = (viewport[0] / 2, viewport[1] / 2)
+        self.home = center if center is not None else self.viewport_center
+        self.center = self.home
+        self.zoom = zoom
+    
+    @property
+    def is_identity(self) -> bool:
+        return self.zoom == 1.0 and self.center == self.viewport_center
+    
+    def view_rect(self, margin: float = 0.0) -> Tuple[float, float, float, float]:
+        """可见的世界范围 (左, 上, 右, 下)，各边外扩 margin（世界坐标）"""
+        half_width = self.viewport[0] / 2 / self.zoom + margin
+        half_height = self.viewport[1] / 2 / self.zoom + margin
+        return (self.center[0] - half_width, self.center[1] - half_height,
+                self.center[0] + half_width, self.center[1] + half_height)
+    
+    def contains(self, points: np.ndarray, margin=0.0) -> np.ndarray:
+        """点 (N, 2) 是否在外扩 margin 后的可见范围内（margin 可以是每个点各自的数组）"""
+        left, top, right, bottom = self.view_rect()
+        x = points[:, 0]
+        y = points[:, 1]
+        return (x >= left - margin) & (x <= right + margin) & (y >= top - margin) & (y <= bottom + margin)
+    
+    def to_screen(self, points: np.ndarray) -> np.ndarray:
+        """世界坐标数组（最后一维为 x, y）转换为屏幕坐标"""
+        if self.is_identity:
+            return points
+        offset = np.array(self.viewport_center) - np.array(self.center) * self.zoom
+        return points * self.zoom + offset
+    
+    def point_to_screen(self, point: Tuple[float, float]) -> Tuple[float, float]:
+        if self.is_identity:
+            return point
+        return ((point[0] - self.center[0]) * self.zoom + self.viewport_center[0],
+                (point[1] - self.center[1]) * self.zoom + self.viewport_center[1])
+    
+    def to_world(self, point: Tuple[float, float]) -> Tuple[float, float]:
+        """屏幕坐标转换为世界坐标"""
+        return ((point[0] - self.viewport_center[0]) / self.zoom + self.center[0],
+                (point[1] - self.viewport_center[1]) / self.zoom + self.center[1])
+    
+    def pan(self, dx: float, dy: float):
+        """按屏幕像素平移"""
+        self.center = (self.center[0] - dx / self.zoom, self.center[1] - dy / self.zoom)
+    
+    def zoom_at(self, factor: float, anchor: Tuple[float, float] = None):
+        """缩放，保持 anchor（屏幕坐标，默认视口中心）下的世界位置不动"""
+        anchor = anchor if anchor is not None else self.viewport_center
+        world = self.to_world(anchor)
+        self.zoom = max(self.MIN_ZOOM, min(self.MAX_ZOOM, self.zoom * factor))
+        self.center = (world[0] - (anchor[0] - self.viewport_center[0]) / self.zoom,
+                       world[1] - (anchor[1] - self.viewport_center[1]) / self.zoom)
+    
+    def reset(self):
+        self.center = self.home
+        self.zoom = 1.0
+
+class LifecycleTimeline:
+    """生命周期时间线：由各阶段帧数编译一次，之后每帧只查表
+
+    stages 为 (阶段名, 帧数, 季节) 的序列，阶段数不限，帧数为 0 的阶段直接跳过。
+    阶段编号就是在 stages 中的索引；ends 是各阶段结束位置的累计帧数，循环位置二分即得阶段。
+    frames[循环位置] = (阶段名, 阶段内帧号, 阶段进度, 季节, 真实天数)，供单朵花逐帧使用；
+    frame_stage / frame_offset / frame_progress / frame_day 是同样内容的 numpy 数组，供多朵花批量索引。
+    真实天数由 day_spans（季节 -> (第一天, 天数)）按阶段进度换算，不在其中的季节（冬季）为 dormant_day。
+    """
+    
+    _compiled = {}  # compile() 的缓存：阶段序列 -> 时间线
+    
+    @classmethod
+    def compile(cls, stages) -> "LifecycleTimeline":
+        """按默认的真实天数映射编译时间线，相同的阶段序列共用一个"""
+        stages = tuple(stages)
+        timeline = cls._compiled.get(stages)
+        if timeline is None:
+            timeline = cls._compiled[stages] = cls(stages)
+        return timeline
+    
+    def __init__(self, stages, day_spans: dict = None, dormant_day: int = None):
+        self.stages = tuple(name for name, _, _ in stages)
+        self.stage_ids = {name: stage_id for stage_id, name in enumerate(self.stages)}
+        self.durations = tuple(frames for _, frames, _ in stages)
+        self.seasons = tuple(season for _, _, season in stages)
+        self.starts = []
+        self.ends = []
+        position = 0
+        for frames in self.durations:
+            self.starts.append(position)
+            position += frames
+            self.ends.append(position)
+        self.cycle = position
+        if self.cycle <= 0:
+            raise ValueError("生命周期的总帧数必须大于 0")
+        
+        day_spans = day_spans if day_spans is not None else SEASON_DAY_SPANS
+        dormant_day = dormant_day if dormant_day is not None else TOTAL_REAL_DAYS
+        self.frames = []
+        stage_ids = []
+        for position in range(self.cycle):
+            stage_id = self.stage_at(position)
+            stage_ids.append(stage_id)
+            stage_frame = position - self.starts[stage_id]
+            progress = stage_frame / self.durations[stage_id]
+            season = self.seasons[stage_id]
+            span = day_spans.get(season)
+            day = int(progress * span[1]) + span[0] if span is not None else dormant_day
+            self.frames.append((self.stages[stage_id], stage_frame, progress, season, day))
+        
+        self.frame_stage = np.array(stage_ids)
+        self.frame_offset = np.array([frame[1] for frame in self.frames])
+        self.frame_progress = np.array([frame[2] for frame in self.frames])
+        self.frame_day = np.array([frame[4] for frame in self.frames])
+    
+    def stage_at(self, position: int) -> int:
+        """循环位置所在的阶段编号"""
+        return bisect.bisect_right(self.ends, position % self.cycle)
+    
+    def spans(self):
+        """非空阶段的 (阶段名, 起始帧, 帧数)"""
+        return [(name, start, frames) for name, start, frames in zip(self.stages, self.starts, self.durations)
+                if frames > 0]
+    
+    def frame_for_day(self, day: int) -> int:
+        """真实第 day 天开始的循环位置（天数表单调不减，二分查找）"""
+        position = int(np.searchsorted(self.frame_day, day, side="left"))
+        if position >= self.cycle or self.frame_day[position] != day:
+            raise ValueError(f"时间线中没有第 {day} 天")
+        return position
+
+class StageDuration:
+    """阶段帧数字段：在类上读取得到默认帧数；在实例上赋值时重新编译该实例的时间线"""
+    
+    def __init__(self, frames: int):
+        self.frames = frames
+        self.name = None
+    
+    def __set_name__(self, owner, name: str):
+        self.name = name
+    
+    def __get__(self, rose, owner=None) -> int:
+        if rose is None:
+            return self.frames
+        return rose.__dict__.get(self.name, self.frames)
+    
+    def __set__(self, rose, frames: int):
+        rose.__dict__[self.name] = frames
+        rose.recompile_timeline()
 
 class SeasonalRose:
     """季节性月季花类"""
     
-    def __init__(self):
+    # 快照中保存的标量状态
+    STATE_FIELDS = ("frame_count", "current_season", "life_stage", "stage_progress", "total_progress",
+                    "center_size", "center_glow", "center_pulse", "global_glow_intensity",
+                    "magic_burst_timer", "bud_size", "bud_opacity")
+    
+    # 时间控制（15秒循环，所有花朵共用）
+    bud_duration = StageDuration(0)         # 跳过花苞期
+    bloom_duration = StageDuration(225)     # 3.75秒 (25天 → 225帧)
+    maintain_duration = StageDuration(375)  # 6.25秒 (40天 → 375帧)
+    wither_duration = StageDuration(225)    # 3.75秒 (30天 → 225帧)
+    dead_duration = StageDuration(60)       # 1秒
+    reset_duration = StageDuration(15)      # 0.25秒
+    
+    # 阶段顺序和对应的季节（对应真实数据：春季25天开花期、夏季40天盛花期、秋季30天二次开花期、冬季休眠期）
+    LIFECYCLE = (("bud", "winter"), ("bloom", "spring"), ("maintain", "summer"),
+                 ("wither", "autumn"), ("dead", "winter"), ("reset", "winter"))
+    DURATION_FIELDS = tuple(f"{stage}_duration" for stage, _ in LIFECYCLE)
+    
+    @classmethod
+    def compile_timeline(cls, source=None) -> LifecycleTimeline:
+        """按 source（实例或类，默认本类）上各阶段的帧数取时间线，帧数相同的共用缓存"""
+        source = source if source is not None else cls
+        return LifecycleTimeline.compile((stage, getattr(source, field), season)
+                                         for (stage, season), field in zip(cls.LIFECYCLE, cls.DURATION_FIELDS))
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # 子类直接写 bloom_duration = 100 时也包装成 StageDuration，实例上赋值同样会重新编译
+        for field in cls.DURATION_FIELDS:
+            frames = cls.__dict__.get(field)
+            if frames is not None and not isinstance(frames, StageDuration):
+                duration = StageDuration(frames)
+                duration.__set_name__(cls, field)
+                setattr(cls, field, duration)
+    
+    def recompile_timeline(self):
+        """按当前各阶段帧数取时间线（只在帧数改变时调用；花瓣已创建时同时重新烘焙轨道）"""
+        self.timeline = self.compile_timeline(self)
+        self.total_cycle_duration = self.timeline.cycle
+        if "petal_tracks" in self.__dict__:
+            self.bake_petal_tracks()
+    
+    def __init__(self, seed: int = RANDOM_SEED, profiler: FrameProfiler = None,
+                 center: Tuple[float, float] = SCREEN_CENTER):
+        self.recompile_timeline()
+        self.center = center
+        self.random = RandomStreams(seed)
+        self.profiler = profiler if profiler is not None else FrameProfiler()
         self.petals: List[EnhancedPetal] = []
-        self.particles: List[EnhancedParticle] = []
+        self.particles = ParticleStore(rng=self.random.particles)
         self.create_abundant_petals()
+        self.derive_petal_state()
         
         # 季节循环控制（直接从盛开开始）
         self.current_season = "spring"
@@ -740,18 +2109,6 @@ class SeasonalRose:
         self.stage_progress = 0.0
         self.total_progress = 0.0  # 整个循环进度 (0-1)
         
-        # 时间控制（延长到15秒循环）
-        self.bud_duration = 0        # 跳过花苞期
-        self.bloom_duration = 225    # 3.75秒 (25天 → 225帧)
-        self.maintain_duration = 375 # 6.25秒 (40天 → 375帧)  
-        self.wither_duration = 225   # 3.75秒 (30天 → 225帧)
-        self.dead_duration = 60      # 1秒
-        self.reset_duration = 15     # 0.25秒
-        
-        self.total_cycle_duration = (self.bud_duration + self.bloom_duration + 
-                                   self.maintain_duration + self.wither_duration + 
-                                   self.dead_duration + self.reset_duration)
-        
         self.frame_count = 0
         
         # 花心效果（一开始就有花心）
@@ -767,92 +2124,115 @@ class SeasonalRose:
         self.bud_size = 30
         self.bud_opacity = 0  # 直接隐藏花苞
         
-    def create_abundant_petals(self):
+        # 季节背景（按季节缓存，切换时交叉淡化）
+        self.background = SeasonalBackground()
+        self.background.set_season(self.current_season)
+        self.resolve_palette()
+        
+        # 环境光精灵缓存
+        self.light_cache = AmbientLightCache()
+        
+        # 粒子精灵图集和数量上限
+        self.particle_atlas = ParticleSpriteAtlas()
+        self.max_particles = MAX_PARTICLES
+        self.glow_layers = 3
+        
+        # 渲染插值系数（0 = 上一步，1 = 当前步），由固定步长时钟设置
+        self.render_alpha = 1.0
+        
+        # 世界坐标相机（默认对准屏幕中心、不缩放）
+        self.camera = Camera()
+        
+        # 关键帧快照（帧号 -> 快照），用于快速跳帧
+        self.keyframes = {}
+        self.keyframe_frames: List[int] = []
+        self.store_keyframe()
+        
+    def create_abundant_petals(self, layer_counts=PETAL_LAYER_COUNTS):
         """创建适量花瓣（优化性能）"""
-        # 重新设置随机种子确保一致的花瓣生成
-        random.seed(42)
-        
-        # 减少花瓣层数和密度
-        layer_configs = [
-            {"layer": 0, "count": 8},   # 内层 - 8片
-            {"layer": 1, "count": 12},  # 第二层 - 12片
-            {"layer": 2, "count": 16},  # 第三层 - 16片
-            {"layer": 3, "count": 20},  # 第四层 - 20片
-            {"layer": 4, "count": 16},  # 第五层 - 16片
-            {"layer": 5, "count": 12},  # 外层 - 12片
-        ]
+        # 花瓣只从布局随机流取数，确保一致的花瓣生成
+        rng = self.random.layout
         
-        for config in layer_configs:
-            layer = config["layer"]
-            count = config["count"]
-            
+        # 减少花瓣层数和密度（每层数量见 PETAL_LAYER_COUNTS）
+        for layer, count in enumerate(layer_counts):
             for i in range(count):
-                petal = EnhancedPetal(layer, i, count)
+                petal = EnhancedPetal(layer, i, count, rng, self.center)
                 self.petals.append(petal)
         
         print(f"创建了 {len(self.petals)} 个花瓣")
     
-    def get_current_season_colors(self):
-        """获取当前季节颜色"""
-        return SeasonalBloomColors.get_season_colors(self.current_season)
+    def derive_petal_state(self):
+        """由花瓣列表构建批量数组、烘焙轨道和绘制顺序（花瓣列表变化后都要重建）"""
+        self.petal_batch = PetalBatch(self.petals, self.center)
+        self.bake_petal_tracks()
+        self.petal_order = PetalDrawOrder(self.petal_batch.layer, self.petal_batch.world_positions()[:, 1])
     
-    def update_season_cycle(self):
-        """更新季节循环（直接从春季盛开开始）"""
-        # 根据生命周期阶段决定季节，并对应真实数据
-        if self.life_stage == "bloom":
-            self.current_season = "spring"  # 对应春季25天开花期
-        elif self.life_stage == "maintain":
-            self.current_season = "summer"  # 对应夏季40天盛花期
-        elif self.life_stage == "wither":
-            self.current_season = "autumn"  # 对应秋季30天二次开花期
-        else:  # dead, reset
-            self.current_season = "winter"  # 对应冬季休眠期
+    def rebuild_petals(self, layer_counts):
+        """按每层花瓣数重新创建花瓣（只能在第 0 帧调用），并重建派生数据和关键帧"""
+        if self.frame_count != 0:
+            raise ValueError(f"只能在第 0 帧重建花瓣，当前为第 {self.frame_count} 帧")
+        self.petals = []
+        self.create_abundant_petals(layer_counts)
+        self.derive_petal_state()
+        
+        # 旧关键帧的花瓣数量对不上，重新从第 0 帧记录
+        self.keyframes.clear()
+        self.keyframe_frames.clear()
+        self.store_keyframe()
+    
+    def get_current_season_colors(self) -> SeasonPalette:
+        """获取本帧配色"""
+        return self.palette
+    
+    def resolve_palette(self):
+        """解析本帧配色：跟随背景交叉淡化，在两季配色之间过渡"""
+        background = self.background
+        self.palette = SEASON_PALETTES.resolve(background.current_season, background.previous_season,
+                                               ease_in_out_sine(background.fade_progress))
+    
+    def bake_petal_tracks(self):
+        """按盛开期和维持期帧数烘焙花瓣轨道"""
+        self.petal_tracks = PetalTracks(self.petals, self.bloom_duration, self.maintain_duration)
+    
+    @property
+    def current_day(self) -> int:
+        """当前对应的真实天数"""
+        timeline = self.timeline
+        return timeline.frames[self.frame_count % timeline.cycle][4]
     
     def update(self):
-        """更新动画状态"""
+        """更新动画状态（推进一个模拟步）"""
+        with self.profiler.scope("update"):
+            self._update()
+    
+    def _update(self):
         self.frame_count += 1
-        
-        # 计算循环进度
-        cycle_position = self.frame_count % self.total_cycle_duration
-        self.total_progress = cycle_position / self.total_cycle_duration
-        
-        # 确定当前阶段（跳过花苞期，直接从盛开开始）
-        if cycle_position < self.bloom_duration:
-            self.life_stage = "bloom"
-            self.stage_progress = cycle_position / self.bloom_duration
-            
-        elif cycle_position < self.bloom_duration + self.maintain_duration:
-            self.life_stage = "maintain"
-            maintain_start = self.bloom_duration
-            self.stage_progress = (cycle_position - maintain_start) / self.maintain_duration
-            
-        elif cycle_position < (self.bloom_duration + self.maintain_duration + self.wither_duration):
-            self.life_stage = "wither"
-            wither_start = self.bloom_duration + self.maintain_duration
-            self.stage_progress = (cycle_position - wither_start) / self.wither_duration
-            
-        elif cycle_position < (self.bloom_duration + self.maintain_duration + 
-                             self.wither_duration + self.dead_duration):
-            self.life_stage = "dead"
-            dead_start = (self.bloom_duration + self.maintain_duration + self.wither_duration)
-            self.stage_progress = (cycle_position - dead_start) / self.dead_duration
-            
-        else:
-            self.life_stage = "reset"
-            reset_start = (self.bloom_duration + self.maintain_duration + 
-                          self.wither_duration + self.dead_duration)
-            self.stage_progress = (cycle_position - reset_start) / self.reset_duration
-            
-            # 重置飘落状态
-            if self.stage_progress > 0.5:
-                for petal in self.petals:
-                    petal.is_falling = False
-                    petal.fall_x = 0
-                    petal.fall_y = 0
+        # 随机种子、脉动和计时器都只由循环位置决定，
+        # 预热一个周期后整个模拟状态按周期重复
+        timeline = self.timeline
+        cycle_position = self.frame_count % timeline.cycle
+        self.random.begin_frame(cycle_position)
+        self.particles.rng = self.random.particles
+        if cycle_position == 0:
+            self.magic_burst_timer = 0
+            self.center_pulse = 0
+        
+        # 计算循环进度，查时间线得到阶段、阶段内帧号、阶段进度和季节
+        self.total_progress = cycle_position / timeline.cycle
+        self.life_stage, stage_frame, self.stage_progress, self.current_season, _ = timeline.frames[cycle_position]
+        
+        # 重置飘落状态
+        if self.life_stage == "reset" and self.stage_progress > 0.5:
+            for petal in self.petals:
+                petal.is_falling = False
+                petal.fall_x = 0
+                petal.fall_y = 0
         
         # 更新季节
-        self.update_season_cycle()
-        season_colors = self.get_current_season_colors()
+        self.background.set_season(self.current_season)
+        self.background.update()
+        self.resolve_palette()
+        palette = self.palette
         
         # 更新花苞状态（跳过花苞期）
         self.bud_opacity = 0  # 始终隐藏花苞
@@ -862,29 +2242,116 @@ class SeasonalRose:
         
         # 更新全局发光（加快变化）
         if self.life_stage == "maintain":
-            self.global_glow_intensity = 0.8 + 0.2 * math.sin(self.frame_count * 0.2)  # 频率从0.1增加到0.2
+            self.global_glow_intensity = 0.8 + 0.2 * math.sin(cycle_position * 0.2)  # 频率从0.1增加到0.2
         elif self.life_stage == "bloom":
             self.global_glow_intensity = self.stage_progress * 0.6
         else:
             self.global_glow_intensity = max(0, self.global_glow_intensity - 0.02)
         
-        # 更新所有花瓣
-        for petal in self.petals:
-            petal.update_lifecycle(self.life_stage, self.stage_progress, season_colors)
-        
-        # 更新粒子
-        self.particles = [p for p in self.particles if p.is_alive()]
-        for particle in self.particles:
-            particle.update()
+        # 更新所有花瓣（颜色梯度每帧只查一次；盛开期和维持期直接取烘焙轨道）
+        with self.profiler.scope("update.petals"):
+            ramps = palette.ramps
+            if self.life_stage in self.petal_tracks.tracks:
+                self.petal_tracks.apply(self.life_stage, stage_frame, self.petals, palette, ramps)
+            else:
+                for petal in self.petals:
+                    petal.update_lifecycle(self.life_stage, self.stage_progress, palette, ramps)
+            self.petal_batch.pull(self.petals)
         
-        # 生成新粒子
-        self.generate_particles(season_colors)
+        # 更新粒子（向量化更新并压缩死亡粒子）
+        with self.profiler.scope("update.particles"):
+            self.particles.update()
         
-        # 魔法爆发效果（减少频率）
-        if self.life_stage == "bloom" and self.stage_progress > 0.8:
-            self.magic_burst_timer += 1
-            if self.magic_burst_timer % 30 == 0:  # 减少频率（从10帧增加到30帧）
-                self.create_magic_burst(season_colors)
+        with self.profiler.scope("update.spawn"):
+            # 生成新粒子
+            self.generate_particles(palette)
+            
+            # 魔法爆发效果（减少频率）
+            if self.life_stage == "bloom" and self.stage_progress > 0.8:
+                self.magic_burst_timer += 1
+                if self.magic_burst_timer % 30 == 0:  # 减少频率（从10帧增加到30帧）
+                    self.create_magic_burst(palette)
+        
+        if self.frame_count % KEYFRAME_INTERVAL == 0:
+            self.store_keyframe()
+    
+    def apply_quality(self, tier: dict):
+        """应用画质档位（见 QUALITY_TIERS）"""
+        self.max_particles = tier["max_particles"]
+        self.glow_layers = tier["glow_layers"]
+        self.light_cache.set_rings(tier["light_rings"])
+        if len(self.petals[0].control_points) != tier["petal_points"]:
+            for petal in self.petals:
+                petal.generate_enhanced_petal_shape(tier["petal_points"])
+            self.petal_batch.set_outline(self.petals[0].control_points)
+    
+    def snapshot(self) -> dict:
+        """保存完整的模拟状态（花瓣、粒子、背景淡化和随机流）"""
+        return {
+            "scalars": tuple(getattr(self, name) for name in self.STATE_FIELDS),
+            "petals": [petal.get_state() for petal in self.petals],
+            "particles": self.particles.get_state(),
+            "background": self.background.get_state(),
+            "random": self.random.get_state(),
+        }
+    
+    def restore(self, snapshot: dict):
+        """从快照恢复模拟状态"""
+        for name, value in zip(self.STATE_FIELDS, snapshot["scalars"]):
+            setattr(self, name, value)
+        for petal, state in zip(self.petals, snapshot["petals"]):
+            petal.set_state(state)
+        self.petal_batch.pull(self.petals)
+        self.petal_batch.settle()
+        self.particles.set_state(snapshot["particles"])
+        self.background.set_state(snapshot["background"])
+        self.resolve_palette()
+        self.random.set_state(snapshot["random"])
+    
+    def store_keyframe(self):
+        """记录当前帧的快照，超出上限时丢弃最早的关键帧（第 0 帧除外）"""
+        if self.frame_count in self.keyframes:
+            return
+        bisect.insort(self.keyframe_frames, self.frame_count)
+        self.keyframes[self.frame_count] = self.snapshot()
+        if len(self.keyframe_frames) > MAX_KEYFRAMES:
+            del self.keyframes[self.keyframe_frames.pop(1)]
+    
+    def seek(self, frame: int):
+        """跳到指定帧：恢复最近的关键帧，再只模拟不绘制补齐剩余帧
+        
+        预热一个循环后模拟状态每个循环重复一次（见 _update），离目标超过一个循环时
+        先跳到第二个循环里的同一位置，再把帧号平移到目标帧，最多模拟两个循环。
+        """
+        if frame < 0:
+            raise ValueError(f"帧号不能为负数: {frame}")
+        
+        keyframe = self.keyframe_frames[bisect.bisect_right(self.keyframe_frames, frame) - 1]
+        # 当前帧比关键帧更接近目标时，直接从当前状态往后模拟
+        resume = keyframe <= self.frame_count <= frame
+        cycle = self.total_cycle_duration
+        if frame - (self.frame_count if resume else keyframe) > cycle and frame >= 2 * cycle:
+            shift = (frame - cycle) // cycle * cycle
+            self.seek(frame - shift)
+            self.frame_count += shift
+            return
+        if not resume:
+            self.restore(self.keyframes[keyframe])
+        while self.frame_count < frame:
+            self.update()
+    
+    def frame_for_day(self, day: int) -> int:
+        """本循环中真实第 day 天（1-95）开始的帧号"""
+        if not 1 <= day <= TOTAL_REAL_DAYS:
+            raise ValueError(f"天数应在 1-{TOTAL_REAL_DAYS} 之间: {day}")
+        
+        position = self.timeline.frame_for_day(day)
+        cycle_start = self.frame_count - self.frame_count % self.total_cycle_duration
+        return cycle_start + position
+    
+    def seek_day(self, day: int):
+        """跳到本循环中真实第 day 天"""
+        self.seek(self.frame_for_day(day))
     
     def update_center(self):
         """更新花心"""
@@ -909,147 +2376,113 @@ class SeasonalRose:
     
     def generate_particles(self, season_colors: dict):
         """生成增强的季节粒子效果"""
-        if len(self.particles) > 120:  # 适度增加粒子数量限制（从80到120）
+        if len(self.particles) > self.max_particles:
             return
         
+        rng = self.random.emission
+        
         # 基础花朵粒子效果
-        if self.life_stage == "bloom" and random.random() < 0.18:  # 轻微增加生成频率
+        if self.life_stage == "bloom" and rng.random() < 0.18:  # 轻微增加生成频率
             # 盛开期 - 花粉和闪光
-            particle_type = random.choice(["sparkle", "spring_blossom"])
-            particle = EnhancedParticle(
-                SCREEN_CENTER[0] + random.uniform(-30, 30),
-                SCREEN_CENTER[1] + random.uniform(-30, 30),
-                particle_type, season_colors, self.current_season
-            )
-            self.particles.append(particle)
-        
-        elif self.life_stage == "maintain" and random.random() < 0.15:  # 轻微增加生成频率
+            particle_type = rng.choice(["sparkle", "spring_blossom"])
+            self.particles.spawn(particle_type,
+                                 self.center[0] + rng.uniform(-30, 30),
+                                 self.center[1] + rng.uniform(-30, 30),
+                                 season_colors=season_colors)
+        
+        elif self.life_stage == "maintain" and rng.random() < 0.15:  # 轻微增加生成频率
             # 维持期 - 发光粒子和萤火虫
             if self.current_season == "summer":
-                particle_type = random.choice(["glow", "summer_firefly", "summer_light"])
+                particle_type = rng.choice(["glow", "summer_firefly", "summer_light"])
             else:
                 particle_type = "glow"
-            particle = EnhancedParticle(
-                SCREEN_CENTER[0] + random.uniform(-40, 40),
-                SCREEN_CENTER[1] + random.uniform(-40, 40),
-                particle_type, season_colors, self.current_season
-            )
-            self.particles.append(particle)
-        
-        elif self.life_stage == "wither" and random.random() < 0.10:  # 轻微增加生成频率
+            self.particles.spawn(particle_type,
+                                 self.center[0] + rng.uniform(-40, 40),
+                                 self.center[1] + rng.uniform(-40, 40),
+                                 season_colors=season_colors)
+        
+        elif self.life_stage == "wither" and rng.random() < 0.10:  # 轻微增加生成频率
             # 凋零期 - 飘落花瓣和秋叶
             if self.current_season == "autumn":
-                particle_type = random.choice(["falling_petal", "autumn_leaf"])
+                particle_type = rng.choice(["falling_petal", "autumn_leaf"])
             else:
                 particle_type = "falling_petal"
-            particle = EnhancedParticle(
-                SCREEN_CENTER[0] + random.uniform(-80, 80),
-                SCREEN_CENTER[1] + random.uniform(-60, 60),
-                particle_type, season_colors, self.current_season
-            )
-            self.particles.append(particle)
+            self.particles.spawn(particle_type,
+                                 self.center[0] + rng.uniform(-80, 80),
+                                 self.center[1] + rng.uniform(-60, 60),
+                                 season_colors=season_colors)
         
         # 季节性天气效果
         self._generate_weather_particles(season_colors)
     
     def _generate_weather_particles(self, season_colors: dict):
         """生成季节天气粒子"""
+        rng = self.random.weather
+        
         # 春季 - 春雨（偶尔）
         if (self.current_season == "spring" and 
-            random.random() < 0.03 and  # 轻微增加频率
-            len([p for p in self.particles if p.type == "spring_rain"]) < 15):  # 增加数量限制
+            rng.random() < 0.03 and  # 轻微增加频率
+            self.particles.count("spring_rain") < 15):  # 增加数量限制
             
-            for _ in range(random.randint(1, 4)):  # 增加生成数量
-                particle = EnhancedParticle(
-                    random.uniform(0, SCREEN_WIDTH),
-                    -10,  # 从屏幕顶部开始
-                    "spring_rain", season_colors, "spring"
-                )
-                self.particles.append(particle)
+            count = rng.randint(1, 4)  # 增加生成数量
+            xs = [rng.uniform(0, SCREEN_WIDTH) for _ in range(count)]
+            self.particles.spawn("spring_rain", xs, -10, count, season_colors)  # 从屏幕顶部开始
         
         # 夏季 - 光斑效果（环境光）
         elif (self.current_season == "summer" and 
-              random.random() < 0.06 and  # 轻微增加频率
-              len([p for p in self.particles if p.type == "summer_light"]) < 12):  # 增加数量限制
+              rng.random() < 0.06 and  # 轻微增加频率
+              self.particles.count("summer_light") < 12):  # 增加数量限制
             
-            particle = EnhancedParticle(
-                random.uniform(100, SCREEN_WIDTH - 100),
-                random.uniform(100, SCREEN_HEIGHT - 100),
-                "summer_light", season_colors, "summer"
-            )
-            self.particles.append(particle)
+            self.particles.spawn("summer_light",
+                                 rng.uniform(100, SCREEN_WIDTH - 100),
+                                 rng.uniform(100, SCREEN_HEIGHT - 100),
+                                 season_colors=season_colors)
         
         # 秋季 - 风的效果
         elif (self.current_season == "autumn" and 
-              random.random() < 0.04 and  # 轻微增加频率
-              len([p for p in self.particles if p.type == "autumn_wind"]) < 8):  # 增加数量限制
+              rng.random() < 0.04 and  # 轻微增加频率
+              self.particles.count("autumn_wind") < 8):  # 增加数量限制
             
-            for _ in range(random.randint(1, 3)):  # 增加生成数量
-                particle = EnhancedParticle(
-                    -10,  # 从左侧开始
-                    random.uniform(SCREEN_HEIGHT // 3, 2 * SCREEN_HEIGHT // 3),
-                    "autumn_wind", season_colors, "autumn"
-                )
-                self.particles.append(particle)
+            count = rng.randint(1, 3)  # 增加生成数量
+            ys = [rng.uniform(SCREEN_HEIGHT // 3, 2 * SCREEN_HEIGHT // 3) for _ in range(count)]
+            self.particles.spawn("autumn_wind", -10, ys, count, season_colors)  # 从左侧开始
         
         # 冬季 - 雪花
         elif (self.current_season == "winter" and 
-              random.random() < 0.05 and  # 轻微增加频率
-              len([p for p in self.particles if p.type == "winter_snow"]) < 20):  # 增加数量限制
+              rng.random() < 0.05 and  # 轻微增加频率
+              self.particles.count("winter_snow") < 20):  # 增加数量限制
             
-            for _ in range(random.randint(1, 4)):  # 增加生成数量
-                particle = EnhancedParticle(
-                    random.uniform(0, SCREEN_WIDTH),
-                    -10,  # 从屏幕顶部开始
-                    "winter_snow", season_colors, "winter"
-                )
-                self.particles.append(particle)
+            count = rng.randint(1, 4)  # 增加生成数量
+            xs = [rng.uniform(0, SCREEN_WIDTH) for _ in range(count)]
+            self.particles.spawn("winter_snow", xs, -10, count, season_colors)  # 从屏幕顶部开始
     
     def create_magic_burst(self, season_colors: dict):
         """创建季节性魔法爆发效果"""
         # 根据季节创建不同的爆发效果
         if self.current_season == "spring":
             # 春季 - 花瓣爆发
-            for _ in range(7):  # 增加数量
-                particle = EnhancedParticle(
-                    SCREEN_CENTER[0], SCREEN_CENTER[1],
-                    "spring_blossom", season_colors, "spring"
-                )
-                self.particles.append(particle)
+            self.particles.spawn("spring_blossom", self.center[0], self.center[1], 7, season_colors)
         elif self.current_season == "summer":
             # 夏季 - 萤火虫和光芒
             for _ in range(6):  # 增加数量
-                particle_type = random.choice(["summer_firefly", "magic"])
-                particle = EnhancedParticle(
-                    SCREEN_CENTER[0], SCREEN_CENTER[1],
-                    particle_type, season_colors, "summer"
-                )
-                self.particles.append(particle)
+                particle_type = self.random.emission.choice(["summer_firefly", "magic"])
+                self.particles.spawn(particle_type, self.center[0], self.center[1],
+                                     season_colors=season_colors)
         elif self.current_season == "autumn":
             # 秋季 - 落叶飞舞
-            for _ in range(8):  # 增加数量
-                particle = EnhancedParticle(
-                    SCREEN_CENTER[0], SCREEN_CENTER[1],
-                    "autumn_leaf", season_colors, "autumn"
-                )
-                self.particles.append(particle)
+            self.particles.spawn("autumn_leaf", self.center[0], self.center[1], 8, season_colors)
         else:  # winter
             # 冬季 - 雪花飞舞
-            for _ in range(10):  # 增加数量
-                particle = EnhancedParticle(
-                    SCREEN_CENTER[0], SCREEN_CENTER[1],
-                    "winter_snow", season_colors, "winter"
-                )
-                self.particles.append(particle)
+            self.particles.spawn("winter_snow", self.center[0], self.center[1], 10, season_colors)
     
-    def draw_enhanced_bud(self, screen: pygame.Surface):
-        """绘制增强花苞"""
+    def draw_enhanced_bud(self, screen: pygame.Surface) -> pygame.Rect:
+        """绘制增强花苞，返回花苞区域"""
         if self.bud_opacity > 0:
-            season_colors = self.get_current_season_colors()
+            palette = self.palette
             
             # 花苞主体
             bud_rect = pygame.Rect(0, 0, self.bud_size * 2, self.bud_size * 3)
-            bud_rect.center = SCREEN_CENTER
+            bud_rect.center = self.center
             
             temp_surface = pygame.Surface((self.bud_size * 6, self.bud_size * 8), pygame.SRCALPHA)
             
@@ -1057,7 +2490,7 @@ class SeasonalRose:
             if self.life_stage == "bud" and self.stage_progress > 0.5:
                 glow_size = int(self.bud_size * 3)
                 glow_alpha = int(self.bud_opacity * 0.3)
-                glow_color = (*season_colors['glow'], glow_alpha)
+                glow_color = (*palette.glow, glow_alpha)
                 
                 pygame.draw.ellipse(temp_surface, glow_color,
                                   (self.bud_size, self.bud_size * 2, glow_size, glow_size))
@@ -1065,8 +2498,8 @@ class SeasonalRose:
             # 多层花苞
             for i in range(6):
                 layer_color = SeasonalBloomColors.interpolate_color(
-                    season_colors['bud_deep'],
-                    season_colors['bud_light'],
+                    palette.bud_deep,
+                    palette.bud_light,
                     i / 5
                 )
                 layer_alpha = int(self.bud_opacity * (0.9 - i * 0.1))
@@ -1082,257 +2515,547 @@ class SeasonalRose:
                 
                 pygame.draw.ellipse(temp_surface, color_with_alpha, layer_rect)
             
-            screen.blit(temp_surface, (SCREEN_CENTER[0] - self.bud_size * 3,
-                                     SCREEN_CENTER[1] - self.bud_size * 4))
+            if not self.camera.is_identity:
+                size = temp_surface.get_size()
+                temp_surface = pygame.transform.scale(
+                    temp_surface, (max(1, int(size[0] * self.camera.zoom)), max(1, int(size[1] * self.camera.zoom))))
+            center_x, center_y = self.camera.point_to_screen(self.center)
+            return screen.blit(temp_surface, (center_x - self.bud_size * 3 * self.camera.zoom,
+                                            center_y - self.bud_size * 4 * self.camera.zoom))
+        return None
     
-    def draw_enhanced_center(self, screen: pygame.Surface):
-        """绘制简化的花心"""
+    def draw_enhanced_center(self, screen: pygame.Surface) -> pygame.Rect:
+        """绘制简化的花心，返回花心区域"""
         if self.center_size > 1:
-            season_colors = self.get_current_season_colors()
+            palette = self.palette
             
-            # 简化的脉动效果
-            current_size = int(self.center_size)
+            # 简化的脉动效果（按相机缩放）
+            zoom = self.camera.zoom
+            current_size = int(self.center_size * zoom)
+            center = self.camera.point_to_screen(self.center)
+            center_rect = pygame.Rect(0, 0, current_size * 2 + 2, current_size * 2 + 2)
+            center_rect.center = center
+            if not center_rect.colliderect(screen.get_rect()):
+                return None
             
             # 简化的花心主体（只有2层）
             for i in range(2):
-                size = current_size - i * 3
+                size = current_size - int(i * 3 * zoom)
                 if size > 0:
                     alpha = 255 - i * 50
-                    color = season_colors['glow'] if i == 0 else season_colors['bloom']
-                    pygame.draw.circle(screen, color, SCREEN_CENTER, size)
+                    color = palette.glow if i == 0 else palette.bloom
+                    pygame.draw.circle(screen, color, center, size)
             
             # 简化的花蕊（减少数量）
-            if current_size > 8:
+            if current_size > 8 * zoom:
                 for j in range(6):  # 减少到6个
                     angle = j * math.pi / 3
                     radius = current_size * 0.5
-                    stamen_x = SCREEN_CENTER[0] + math.cos(angle) * radius
-                    stamen_y = SCREEN_CENTER[1] + math.sin(angle) * radius
+                    stamen_x = center[0] + math.cos(angle) * radius
+                    stamen_y = center[1] + math.sin(angle) * radius
                     
-                    pygame.draw.circle(screen, season_colors['bud_deep'],
-                                     (int(stamen_x), int(stamen_y)), 2)
+                    pygame.draw.circle(screen, palette.bud_deep,
+                                     (int(stamen_x), int(stamen_y)), max(1, round(2 * zoom)))
+            
+            return center_rect
+        return None
     
-    def draw_glow_effects(self, screen: pygame.Surface):
-        """绘制简化的全局发光效果"""
+    def draw_glow_effects(self, screen: pygame.Surface) -> pygame.Rect:
+        """绘制简化的全局发光效果，返回光晕区域"""
         if self.global_glow_intensity > 0.3:  # 只在强发光时显示
-            season_colors = self.get_current_season_colors()
+            palette = self.palette
             
-            # 简化的光晕（只有3层）
-            glow_radius = int(150 * self.global_glow_intensity)
+            # 简化的光晕（层数由画质档位决定，默认3层）
+            glow_radius = int(150 * self.global_glow_intensity * self.camera.zoom)
             glow_alpha = int(30 * self.global_glow_intensity)
+            center_x, center_y = self.camera.point_to_screen(self.center)
+            glow_rect = pygame.Rect(center_x - glow_radius, center_y - glow_radius, glow_radius * 2, glow_radius * 2)
+            if glow_radius <= 0 or not glow_rect.colliderect(screen.get_rect()):
+                return None
             
             temp_glow = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
             
-            for i in range(3):  # 减少层数
-                layer_radius = glow_radius - i * glow_radius // 3
+            for i in range(self.glow_layers):
+                layer_radius = glow_radius - i * glow_radius // self.glow_layers
                 layer_alpha = glow_alpha // (i + 1)
-                glow_color = (*season_colors['glow'], layer_alpha)
+                glow_color = (*palette.glow, layer_alpha)
                 
                 pygame.draw.circle(temp_glow, glow_color,
                                  (glow_radius, glow_radius), max(1, layer_radius))
             
-            screen.blit(temp_glow, (SCREEN_CENTER[0] - glow_radius,
-                                  SCREEN_CENTER[1] - glow_radius))
+            return screen.blit(temp_glow, (center_x - glow_radius, center_y - glow_radius))
+        return None
     
-    def draw(self, screen: pygame.Surface):
-        """绘制季节性月季花"""
-        season_colors = self.get_current_season_colors()
+    def draw(self, screen: pygame.Surface, dirty: DirtyRectTracker = None):
+        """绘制季节性月季花
+        
+        传入 dirty 时进入脏矩形模式：背景只恢复上一帧画过的区域，
+        各部分把本帧改动的区域登记到 dirty 中。
+        """
+        # 增强的季节背景（含环境光）
+        light_rect = self.draw_seasonal_background(screen, self.palette, dirty)
         
-        # 增强的季节背景
-        self.draw_seasonal_background(screen, season_colors)
+        # 花瓣
+        with self.profiler.scope("draw.petals"):
+            petal_rect = self.draw_petals(screen)
+        
+        # 花心
+        with self.profiler.scope("draw.center"):
+            center_rect = self.draw_enhanced_center(screen)
+        
+        # 优化的粒子效果渲染（每层单独计时）
+        particle_rects = self.draw_particles_optimized(screen)
         
         # 全局发光效果
-        self.draw_glow_effects(screen)
+        with self.profiler.scope("draw.glow"):
+            glow_rect = self.draw_glow_effects(screen)
         
         # 花苞
-        self.draw_enhanced_bud(screen)
+        bud_rect = self.draw_enhanced_bud(screen)
         
-        # 花瓣（按层次排序）
-        sorted_petals = sorted(self.petals, key=lambda p: (-p.layer, p.get_world_position()[1]))
+        if dirty is not None:
+            for rect in (light_rect, petal_rect, center_rect, glow_rect, bud_rect):
+                dirty.add(rect)
+            dirty.add_all(particle_rects)
     
-    def draw_seasonal_background(self, screen: pygame.Surface, season_colors: dict):
-        """绘制增强的季节背景"""
-        base_color = season_colors['bg']
-        
-        # 创建渐变背景
-        if self.current_season == "spring":
-            # 春季 - 清新的天空渐变
-            self._draw_gradient_background(screen, 
-                                         (135, 206, 235),  # 天空蓝
-                                         (240, 255, 240))  # 淡绿
-        elif self.current_season == "summer":
-            # 夏季 - 温暖的金色渐变
-            self._draw_gradient_background(screen,
-                                         (255, 215, 0),    # 金色
-                                         (255, 250, 240))  # 米色
-        elif self.current_season == "autumn":
-            # 秋季 - 夕阳渐变
-            self._draw_gradient_background(screen,
-                                         (255, 140, 0),    # 橙色
-                                         (255, 248, 220))  # 秋日米色
-        else:  # winter
-            # 冬季 - 冷色调渐变
-            self._draw_gradient_background(screen,
-                                         (176, 196, 222),  # 钢蓝色
-                                         (240, 248, 255))  # 淡蓝白
+    def draw_seasonal_background(self, screen: pygame.Surface, palette: SeasonPalette,
+                                 dirty: DirtyRectTracker = None) -> pygame.Rect:
+        """绘制增强的季节背景，返回环境光覆盖的区域"""
+        # 缓存的季节渐变背景（季节切换时交叉淡化）
+        with self.profiler.scope("draw.background"):
+            self.background.draw(screen, dirty)
         
         # 添加环境光照效果
-        self._draw_ambient_lighting(screen, season_colors)
-    
-    def _draw_gradient_background(self, screen: pygame.Surface, top_color: tuple, bottom_color: tuple):
-        """绘制渐变背景"""
-        for y in range(SCREEN_HEIGHT):
-            # 计算渐变比例
-            ratio = y / SCREEN_HEIGHT
-            
-            # 插值计算颜色
-            r = int(top_color[0] * (1 - ratio) + bottom_color[0] * ratio)
-            g = int(top_color[1] * (1 - ratio) + bottom_color[1] * ratio)
-            b = int(top_color[2] * (1 - ratio) + bottom_color[2] * ratio)
-            
-            # 绘制水平线
-            pygame.draw.line(screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+        with self.profiler.scope("draw.light"):
+            return self._draw_ambient_lighting(screen, palette)
     
-    def _draw_ambient_lighting(self, screen: pygame.Surface, season_colors: dict):
-        """绘制环境光照效果"""
+    def _draw_ambient_lighting(self, screen: pygame.Surface, palette: SeasonPalette) -> pygame.Rect:
+        """绘制环境光照效果，返回受影响的区域"""
         # 根据生命阶段和季节调整环境光
         light_intensity = 0.0
         
         if self.life_stage == "bloom":
             light_intensity = self.stage_progress * 0.3
         elif self.life_stage == "maintain":
-            light_intensity = 0.3 + 0.2 * math.sin(self.frame_count * 0.05)  # 脉动光照
+            light_intensity = 0.3 + 0.2 * math.sin((self.frame_count % self.total_cycle_duration) * 0.05)  # 脉动光照
         elif self.life_stage == "wither":
             light_intensity = 0.3 * (1 - self.stage_progress)
         
         if light_intensity > 0:
-            # 创建光照效果
-            light_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            
-            # 季节性光照颜色
-            if self.current_season == "spring":
-                light_color = (255, 255, 255, int(light_intensity * 50))  # 白光
-            elif self.current_season == "summer":
-                light_color = (255, 255, 200, int(light_intensity * 60))  # 暖黄光
-            elif self.current_season == "autumn":
-                light_color = (255, 200, 150, int(light_intensity * 40))  # 橙光
-            else:  # winter
-                light_color = (200, 220, 255, int(light_intensity * 30))  # 冷蓝光
-            
-            # 中心光源效果
-            for radius in range(50, 300, 20):
-                alpha = int(light_color[3] * (300 - radius) / 300)
-                if alpha > 0:
-                    temp_color = (*light_color[:3], alpha)
-                    pygame.draw.circle(light_surface, temp_color, SCREEN_CENTER, radius)
-            
-            screen.blit(light_surface, (0, 0))
-        
-        # 花瓣（按层次排序）
-        sorted_petals = sorted(self.petals, key=lambda p: (-p.layer, p.get_world_position()[1]))
-        for petal in sorted_petals:
-            vertices = petal.get_petal_vertices()
-            if len(vertices) >= 3:
+            # 预烘焙的季节光照精灵，只合成光源包围盒区域
+            return self.light_cache.draw(screen, self.current_season, light_intensity,
+                                         self.camera.point_to_screen(self.center), self.camera.zoom)
+        return None
+    
+    def draw_petals(self, screen: pygame.Surface) -> pygame.Rect:
+        """按绘制顺序索引绘制花瓣（顶点由批处理层一次算出），返回花瓣的包围盒"""
+        batch = self.petal_batch
+        batch.interpolate(self.render_alpha)
+        positions = batch.world_positions()
+        if self.life_stage == "bloom":
+            # 盛开期花瓣还在展开，静态排序键跟着当前位置刷新
+            self.petal_order.set_static_y(positions[:, 1])
+        draw_order = self.petal_order.update(batch.is_falling, positions)
+        visible = batch.visible()
+        if not self.camera.is_identity and visible.any():
+            # 先按花瓣位置剔除视口外的花瓣（外扩最大花瓣长度），再算顶点
+            visible &= self.camera.contains(positions, float(batch.length.max()))
+        if not visible.any():
+            return None
+        
+        # 只算可见花瓣的顶点，再换算成屏幕坐标
+        rows = np.flatnonzero(visible)
+        vertex_array = self.camera.to_screen(batch.vertices(rows))
+        all_vertices = dict(zip(rows.tolist(), vertex_array.tolist()))
+        
+        for i in draw_order:
+            if visible[i]:
+                petal = self.petals[i]
+                vertices = all_vertices[i]
+                
                 # 花瓣主体（移除阴影以提高性能）
                 petal_color = petal.get_petal_color()
                 pygame.draw.polygon(screen, petal_color, vertices)
                 
                 # 简化的花瓣高光（只在维持期显示）
-                if petal.life_stage == "maintain" and len(vertices) > 2:
-                    highlight_color = SeasonalBloomColors.interpolate_color(
-                        petal_color, (255, 255, 255), 0.3
-                    )
+                if petal.life_stage == "maintain":
+                    highlight_color = SeasonalBloomColors.highlight_color(petal_color)
                     pygame.draw.polygon(screen, highlight_color, vertices, 1)
         
-        # 花心
-        self.draw_enhanced_center(screen)
-        
-        # 优化的粒子效果渲染
-        self.draw_particles_optimized(screen)
+        visible_vertices = vertex_array
+        left, top = np.floor(visible_vertices.min(axis=(0, 1))) - 1
+        right, bottom = np.ceil(visible_vertices.max(axis=(0, 1))) + 1
+        return pygame.Rect(int(left), int(top), int(right - left) + 1, int(bottom - top) + 1)
     
-    def draw_particles_optimized(self, screen: pygame.Surface):
-        """优化的粒子渲染系统 - 分层和批量处理"""
+    def draw_particles_optimized(self, screen: pygame.Surface) -> List[pygame.Rect]:
+        """优化的粒子渲染系统 - 分层且每层一次 blits 提交，返回所有粒子的区域"""
+        rects = []
         if not self.particles:
-            return
-        
-        # 按渲染层次分组粒子
-        background_particles = []  # 背景天气效果
-        mid_particles = []         # 中层花朵效果
-        foreground_particles = []  # 前景特效
-        
-        for particle in self.particles:
-            if particle.type in ["spring_rain", "autumn_wind", "winter_snow"]:
-                background_particles.append(particle)
-            elif particle.type in ["summer_light", "summer_firefly", "magic"]:
-                foreground_particles.append(particle)
-            else:
-                mid_particles.append(particle)
+            return rects
         
-        # 分层渲染
-        self._render_particle_layer(screen, background_particles, "background")
-        self._render_particle_layer(screen, mid_particles, "mid")
-        self._render_particle_layer(screen, foreground_particles, "foreground")
+        # 分层渲染：背景天气 → 中层花朵效果 → 前景特效
+        for layer_type in ("background", "mid", "foreground"):
+            with self.profiler.scope(PARTICLE_LAYER_SCOPES[layer_type]):
+                rects.extend(self._render_particle_layer(screen, layer_type))
+        return rects
     
-    def _render_particle_layer(self, screen: pygame.Surface, particles: list, layer_type: str):
+    def _render_particle_layer(self, screen: pygame.Surface, layer_type: str) -> List[pygame.Rect]:
         """渲染单个粒子层"""
-        if not particles:
-            return
-            
-        # 根据层类型优化渲染
-        if layer_type == "background":
-            # 背景粒子可以使用更简单的渲染
-            for particle in particles:
-                if particle.is_alive():
-                    alpha = int(255 * particle.life / particle.max_life * 0.6)  # 背景透明度降低
-                    size = max(1, int(particle.size * 0.8))  # 背景粒子稍小
-                    pygame.draw.circle(screen, (*particle.color, alpha), 
-                                     (int(particle.x), int(particle.y)), size)
-        elif layer_type == "foreground":
-            # 前景粒子使用完整效果
-            for particle in particles:
-                particle.draw(screen)
+        blit_sequence = self.particles.blit_sequence(self.particle_atlas, layer_type, self.render_alpha, self.camera)
+        if not blit_sequence:
+            return []
+        return screen.blits(blit_sequence)
+
+class SimulationClock:
+    """固定步长模拟时钟 - 累加真实经过的时间，按固定步长推进模拟
+    
+    渲染跟不上时一帧补多步（丢帧但循环不变慢），渲染比模拟快时几帧共用
+    同一步，用 alpha 在两步之间插值显示。
+    """
+    
+    def __init__(self, step: float = 1.0 / FPS, max_steps: int = MAX_STEPS_PER_FRAME):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+    
+    def advance(self, elapsed: float) -> int:
+        """累加经过的秒数，返回本帧需要模拟的步数"""
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            # 卡顿太久（拖动窗口、断点等）时丢弃多余时间，避免越补越慢
+            steps = self.max_steps
+            self.accumulator = self.accumulator % self.step
+        else:
+            self.accumulator -= steps * self.step
+        return steps
+    
+    @property
+    def alpha(self) -> float:
+        """当前时间在上一步和下一步之间的位置 (0-1)"""
+        return min(1.0, self.accumulator / self.step)
+
+class QualityGovernor:
+    """自适应画质调节器 - 根据最近一段时间的实际帧耗时在画质档位间升降
+    
+    耗时超过帧预算的 DOWNGRADE_RATIO 时降一档；连续 UPGRADE_WINDOWS 个窗口都低于
+    UPGRADE_RATIO 时才升一档。两个阈值之间留有余量，每次换档后清空采样重新统计，
+    避免在相邻档位间来回跳。
+    """
+    
+    DOWNGRADE_RATIO = 0.9  # 平均耗时超过预算的90%时降档
+    UPGRADE_RATIO = 0.5    # 平均耗时低于预算的50%时才考虑升档
+    UPGRADE_WINDOWS = 3    # 升档需要连续满足条件的窗口数
+    
+    def __init__(self, target_fps: int = FPS, window: int = 60, tiers=QUALITY_TIERS,
+                 tier: int = DEFAULT_QUALITY_TIER):
+        self.budget_ms = 1000.0 / target_fps
+        self.tiers = tiers
+        self.tier = tier
+        self.frame_times = deque(maxlen=window)
+        self.fast_windows = 0
+    
+    @property
+    def settings(self) -> dict:
+        return self.tiers[self.tier]
+    
+    def record(self, frame_ms: float) -> bool:
+        """记录一帧的耗时（毫秒），档位发生变化时返回 True"""
+        self.frame_times.append(frame_ms)
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return False
+        
+        average = sum(self.frame_times) / len(self.frame_times)
+        self.frame_times.clear()
+        
+        if average > self.budget_ms * self.DOWNGRADE_RATIO:
+            self.fast_windows = 0
+            return self._step(-1)
+        if average < self.budget_ms * self.UPGRADE_RATIO:
+            self.fast_windows += 1
+            if self.fast_windows >= self.UPGRADE_WINDOWS:
+                self.fast_windows = 0
+                return self._step(1)
+        else:
+            self.fast_windows = 0
+        return False
+    
+    def _step(self, direction: int) -> bool:
+        tier = min(max(self.tier + direction, 0), len(self.tiers) - 1)
+        if tier == self.tier:
+            return False
+        self.tier = tier
+        return True
+
+class FontRegistry:
+    """字体注册表 - 每种 (字体, 字号) 只加载一次"""
+    
+    def __init__(self):
+        self.fonts = {}  # (字体, 字号) -> pygame.font.Font
+    
+    def get(self, size: int, face: str = None) -> pygame.font.Font:
+        """获取字体；默认字体加载失败时退回系统 arial（字号按比例缩小）"""
+        key = (face, size)
+        font = self.fonts.get(key)
+        if font is None:
+            try:
+                font = pygame.font.Font(face, size)
+            except:
+                font = pygame.font.SysFont('arial', size * 3 // 4)
+            self.fonts[key] = font
+        return font
+
+class TextCache:
+    """文字表面缓存 - 按 (文字, 字体, 颜色, 抗锯齿) 缓存渲染结果（LRU淘汰）
+    
+    静态标签只渲染一次；天数、百分比等动态文字只有数值变化时才会重新渲染。
+    """
+    
+    MAX_SURFACES = 256  # 缓存的文字表面数量上限
+    
+    def __init__(self, fonts: FontRegistry = None, max_surfaces: int = MAX_SURFACES):
+        self.fonts = fonts if fonts is not None else FontRegistry()
+        self.max_surfaces = max_surfaces
+        self.surfaces = OrderedDict()
+    
+    def render(self, text: str, size: int, color: tuple, antialias: bool = True,
+               face: str = None, premultiplied: bool = False) -> pygame.Surface:
+        """获取渲染好的文字表面（premultiplied 为 True 时返回预乘透明度的版本）"""
+        key = (text, face, size, color, antialias, premultiplied)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        
+        if premultiplied:
+            surface = self.render(text, size, color, antialias, face).convert_alpha().premul_alpha()
+        else:
+            surface = self.fonts.get(size, face).render(text, antialias, color)
+            surface = _display_format(surface, alpha=bool(surface.get_flags() & pygame.SRCALPHA))
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+class UIPanel:
+    """缓存的UI面板 - 内容画在面板自己的透明表面上，绑定的值变化时才重画
+    
+    支持预乘透明度时（pygame 2.1.4+）面板以预乘形式保存，用 BLEND_PREMULTIPLIED
+    一次合成到屏幕上，和直接在屏幕上逐层绘制半透明背景、文字的效果相同。
+    """
+    
+    PREMULTIPLIED = hasattr(pygame.Surface, "premul_alpha")
+    
+    def __init__(self, rect, render, bind, refresh_interval: int = 1, text_cache: "TextCache" = None):
+        self.rect = pygame.Rect(rect)
+        self.render = render                    # render(panel)：在面板坐标下绘制内容
+        self.bind = bind                        # bind()：返回决定面板内容的值
+        self.refresh_interval = refresh_interval
+        self.text_cache = text_cache
+        self.surface = None
+        self.values = None
+        self.last_check = 0
+        self.redraws = 0
+    
+    @property
+    def blend_flags(self) -> int:
+        return pygame.BLEND_PREMULTIPLIED if self.PREMULTIPLIED else 0
+    
+    def refresh(self, frame: int) -> bool:
+        """到了刷新间隔且绑定的值变化时重画面板，返回是否重画"""
+        if self.surface is not None:
+            if frame - self.last_check < self.refresh_interval:
+                return False
+            values = self.bind()
+            self.last_check = frame
+            if values == self.values:
+                return False
+        else:
+            values = self.bind()
+            self.last_check = frame
+        
+        self.values = values
+        self.surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        self.render(self)
+        self.surface = _display_format(self.surface, alpha=True)
+        self.redraws += 1
+        return True
+    
+    def fill(self, color: tuple, width: int = 0, rect=None):
+        """填充面板或其中的 rect（width > 0 时只画边框），半透明颜色按需预乘"""
+        if self.PREMULTIPLIED and len(color) == 4:
+            alpha = color[3]
+            color = (color[0] * alpha // 255, color[1] * alpha // 255, color[2] * alpha // 255, alpha)
+        pygame.draw.rect(self.surface, color, rect or self.surface.get_rect(), width)
+    
+    def blit_text(self, text: str, size: int, color: tuple, position=None, center=None) -> pygame.Rect:
+        """在面板上绘制缓存的文字（position 为左上角，或用 center 居中）"""
+        text_surface = self.text_cache.render(text, size, color, premultiplied=self.PREMULTIPLIED)
+        rect = text_surface.get_rect()
+        if center is not None:
+            rect.center = center
+        else:
+            rect.topleft = position
+        return self.surface.blit(text_surface, rect, special_flags=self.blend_flags)
+
+class UICompositor:
+    """UI合成器 - 每帧只检查各面板绑定的值，再把缓存的面板表面一次 blits 到屏幕上"""
+    
+    def __init__(self, text_cache: TextCache = None, refresh_intervals: dict = UI_REFRESH_INTERVALS):
+        self.text_cache = text_cache if text_cache is not None else TextCache()
+        self.refresh_intervals = refresh_intervals
+        self.panels: List[UIPanel] = []
+        self.frame = 0
+    
+    def add(self, name: str, rect, render, bind) -> UIPanel:
+        """按绘制顺序添加面板（刷新间隔取 refresh_intervals[name]）"""
+        panel = UIPanel(rect, render, bind, self.refresh_intervals.get(name, 1), self.text_cache)
+        panel.name = name
+        self.panels.append(panel)
+        return panel
+    
+    def invalidate(self):
+        """下一帧强制重画所有面板"""
+        for panel in self.panels:
+            panel.surface = None
+    
+    def refresh(self, dirty: DirtyRectTracker = None):
+        """刷新需要重画的面板；脏矩形模式下要在绘制场景之前调用，重画过的面板本帧整块恢复"""
+        for panel in self.panels:
+            if panel.refresh(self.frame) and dirty is not None:
+                dirty.expire(panel.rect)
+        self.frame += 1
+    
+    def compose(self, screen: pygame.Surface, dirty: DirtyRectTracker = None) -> List[pygame.Rect]:
+        """把面板合成到屏幕，返回合成过的区域
+        
+        不传 dirty 时先刷新再合成全部面板；脏矩形模式下面板已经由 refresh 刷新，
+        只合成本帧开始时被恢复过的面板。
+        """
+        if dirty is None:
+            self.refresh()
+            panels = self.panels
         else:
-            # 中层粒子使用标准渲染
-            for particle in particles:
-                particle.draw(screen)
+            panels = [panel for panel in self.panels if dirty.needs_compose(panel.rect)]
+        return screen.blits([(panel.surface, panel.rect.topleft, None, panel.blend_flags)
+                             for panel in panels])
 
 class EnhancedRoseAnimation:
     """增强版月季花动画主控制类"""
     
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("增强季节循环月季花动画")
+    TITLE_TEXT = "Enhanced Seasonal Rose Bloom Animation"
+    CONTROL_TEXT = "SPACE: Speed up | Drag/Wheel: Pan/Zoom | ESC: Exit"
+    PAN_STEP = 40        # 方向键每次平移的屏幕像素
+    ZOOM_STEP = 1.25     # 每次缩放的倍数
+    PROGRESS_BAR_SIZE = (500, 25)
+    STAGE_LABELS = {"bud": "Bud", "bloom": "Bloom", "maintain": "Peak", "wither": "Wither",
+                    "dead": "Sleep", "reset": "Reset"}  # 进度条上的阶段标签
+    
+    def __init__(self, dirty_rects: bool = False, screen: pygame.Surface = None,
+                 render_fps: int = FPS, quality: str = None, profile_path: str = None,
+                 ui_refresh_intervals: dict = UI_REFRESH_INTERVALS, capture: FrameCapture = None,
+                 phenology: PhenologyFeed = None):
+        if screen is None:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("增强季节循环月季花动画")
+        else:
+            # 离屏渲染（无窗口导出）
+            self.screen = screen
         self.clock = pygame.time.Clock()
+        self.render_fps = render_fps  # 渲染帧率上限（0 表示不限），与模拟步长无关
+        self.sim_clock = SimulationClock()
+        
+        # 帧耗时分析（F3 切换叠加显示；指定 profile_path 时从启动开始计时，退出时导出）
+        self.profile_path = profile_path
+        self.profiler = FrameProfiler(enabled=profile_path is not None)
         
-        self.rose = SeasonalRose()
+        # 异步帧捕获（可选）：每帧画完后交给后台线程写盘
+        self.capture = capture
+        
+        # 物候观测数据（可选）：数据面板显示当前循环、当前真实天数对应日期的观测记录
+        self.phenology = phenology
+        
+        self.rose = SeasonalRose(profiler=self.profiler)
         self.running = True
         
-        # 字体
-        try:
-            self.font = pygame.font.Font(None, 32)
-            self.title_font = pygame.font.Font(None, 48)
-        except:
-            self.font = pygame.font.SysFont('arial', 24)
-            self.title_font = pygame.font.SysFont('arial', 36)
+        # 画质："auto" 按实测帧耗时自动调节，档位名固定画质，None 保持默认档位
+        self.governor = None
+        if quality == "auto":
+            self.governor = QualityGovernor(render_fps or FPS)
+        elif quality is not None:
+            tier_names = [tier["name"] for tier in QUALITY_TIERS]
+            self.rose.apply_quality(QUALITY_TIERS[tier_names.index(quality)])
+        
+        # 脏矩形模式（可选）：只把本帧改动的区域推送到显示器
+        self.dirty_rects = DirtyRectTracker(self.screen.get_size()) if dirty_rects else None
+        
+        # 字体（每种字号只加载一次）和文字表面缓存
+        self.fonts = FontRegistry()
+        self.text_cache = TextCache(self.fonts)
+        
+        # 合成的UI面板（内容不变时直接复用缓存的表面）
+        self.ui = self._build_ui(ui_refresh_intervals)
+        if self.dirty_rects is not None:
+            for panel in self.ui.panels:
+                self.dirty_rects.add_static(panel.rect)
+    
+    def _mark_dirty(self, rect):
+        """脏矩形模式下登记本帧画在场景之上的区域（性能浮层）"""
+        if self.dirty_rects is not None:
+            self.dirty_rects.add(rect)
+    
+    def _build_ui(self, refresh_intervals: dict) -> "UICompositor":
+        """创建UI面板（标题、信息面板、进度条、控制说明、真实数据面板）"""
+        ui = UICompositor(self.text_cache, refresh_intervals)
+        
+        # 标题（静态）
+        title_size = self.text_cache.render(self.TITLE_TEXT, 48, (80, 80, 80)).get_size()
+        title_rect = pygame.Rect((0, 0), title_size)
+        title_rect.center = (SCREEN_WIDTH // 2, 50)
+        ui.add("title", title_rect.inflate(50, 30), self._render_title, lambda: None)
+        
+        # 信息面板（粒子数每帧都在变，按较低频率刷新）
+        ui.add("info", (15, SCREEN_HEIGHT - 200, 380, 180), self._render_info_panel,
+               lambda: (self.rose.life_stage, self.rose.current_season, int(self.rose.stage_progress * 100),
+                        int(self.rose.total_progress * 100), len(self.rose.petals), len(self.rose.particles)))
+        
+        # 循环进度条（进度条宽度或天数变化时重画）
+        bar_x, bar_y = self.progress_bar_position()
+        ui.add("progress", (bar_x - 40, bar_y - 55, self.PROGRESS_BAR_SIZE[0] + 80, self.PROGRESS_BAR_SIZE[1] + 85),
+               self._render_cycle_progress,
+               lambda: (int(self.PROGRESS_BAR_SIZE[0] * self.rose.total_progress), self.calculate_current_day(),
+                        self.rose.current_season))
+        
+        # 控制说明（静态）
+        control_size = self.text_cache.render(self.CONTROL_TEXT, 32, (120, 120, 120)).get_size()
+        ui.add("controls", pygame.Rect((25, SCREEN_HEIGHT - 25), control_size), self._render_controls, lambda: None)
+        
+        # 真实数据面板（只随季节变化；较长的描述文字会超出背景，面板一直延伸到屏幕右边缘）
+        # 接入观测数据时改为显示当天的观测记录
+        if self.phenology is not None:
+            ui.add("phenology", (SCREEN_WIDTH - 420, 120, 420, 300), self._render_phenology_panel,
+                   lambda: (self.current_cycle(), self.calculate_current_day()))
+        elif SHOW_REAL_DATA:
+            ui.add("data", (SCREEN_WIDTH - 420, 120, 420, 300), self._render_real_data_panel,
+                   lambda: self.rose.current_season)
+        return ui
     
     def draw_ui(self):
-        """绘制用户界面"""
-        # 标题
-        title_text = "Enhanced Seasonal Rose Bloom Animation"
-        title_surface = self.title_font.render(title_text, True, (80, 80, 80))
-        title_rect = title_surface.get_rect(center=(SCREEN_WIDTH // 2, 50))
-        
+        """绘制用户界面（合成缓存好的面板；脏矩形模式下只合成被恢复过的面板）"""
+        rects = self.ui.compose(self.screen, self.dirty_rects)
+        if self.dirty_rects is not None:
+            for rect in rects:
+                self.dirty_rects.push(rect)
+    
+    def _render_title(self, panel: "UIPanel"):
+        """标题面板"""
         # 半透明背景
-        bg_rect = pygame.Rect(title_rect.x - 25, title_rect.y - 15,
-                             title_rect.width + 50, title_rect.height + 30)
-        temp_bg = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(temp_bg, (255, 255, 255, 220), temp_bg.get_rect())
-        pygame.draw.rect(temp_bg, (120, 120, 120), temp_bg.get_rect(), 3)
-        self.screen.blit(temp_bg, bg_rect.topleft)
-        
-        self.screen.blit(title_surface, title_rect)
-        
-        # 状态信息
+        panel.fill((255, 255, 255, 220))
+        panel.fill((120, 120, 120), width=3)
+        panel.blit_text(self.TITLE_TEXT, 48, (80, 80, 80), (25, 15))
+    
+    def _render_info_panel(self, panel: "UIPanel"):
+        """状态信息面板"""
         stage_names = {
             "bud": "Budding",
             "bloom": "Blooming", 
@@ -1349,89 +3072,46 @@ class EnhancedRoseAnimation:
             "winter": "Winter"
         }
         
-        stage_text = f"Stage: {stage_names.get(self.rose.life_stage, self.rose.life_stage)}"
-        season_text = f"Season: {season_names.get(self.rose.current_season, self.rose.current_season)}"
-        progress_text = f"Stage Progress: {int(self.rose.stage_progress * 100)}%"
-        cycle_text = f"Cycle Progress: {int(self.rose.total_progress * 100)}%"
-        petal_text = f"Petals: {len(self.rose.petals)}"
-        particle_text = f"Particles: {len(self.rose.particles)}"
-        
-        # 信息面板
-        info_y = SCREEN_HEIGHT - 200
-        info_bg = pygame.Rect(15, info_y, 380, 180)
-        temp_info = pygame.Surface((info_bg.width, info_bg.height), pygame.SRCALPHA)
-        pygame.draw.rect(temp_info, (0, 0, 0, 150), temp_info.get_rect())
-        pygame.draw.rect(temp_info, (255, 255, 255), temp_info.get_rect(), 2)
-        self.screen.blit(temp_info, info_bg.topleft)
+        life_stage, season, stage_percent, cycle_percent, petal_count, particle_count = panel.values
+        stage_text = f"Stage: {stage_names.get(life_stage, life_stage)}"
+        season_text = f"Season: {season_names.get(season, season)}"
+        progress_text = f"Stage Progress: {stage_percent}%"
+        cycle_text = f"Cycle Progress: {cycle_percent}%"
+        petal_text = f"Petals: {petal_count}"
+        particle_text = f"Particles: {particle_count}"
+        
+        panel.fill((0, 0, 0, 150))
+        panel.fill((255, 255, 255), width=2)
         
         texts = [stage_text, season_text, progress_text, cycle_text, petal_text, particle_text]
         for i, text in enumerate(texts):
-            text_surface = self.font.render(text, True, (255, 255, 255))
-            self.screen.blit(text_surface, (25, info_y + 15 + i * 25))
-        
-        # 循环进度条
-        self.draw_cycle_progress()
-        
-        # 控制说明
-        control_text = "SPACE: Speed up | ESC: Exit"
-        control_surface = self.font.render(control_text, True, (120, 120, 120))
-        self.screen.blit(control_surface, (25, SCREEN_HEIGHT - 25))
-        
-        # 显示真实数据
-        if SHOW_REAL_DATA:
-            self.draw_real_data_panel()
+            panel.blit_text(text, 32, (255, 255, 255), (10, 15 + i * 25))
+    
+    def _render_controls(self, panel: "UIPanel"):
+        """控制说明"""
+        panel.blit_text(self.CONTROL_TEXT, 32, (120, 120, 120), (0, 0))
     
     def calculate_current_day(self):
-        """计算当前对应的真实天数"""
-        from real_data_config import ANIMATION_TIME_MAPPING
-        
-        # 获取当前季节和进度
-        current_season = self.rose.current_season
-        stage_progress = self.rose.stage_progress
-        
-        # 根据季节和阶段计算天数
-        if current_season == "spring":
-            # 春季 (25天)
-            return int(stage_progress * 25) + 1
-        elif current_season == "summer":
-            # 夏季 (40天)，从第26天开始
-            return int(stage_progress * 40) + 26
-        elif current_season == "autumn":
-            # 秋季 (30天)，从第66天开始
-            return int(stage_progress * 30) + 66
-        else:  # winter
-            # 冬季休眠期，显示为第95天（年度结束）
-            return 95
+        """计算当前对应的真实天数（春季第1-25天，夏季第26-65天，秋季第66-95天，冬季休眠期为第95天）"""
+        return self.rose.current_day
+    
+    def current_cycle(self) -> int:
+        """当前是第几个循环（从0开始）"""
+        return self.rose.frame_count // self.rose.total_cycle_duration
     
-    def draw_real_data_panel(self):
+    def _render_real_data_panel(self, panel: "UIPanel"):
         """显示真实月季花数据"""
         # 获取当前季节的真实数据
-        current_season_data = REAL_ROSE_DATA.get(self.rose.current_season, {})
-        
-        # 数据面板位置和大小
-        panel_x = SCREEN_WIDTH - 420
-        panel_y = 120
-        panel_width = 400
-        panel_height = 300
+        current_season_data = REAL_ROSE_DATA.get(panel.values, {})
         
         # 绘制数据面板背景
-        panel_bg = pygame.Rect(panel_x, panel_y, panel_width, panel_height)
-        temp_panel = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
-        pygame.draw.rect(temp_panel, (20, 50, 80, 200), temp_panel.get_rect())
-        pygame.draw.rect(temp_panel, (100, 150, 255), temp_panel.get_rect(), 3)
-        self.screen.blit(temp_panel, panel_bg.topleft)
+        panel_bg = pygame.Rect(0, 0, 400, 300)
+        panel.fill((20, 50, 80, 200), rect=panel_bg)
+        panel.fill((100, 150, 255), width=3, rect=panel_bg)
         
         # 面板标题
-        try:
-            data_font = pygame.font.Font(None, 24)
-            title_font = pygame.font.Font(None, 28)
-        except:
-            data_font = pygame.font.SysFont('arial', 18)
-            title_font = pygame.font.SysFont('arial', 22)
-        
         title_text = "Real Rose Growth Data"
-        title_surface = title_font.render(title_text, True, (255, 255, 255))
-        self.screen.blit(title_surface, (panel_x + 15, panel_y + 15))
+        panel.blit_text(title_text, 28, (255, 255, 255), (15, 15))
         
         # 显示当前季节数据（英文版本）
         if current_season_data:
@@ -1450,40 +3130,71 @@ class EnhancedRoseAnimation:
             
             for i, text in enumerate(data_texts):
                 if text:  # 跳过空行
-                    text_surface = data_font.render(text, True, (255, 255, 255))
-                    self.screen.blit(text_surface, (panel_x + 15, panel_y + 50 + i * 22))
+                    panel.blit_text(text, 24, (255, 255, 255), (15, 50 + i * 22))
         
         # 显示数据来源
-        source_y = panel_y + panel_height - 40
+        source_y = panel_bg.height - 40
         source_text = "Data Source: China Meteorological Bureau + CAS"
-        source_surface = data_font.render(source_text, True, (180, 180, 180))
-        self.screen.blit(source_surface, (panel_x + 15, source_y))
+        panel.blit_text(source_text, 24, (180, 180, 180), (15, source_y))
+    
+    @staticmethod
+    def _format_observation(value: float, unit: str) -> str:
+        """观测值文字，缺失（NaN）时显示 N/A"""
+        return "N/A" if value is None or math.isnan(value) else f"{value:.1f}{unit}"
     
-    def draw_cycle_progress(self):
-        """绘制循环进度条"""
-        bar_width = 500
-        bar_height = 25
-        bar_x = (SCREEN_WIDTH - bar_width) // 2
-        bar_y = SCREEN_HEIGHT - 80
+    def _render_phenology_panel(self, panel: "UIPanel"):
+        """显示当前真实天数对应日期的物候观测记录"""
+        cycle, day = panel.values
+        when = self.phenology.date_for(cycle, day)
+        record = self.phenology.record(cycle, day) or {}
+        
+        panel_bg = pygame.Rect(0, 0, 400, 300)
+        panel.fill((20, 50, 80, 200), rect=panel_bg)
+        panel.fill((100, 150, 255), width=3, rect=panel_bg)
+        panel.blit_text("Observed Rose Growth Data", 28, (255, 255, 255), (15, 15))
+        
+        data_texts = [
+            f"Site: {self.phenology.site}",
+            f"Date: {when.isoformat()} (day {day})",
+            f"Temperature: {self._format_observation(record.get('temperature'), '°C')}",
+            f"Humidity: {self._format_observation(record.get('humidity'), '%')}",
+            f"Sunlight: {self._format_observation(record.get('sunlight'), ' hrs/day')}",
+            f"Soil temp: {self._format_observation(record.get('soil_temperature'), '°C')}",
+            f"Growth phase: {record.get('phase') or 'N/A'}",
+        ]
+        if not record:
+            data_texts.append("No observation for this day")
+        for i, text in enumerate(data_texts):
+            panel.blit_text(text, 24, (255, 255, 255), (15, 50 + i * 22))
+        
+        source_text = f"Data Source: {os.path.basename(self.phenology.store.path)}"
+        panel.blit_text(source_text, 24, (180, 180, 180), (15, panel_bg.height - 40))
+    
+    def progress_bar_position(self) -> Tuple[int, int]:
+        """循环进度条左上角的屏幕坐标"""
+        bar_width, _ = self.PROGRESS_BAR_SIZE
+        return (SCREEN_WIDTH - bar_width) // 2, SCREEN_HEIGHT - 80
+    
+    def _render_cycle_progress(self, panel: "UIPanel"):
+        """绘制循环进度条（面板坐标下进度条左上角在 (40, 55)）"""
+        surface = panel.surface
+        bar_width, bar_height = self.PROGRESS_BAR_SIZE
+        bar_x, bar_y = 40, 55
+        progress_width, current_day, season = panel.values
         
         # 背景
-        pygame.draw.rect(self.screen, (40, 40, 40),
+        pygame.draw.rect(surface, (40, 40, 40),
                         (bar_x, bar_y, bar_width, bar_height))
-        pygame.draw.rect(self.screen, (200, 200, 200),
+        pygame.draw.rect(surface, (200, 200, 200),
                         (bar_x, bar_y, bar_width, bar_height), 2)
         
         # 进度
-        progress_width = int(bar_width * self.rose.total_progress)
         if progress_width > 0:
-            season_colors = self.rose.get_current_season_colors()
-            progress_color = season_colors['bloom']
+            progress_color = SEASON_PALETTES.get(season).bloom
             
-            pygame.draw.rect(self.screen, progress_color,
+            pygame.draw.rect(surface, progress_color,
                            (bar_x, bar_y, progress_width, bar_height))
         
-        # 计算当前天数（基于真实数据映射）
-        current_day = self.calculate_current_day()
-        
         # 天数显示位置（跟随进度条）
         day_x = bar_x + progress_width - 15  # 稍微向左偏移避免超出边界
         if day_x < bar_x + 30:  # 确保不会超出进度条左边界
@@ -1491,91 +3202,192 @@ class EnhancedRoseAnimation:
         day_y = bar_y - 35
         
         # 绘制天数背景圆圈
-        pygame.draw.circle(self.screen, (50, 50, 50), (day_x, day_y), 18)
-        pygame.draw.circle(self.screen, (255, 255, 255), (day_x, day_y), 18, 2)
+        pygame.draw.circle(surface, (50, 50, 50), (day_x, day_y), 18)
+        pygame.draw.circle(surface, (255, 255, 255), (day_x, day_y), 18, 2)
         
-        # 绘制天数文字
-        day_font = pygame.font.Font(None, 24)
+        # 绘制天数文字（只有天数变化时才重新渲染）
         day_text = f"{current_day}"
-        day_surface = day_font.render(day_text, True, (255, 255, 255))
-        day_rect = day_surface.get_rect(center=(day_x, day_y))
-        self.screen.blit(day_surface, day_rect)
+        panel.blit_text(day_text, 24, (255, 255, 255), center=(day_x, day_y))
         
         # 绘制"Day"标签
-        label_font = pygame.font.Font(None, 18)
         label_text = "Day"
-        label_surface = label_font.render(label_text, True, (180, 180, 180))
-        label_rect = label_surface.get_rect(center=(day_x, day_y + 25))
-        self.screen.blit(label_surface, label_rect)
-        
-        # 阶段分割（移除花苞期）- 使用更短的标签避免重叠
-        stages = ["Bloom", "Peak", "Wither", "Sleep", "Reset"]
-        durations = [
-            self.rose.bloom_duration, 
-            self.rose.maintain_duration,
-            self.rose.wither_duration,
-            self.rose.dead_duration,
-            self.rose.reset_duration
-        ]
+        panel.blit_text(label_text, 18, (180, 180, 180), center=(day_x, day_y + 25))
         
-        current_pos = 0
-        for i, (stage, duration) in enumerate(zip(stages, durations)):
-            # 计算当前阶段的起始位置
-            stage_start = current_pos
-            current_pos += duration
-            stage_end = current_pos
+        # 阶段分割（按时间线，跳过帧数为 0 的阶段）- 使用更短的标签避免重叠
+        spans = self.rose.timeline.spans()
+        for i, (name, stage_start, duration) in enumerate(spans):
+            stage = self.STAGE_LABELS.get(name, name.title())
+            current_pos = stage_end = stage_start + duration
             
             x_pos = bar_x + int(bar_width * current_pos / self.rose.total_cycle_duration)
             
             # 分割线
-            pygame.draw.line(self.screen, (255, 255, 255),
+            pygame.draw.line(surface, (255, 255, 255),
                            (x_pos, bar_y), (x_pos, bar_y + bar_height), 2)
             
             # 标签（在每个阶段的中心位置显示）
-            if i < len(stages) - 1:  # 不显示最后一个阶段的标签（Reset阶段很短）
-                label_font = pygame.font.Font(None, 20)
-                label_surface = label_font.render(stage, True, (180, 180, 180))
+            if i < len(spans) - 1:  # 不显示最后一个阶段的标签（Reset阶段很短）
+                label_width = self.text_cache.render(stage, 20, (180, 180, 180)).get_width()
                 
                 # 计算阶段的中心位置
                 stage_center = (stage_start + stage_end) / 2
                 center_x = bar_x + int(bar_width * stage_center / self.rose.total_cycle_duration)
                 
                 # 使标签居中
-                label_rect = label_surface.get_rect()
-                label_x = center_x - label_rect.width // 2
+                label_x = center_x - label_width // 2
                 label_y = bar_y + bar_height + 8
                 
-                self.screen.blit(label_surface, (label_x, label_y))
+                panel.blit_text(stage, 20, (180, 180, 180), (label_x, label_y))
+    
+    def present(self):
+        """把本帧推送到显示器（脏矩形模式下只更新改动区域）"""
+        if self.dirty_rects is None:
+            pygame.display.flip()
+            return
+        
+        rects = self.dirty_rects.end_frame()
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
     
     def handle_events(self):
         """处理事件"""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.ACTIVEEVENT):
+                # 窗口被遮挡或重新显示后需要整屏重绘
+                if self.dirty_rects is not None:
+                    self.dirty_rects.invalidate()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle_overlay()
+                    if self.dirty_rects is not None:
+                        self.dirty_rects.invalidate()
                 elif event.key == pygame.K_SPACE:
-                    # 加速效果
-                    self.rose.frame_count += 100
+                    # 加速效果（跳帧会补齐中间帧的模拟）
+                    self.rose.seek(self.rose.frame_count + 100)
+                    if self.dirty_rects is not None:
+                        self.dirty_rects.invalidate()
+                else:
+                    self.handle_camera_key(event.key)
+            elif event.type == pygame.MOUSEWHEEL:
+                self.rose.camera.zoom_at(self.ZOOM_STEP ** event.y, pygame.mouse.get_pos())
+                self._camera_moved()
+            elif event.type == pygame.MOUSEMOTION and event.buttons[0]:
+                self.rose.camera.pan(*event.rel)
+                self._camera_moved()
+    
+    def handle_camera_key(self, key: int):
+        """方向键平移，+/- 缩放，Home 复位相机"""
+        camera = self.rose.camera
+        pans = {pygame.K_LEFT: (self.PAN_STEP, 0), pygame.K_RIGHT: (-self.PAN_STEP, 0),
+                pygame.K_UP: (0, self.PAN_STEP), pygame.K_DOWN: (0, -self.PAN_STEP)}
+        if key in pans:
+            camera.pan(*pans[key])
+        elif key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+            camera.zoom_at(self.ZOOM_STEP)
+        elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            camera.zoom_at(1 / self.ZOOM_STEP)
+        elif key == pygame.K_HOME:
+            camera.reset()
+        else:
+            return
+        self._camera_moved()
+    
+    def _camera_moved(self):
+        """相机移动后整个场景都变了，脏矩形模式下需要整屏重绘"""
+        if self.dirty_rects is not None:
+            self.dirty_rects.invalidate()
     
     def run(self):
         """运行动画"""
+        # 渲染第一帧之前至少模拟一步（花瓣颜色在第一次更新时才确定）
+        self.rose.update()
+        self.clock.tick()
         while self.running:
+            self.profiler.begin_frame()
             self.handle_events()
             
-            # 更新
-            self.rose.update()
+            # 按固定步长更新（与渲染帧率无关）
+            steps = self.sim_clock.advance(self.clock.get_time() / 1000.0)
+            for _ in range(steps):
+                self.rose.update()
+            self.rose.render_alpha = self.sim_clock.alpha
             
             # 绘制
-            self.rose.draw(self.screen)
-            self.draw_ui()
+            if self.dirty_rects is not None:
+                self.dirty_rects.begin_frame()
+                with self.profiler.scope("ui"):
+                    self.ui.refresh(self.dirty_rects)
+            self.rose.draw(self.screen, self.dirty_rects)
+            with self.profiler.scope("ui"):
+                self.draw_ui()
+            self._mark_dirty(self.profiler.draw_overlay(self.screen))
             
-            pygame.display.flip()
-            self.clock.tick(FPS)
-        
+            if self.capture is not None:
+                with self.profiler.scope("capture"):
+                    self.capture.capture(self.screen)
+            
+            with self.profiler.scope("present"):
+                self.present()
+            self.profiler.end_frame()
+            self.clock.tick(self.render_fps)
+            
+            # get_rawtime 不含 tick 的等待时间，即本帧实际的工作耗时
+            if self.governor is not None and self.governor.record(self.clock.get_rawtime()):
+                self.rose.apply_quality(self.governor.settings)
+                print(f"画质调整为 {self.governor.settings['name']}")
+        
+        if self.profile_path is not None:
+            self.profiler.dump(self.profile_path)
+            print(f"帧耗时统计已导出到 {self.profile_path}")
+        if self.capture is not None:
+            stats = self.capture.close()
+            print(f"已捕获 {stats['written']} 帧到 {self.capture.output_dir}（丢弃 {stats['dropped']} 帧）")
+        if self.phenology is not None:
+            self.phenology.store.close()
         pygame.quit()
 
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="增强季节循环月季花动画")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="只刷新每帧改动的屏幕区域（适合低功耗显示设备）")
+    parser.add_argument("--fps", type=int, default=FPS,
+                        help=f"渲染帧率上限，0 表示不限（模拟始终按 {FPS} 步/秒推进）")
+    parser.add_argument("--quality", choices=["auto"] + [tier["name"] for tier in QUALITY_TIERS],
+                        default="auto", help="画质档位，auto 按实测帧耗时自动调节（默认）")
+    parser.add_argument("--profile", metavar="PATH", default=None,
+                        help="记录各阶段帧耗时，退出时导出到 PATH（.csv 或 .jsonl）")
+    parser.add_argument("--capture", metavar="DIR", default=None,
+                        help="把每一帧写到 DIR（后台线程编码写盘）")
+    parser.add_argument("--capture-format", choices=FRAME_FORMATS, default="png",
+                        help="捕获帧格式：png 或 rgb 原始数据（rgb 拼接成一个 frames.rgb 文件）")
+    parser.add_argument("--capture-policy", choices=CAPTURE_POLICIES, default="drop",
+                        help="写盘跟不上时：drop 丢弃新帧保持帧率（默认），block 等待写盘不丢帧")
+    parser.add_argument("--capture-queue", type=int, default=CAPTURE_QUEUE_SIZE,
+                        help=f"等待写盘的帧数上限（默认 {CAPTURE_QUEUE_SIZE}）")
+    parser.add_argument("--phenology", metavar="PATH", default=None,
+                        help="物候观测数据文件（phenology_data.py convert 生成），数据面板显示当天的观测值")
+    parser.add_argument("--site", default=None, help="观测站点名（默认数据中的第一个站点）")
+    parser.add_argument("--start-date", type=datetime.date.fromisoformat, default=None,
+                        help="第1天对应的日期 YYYY-MM-DD（默认该站点第一年的3月1日）")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    animation = EnhancedRoseAnimation()
+    args = parse_args()
+    capture = None
+    if args.capture is not None:
+        capture = FrameCapture(args.capture, args.capture_format, args.capture_policy,
+                               args.capture_queue, stream=args.capture_format == "rgb")
+    phenology = None
+    if args.phenology is not None:
+        phenology = PhenologyFeed(PhenologyStore(args.phenology), args.site, args.start_date)
+    animation = EnhancedRoseAnimation(dirty_rects=args.dirty_rects, render_fps=args.fps,
+                                      quality=args.quality, profile_path=args.profile, capture=capture,
+                                      phenology=phenology)
     animation.run()
\ No newline at end of file
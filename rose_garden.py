@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+月季花园模式
+成百上千朵月季花共用一套花瓣布局模板和各阶段曲线，每朵花只保存位置、缩放、
+相位偏移和配色编号（十几个字节），所有花朵的生命周期在一次数组运算中批量推进。
+
+花瓣几何是循环位置的函数：盛开、维持阶段直接按缓动曲线求值，凋零阶段的
+飘落轨迹在模板里预先模拟一次（花朵局部坐标），所有花朵按缩放和位置复用。
+
+用法示例：
+    python rose_garden.py --roses 300
+"""
+
+import argparse
+
+import numpy as np
+import pygame
+
+from frame_profiler import FrameProfiler
+from rose_animation import (SCREEN_WIDTH, SCREEN_HEIGHT, FPS, RANDOM_SEED, PETAL_LAYER_COUNTS,
+                            Camera, EnhancedPetal, PetalBatch, PetalTracks, RandomStreams,
+                            SeasonalBackground, SeasonalBloomColors, SeasonalRose, SimulationClock)
+
+# 生命周期阶段（与 SeasonalRose 的阶段顺序和季节相同）
+STAGES = tuple(stage for stage, _ in SeasonalRose.LIFECYCLE)
+STAGE_IDS = {name: stage_id for stage_id, name in enumerate(STAGES)}
+STAGE_SEASONS = tuple(season for _, season in SeasonalRose.LIFECYCLE)
+SEASONS = ("spring", "summer", "autumn", "winter")
+STAGE_SEASON_IDS = np.array([SEASONS.index(season) for season in STAGE_SEASONS])
+COLOR_ROLES = ("bud_deep", "bud_light", "bloom", "glow")
+
+# 默认配色：原始季节配色，再加几种向不同颜色偏移的变体
+GARDEN_TINTS = ((255, 255, 255), (255, 215, 0), (139, 0, 0), (186, 85, 211))
+GARDEN_TINT_AMOUNT = 0.35
+
+def season_palette() -> dict:
+    """原始季节配色 {季节: 颜色字典}"""
+    return {season: SeasonalBloomColors.get_season_colors(season) for season in SEASONS}
+
+def tinted_palette(palette: dict, tint: tuple, amount: float) -> dict:
+    """把配色中的每种颜色向 tint 混合 amount"""
+    return {season: {role: SeasonalBloomColors.interpolate_color(color, tint, amount)
+                     for role, color in colors.items()}
+            for season, colors in palette.items()}
+
+def default_palettes() -> list:
+    """花园默认的配色列表（第 0 个是原始季节配色）"""
+    base = season_palette()
+    return [base] + [tinted_palette(base, tint, GARDEN_TINT_AMOUNT) for tint in GARDEN_TINTS]
+
+class PetalTemplate:
+    """共享的花瓣模板 - 一朵花所有花瓣的固定参数，每片花瓣一列
+
+    由 EnhancedPetal 的布局参数构建，花园里所有花朵共用。持续不变的量
+    （维持期保持的旋转和弯曲、凋零期的飘落轨迹和绘制顺序）在这里只算一次。
+    """
+
+    def __init__(self, petals: list):
+        self.count = len(petals)
+        self.layer = np.array([p.layer for p in petals], dtype=np.int32)
+        self.inner = self.layer <= 2
+        self.angle = np.array([p.base_angle + p.angle_offset for p in petals])
+        self.direction = np.stack([np.cos(self.angle), np.sin(self.angle)], axis=1)
+        self.outline = PetalBatch.build_outline(petals[0].control_points)
+
+        self.base_length = np.array([p.base_length for p in petals], dtype=np.float64)
+        self.base_width = np.array([p.base_width for p in petals], dtype=np.float64)
+        self.max_distance = np.array([p.max_distance for p in petals], dtype=np.float64)
+        self.wither_delay = np.array([p.wither_delay for p in petals])
+        self.fall_speed = np.array([p.fall_speed_base for p in petals])
+        self.fall_rotation = np.array([p.fall_rotation_base for p in petals])
+
+        # 盛开期和维持期的烘焙轨道（与 SeasonalRose 共用同一套）
+        self.tracks = PetalTracks(petals, SeasonalRose.bloom_duration, SeasonalRose.maintain_duration)
+
+        # 盛开期最后一帧的旋转和弯曲（维持期、凋零期一直保持）
+        last_bloom = self.tracks.bloom[-1].astype(np.float64)
+        self.held_rotation = last_bloom[:, 2]
+        self.held_bend = last_bloom[:, 4]
+
+        # 维持期最后一帧的距离（凋零期保持）
+        self.held_distance = self.tracks.maintain[-1, :, 3].astype(np.float64)
+
+        # 绘制顺序：(-层次, 完全展开时的 y)，即 PetalDrawOrder 在盛开期结束后的静态顺序
+        self.static_y = self.direction[:, 1] * self.max_distance
+        self.static_order = np.lexsort((self.static_y, -self.layer)).tolist()
+        self._bake_fall()
+
+        # 局部包围盒 (左, 上, 右, 下)：花瓣最远伸到 reach（弹性缓动最多超出 25%），
+        # 凋零期还要包含飘落轨迹
+        petal_reach = float(self.base_length.max()) * 1.25
+        reach = float(self.max_distance.max()) + 2 + petal_reach
+        self.bounds = (-reach, -reach, reach, reach)
+        fall_min = self.fall_position.min(axis=(0, 1)) - petal_reach
+        fall_max = self.fall_position.max(axis=(0, 1)) + petal_reach
+        self.wither_bounds = (min(-reach, fall_min[0]), min(-reach, fall_min[1]),
+                              max(reach, fall_max[0]), max(reach, fall_max[1]))
+
+    @classmethod
+    def from_seed(cls, seed: int = RANDOM_SEED, layer_counts=PETAL_LAYER_COUNTS) -> "PetalTemplate":
+        """用与 SeasonalRose 相同的布局随机流生成模板"""
+        rng = RandomStreams(seed).layout
+        petals = [EnhancedPetal(layer, i, count, rng, (0, 0))
+                  for layer, count in enumerate(layer_counts) for i in range(count)]
+        return cls(petals)
+
+    def wither_curves(self, progress) -> np.ndarray:
+        """凋零期各花瓣的凋零进度"""
+        adjusted = np.maximum(0, progress - self.wither_delay)
+        return np.minimum(1.0, adjusted / (1.0 - self.wither_delay))
+
+    def _bake_fall(self):
+        """预先模拟凋零期每一帧的飘落位置、自转和绘制顺序（花朵局部坐标）"""
+        frames = SeasonalRose.wither_duration
+        start = self.direction * self.held_distance[:, None]
+        self.fall_position = np.zeros((frames, self.count, 2))
+        self.fall_spin = np.zeros((frames, self.count))
+        self.falling = np.zeros((frames, self.count), dtype=bool)
+        self.wither_order = []
+
+        position = start.copy()
+        spin = np.zeros(self.count)
+        is_falling = np.zeros(self.count, dtype=bool)
+        for frame in range(frames):
+            # 与 EnhancedPetal.update_wither_stage 的飘落逻辑相同
+            starting = (self.wither_curves(frame / frames) > 0.3) & ~is_falling
+            is_falling |= starting
+            position[is_falling, 1] += self.fall_speed[is_falling]
+            position[is_falling, 0] += np.sin(position[is_falling, 1] * 0.02) * 2
+            spin[is_falling] += self.fall_rotation[is_falling]
+
+            self.fall_position[frame] = position
+            self.fall_spin[frame] = spin
+            self.falling[frame] = is_falling
+            sort_y = np.where(is_falling, position[:, 1], self.static_y)
+            self.wither_order.append(np.lexsort((sort_y, -self.layer)).tolist())
+
+class RoseGarden:
+    """月季花园 - 每朵花只保存位置、缩放、相位偏移和配色编号
+
+    update 对所有花朵一次算出循环位置、阶段和阶段进度；draw 再对这一批
+    花朵一次求出全部花瓣的几何和颜色，逐朵按从后往前的顺序绘制。
+    """
+
+    # 字段名 -> (数据类型, 每朵花的分量数)
+    FIELDS = {
+        "pos": (np.float32, 2),     # 花朵中心（世界坐标）
+        "scale": (np.float32, 1),   # 缩放
+        "phase": (np.int32, 1),     # 循环相位偏移（帧）
+        "palette": (np.uint8, 1),   # 配色编号
+    }
+
+    def __init__(self, template: PetalTemplate = None, palettes: list = None,
+                 capacity: int = 64, profiler: FrameProfiler = None):
+        self.template = template if template is not None else PetalTemplate.from_seed()
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+        self.set_palettes(palettes if palettes is not None else default_palettes())
+
+        # 所有花朵共用 SeasonalRose 各阶段帧数编译出的时间线
+        self.timeline = SeasonalRose.compile_timeline()
+        self.cycle = self.timeline.cycle
+
+        self.capacity = 0
+        self.active = 0
+        for name, (dtype, width) in self.FIELDS.items():
+            shape = (0, width) if width > 1 else (0,)
+            setattr(self, name, np.zeros(shape, dtype=dtype))
+        self._grow(capacity)
+
+        self.frame_count = 0
+        self.draw_order = None  # 按 y 从后往前的花朵顺序（添加花朵后重建）
+        self._advance()
+
+    def __len__(self) -> int:
+        return self.active
+
+    def _grow(self, capacity: int):
+        """扩容所有字段数组（保留已有花朵）"""
+        for name, (dtype, width) in self.FIELDS.items():
+            old = getattr(self, name)
+            shape = (capacity, width) if width > 1 else (capacity,)
+            new = np.zeros(shape, dtype=dtype)
+            new[:self.active] = old[:self.active]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    @property
+    def state_bytes(self) -> int:
+        """每朵花保存的状态字节数"""
+        return sum(np.dtype(dtype).itemsize * width for dtype, width in self.FIELDS.values())
+
+    def set_palettes(self, palettes: list):
+        """设置配色列表（每个配色是 {季节: 颜色字典}），转换成 (配色, 季节, 颜色角色, RGB) 数组"""
+        if not 0 < len(palettes) <= 256:
+            raise ValueError(f"配色数量应在 1-256 之间: {len(palettes)}")
+        self.palettes = palettes
+        self.palette_colors = np.array([[[palette[season][role] for role in COLOR_ROLES]
+                                         for season in SEASONS] for palette in palettes], dtype=np.float64)
+
+    def add(self, x, y, scale=1.0, phase=0, palette=0, count: int = 1) -> slice:
+        """批量添加花朵（参数可以是标量或长度为 count 的数组），返回它们所在的切片"""
+        if self.active + count > self.capacity:
+            self._grow(max(self.capacity * 2, self.active + count))
+        new = slice(self.active, self.active + count)
+        self.active += count
+        self.pos[new, 0] = x
+        self.pos[new, 1] = y
+        self.scale[new] = scale
+        self.phase[new] = np.asarray(phase) % self.cycle
+        self.palette[new] = np.asarray(palette) % len(self.palettes)
+        self.draw_order = None
+        self._advance()
+        return new
+
+    def scatter(self, count: int, rect=(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT),
+                scale_range=(0.25, 0.6), seed: int = RANDOM_SEED) -> slice:
+        """在 rect 内随机种下 count 朵花（随机位置、缩放、相位和配色）"""
+        rng = np.random.default_rng(seed)
+        left, top, width, height = rect
+        return self.add(rng.uniform(left, left + width, count), rng.uniform(top, top + height, count),
+                        rng.uniform(*scale_range, count), rng.integers(0, self.cycle, count),
+                        rng.integers(0, len(self.palettes), count), count)
+
+    @property
+    def season(self) -> str:
+        """花园整体的季节（按不带相位的循环位置，供背景使用）"""
+        return self.timeline.frames[self.frame_count % self.cycle][3]
+
+    def update(self):
+        """推进一个模拟步（所有花朵一起）"""
+        with self.profiler.scope("update"):
+            self.frame_count += 1
+            self._advance()
+
+    def _advance(self):
+        """一次算出所有花朵的循环位置，再从时间线帧表取出阶段、阶段内帧号和阶段进度"""
+        position = (self.frame_count + self.phase[:self.active]) % self.cycle
+        self.stage = self.timeline.frame_stage[position]
+        self.stage_frame = self.timeline.frame_offset[position]
+        self.stage_progress = self.timeline.frame_progress[position]
+
+    def petal_geometry(self, roses: np.ndarray) -> dict:
+        """对一批花朵（索引数组）一次求出全部花瓣的局部几何和颜色
+
+        返回的数组形状为 (花朵数, 花瓣数)：length、width、rotation、bend、
+        offset（相对花心的局部位移，(M, N, 2)）和 color（(M, N, 3)）。
+        """
+        tpl = self.template
+        shape = (len(roses), tpl.count)
+        stage = self.stage[roses]
+        progress = self.stage_progress[roses][:, None]
+
+        length = np.zeros(shape)
+        width = np.zeros(shape)
+        rotation = np.broadcast_to(tpl.held_rotation, shape).copy()
+        bend = np.broadcast_to(tpl.held_bend, shape).copy()
+        offset = np.zeros(shape + (2,))
+        mix = np.zeros(shape)  # 颜色混合系数
+
+        # 颜色：按季节取出 (M, 4 角色, 3) 的调色板
+        colors = self.palette_colors[self.palette[roses], STAGE_SEASON_IDS[stage]]
+        inner = tpl.inner[None, :, None]
+        base = np.where(inner, colors[:, None, 0], colors[:, None, 1])    # 花苞深色/浅色
+        target = np.where(inner, colors[:, None, 2], colors[:, None, 3])  # 盛开色/光晕色
+
+        bud = stage == STAGE_IDS["bud"]
+        if bud.any():
+            length[bud] = tpl.base_length * 0.1 * progress[bud]
+            width[bud] = tpl.base_width * 0.1 * progress[bud]
+            target[bud] = base[bud] = colors[bud, None, 0]
+
+        # 盛开期和维持期直接按阶段内帧号取烘焙轨道
+        # （还没开始展开的花瓣在轨道里尺寸为 0，即保持上一循环的死亡状态）
+        bloom = stage == STAGE_IDS["bloom"]
+        if bloom.any():
+            rows = tpl.tracks.bloom[self.stage_frame[roses][bloom]]
+            length[bloom] = rows[..., 0]
+            width[bloom] = rows[..., 1]
+            rotation[bloom] = rows[..., 2]
+            bend[bloom] = rows[..., 4]
+            offset[bloom] = tpl.direction * rows[..., 3, None]
+            mix[bloom] = rows[..., 5]
+
+        maintain = stage == STAGE_IDS["maintain"]
+        if maintain.any():
+            rows = tpl.tracks.maintain[self.stage_frame[roses][maintain]]
+            length[maintain] = tpl.base_length
+            width[maintain] = tpl.base_width
+            offset[maintain] = tpl.direction * rows[..., 3, None]
+            mix[maintain] = 1.0
+
+        wither = stage == STAGE_IDS["wither"]
+        if wither.any():
+            frame = self.stage_frame[roses][wither]
+            wither_progress = tpl.wither_curves(progress[wither])
+            fade = np.maximum(0, 1 - wither_progress * 1.2)
+            length[wither] = tpl.base_length * (0.7 + 0.3 * fade)
+            width[wither] = tpl.base_width * (0.7 + 0.3 * fade)
+            rotation[wither] += tpl.fall_spin[frame]
+            offset[wither] = np.where(tpl.falling[frame][..., None], tpl.fall_position[frame],
+                                      tpl.direction * tpl.held_distance[:, None])
+            # 凋零时颜色从盛开色变暗
+            base[wither] = colors[wither, None, 2]
+            target[wither] = base[wither] // 2
+            mix[wither] = wither_progress
+
+        color = (base * (1 - mix[..., None]) + target * mix[..., None]).astype(np.int32)
+        return {"length": length, "width": width, "rotation": rotation, "bend": bend,
+                "offset": offset, "color": color}
+
+    def vertices(self, roses: np.ndarray, geometry: dict, camera: Camera = None) -> np.ndarray:
+        """一次算出这批花朵全部花瓣的多边形顶点 (M, N, 轮廓点数, 2)，传入 camera 时为屏幕坐标
+
+        变换与 PetalBatch.transforms 相同；(M, N) 个 2x2 小矩阵用 matmul 逐个相乘太慢，
+        这里把矩阵乘法按分量展开成整块的广播运算。
+        """
+        tpl = self.template
+        pos, scale = self.screen_transform(roses, camera)
+        scale = scale[:, None]
+        theta = tpl.angle + geometry["rotation"]
+        scale_x = (geometry["length"] * scale)[..., None]
+        scale_y = (geometry["width"] * geometry["bend"] * scale)[..., None]
+        cos_t = np.cos(theta)[..., None]
+        sin_t = np.sin(theta)[..., None]
+        centers = pos[:, None, :] + geometry["offset"] * scale[..., None]
+
+        local_x = tpl.outline[:, 0] * scale_x
+        local_y = tpl.outline[:, 1] * scale_y
+        vertices = np.empty(theta.shape + (len(tpl.outline), 2))
+        vertices[..., 0] = local_x * cos_t - local_y * sin_t + centers[..., 0:1]
+        vertices[..., 1] = local_x * sin_t + local_y * cos_t + centers[..., 1:2]
+        return vertices
+
+    def screen_transform(self, roses: np.ndarray, camera: Camera = None) -> tuple:
+        """花朵中心的屏幕坐标 (M, 2) 和屏幕上的缩放 (M,)"""
+        pos = self.pos[roses].astype(np.float64)
+        scale = self.scale[roses].astype(np.float64)
+        if camera is None:
+            return pos, scale
+        return camera.to_screen(pos), scale * camera.zoom
+
+    def visible_roses(self, camera: Camera = None) -> np.ndarray:
+        """从后往前排好序、当前有花瓣可画且（传入 camera 时）在视口内的花朵索引"""
+        if self.draw_order is None:
+            pos = self.pos[:self.active]
+            self.draw_order = np.lexsort((pos[:, 0], pos[:, 1]))
+        stage = self.stage[self.draw_order]
+        blooming = (stage != STAGE_IDS["dead"]) & (stage != STAGE_IDS["reset"])
+        roses = self.draw_order[blooming]
+        if camera is None or not len(roses):
+            return roses
+
+        # 按花朵包围盒剔除视口外的花朵，之后的花瓣几何和顶点只算可见的花朵
+        wither = (self.stage[roses] == STAGE_IDS["wither"])[:, None]
+        bounds = np.where(wither, self.template.wither_bounds, self.template.bounds)
+        box = self.pos[roses][:, [0, 1, 0, 1]] + bounds * self.scale[roses][:, None]
+        left, top, right, bottom = camera.view_rect()
+        inside = (box[:, 2] >= left) & (box[:, 0] <= right) & (box[:, 3] >= top) & (box[:, 1] <= bottom)
+        return roses[inside]
+
+    def draw(self, screen: pygame.Surface, camera: Camera = None):
+        """绘制视口内的花朵（花瓣和花心）"""
+        if camera is None:
+            camera = Camera(screen.get_size())
+        roses = self.visible_roses(camera)
+        if not len(roses):
+            return
+
+        with self.profiler.scope("draw.petals"):
+            geometry = self.petal_geometry(roses)
+            vertex_array = self.vertices(roses, geometry, camera)
+            visible = (geometry["length"] > 0) & (geometry["width"] > 0)
+            colors = geometry["color"]
+            # 维持期的花瓣高光：颜色向白色混合 30%（同 draw_petals）
+            highlights = (colors * (1 - 0.3) + 255 * 0.3).astype(np.int32)
+
+            wither, maintain = STAGE_IDS["wither"], STAGE_IDS["maintain"]
+            for m, rose in enumerate(roses.tolist()):
+                stage = self.stage[rose]
+                order = (self.template.wither_order[self.stage_frame[rose]] if stage == wither
+                         else self.template.static_order)
+                # 逐朵转换成列表：一次转换全部花朵会堆积大量小列表，触发代价很高的垃圾回收
+                rose_vertices = vertex_array[m].tolist()
+                rose_visible = visible[m].tolist()
+                rose_colors = colors[m].tolist()
+                rose_highlights = highlights[m].tolist() if stage == maintain else None
+                for i in order:
+                    if rose_visible[i]:
+                        pygame.draw.polygon(screen, rose_colors[i], rose_vertices[i])
+                        if rose_highlights is not None:
+                            pygame.draw.polygon(screen, rose_highlights[i], rose_vertices[i], 1)
+
+        with self.profiler.scope("draw.center"):
+            self.draw_centers(screen, roses, camera)
+
+    def draw_centers(self, screen: pygame.Surface, roses: np.ndarray, camera: Camera = None):
+        """绘制花心（大小直接取 SeasonalRose.update_center 的目标值）"""
+        stage = self.stage[roses]
+        progress = self.stage_progress[roses]
+        size = np.select([stage == STAGE_IDS["bloom"], stage == STAGE_IDS["maintain"], stage == STAGE_IDS["wither"]],
+                         [20 * progress, np.full(len(roses), 20.0), 20 * (1 - progress)], 0.0)
+        centers, scale = self.screen_transform(roses, camera)
+        size = (size * scale).astype(np.int32).tolist()
+        colors = self.palette_colors[self.palette[roses], STAGE_SEASON_IDS[stage]].astype(np.int32).tolist()
+        centers = centers.astype(np.int32).tolist()
+
+        for current_size, (_, _, bloom, glow), center in zip(size, colors, centers):
+            if current_size > 1:
+                pygame.draw.circle(screen, glow, center, current_size)
+                if current_size > 3:
+                    pygame.draw.circle(screen, bloom, center, current_size - 3)
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="月季花园模式")
+    parser.add_argument("--roses", type=int, default=200, help="花朵数量（默认 200）")
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED, help="花朵布局的随机种子")
+    parser.add_argument("--fps", type=int, default=FPS,
+                        help=f"渲染帧率上限，0 表示不限（模拟始终按 {FPS} 步/秒推进）")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """打开窗口运行花园（拖动平移、滚轮缩放、Home 复位，F3 切换帧耗时叠加显示，ESC 退出）"""
+    args = parse_args(argv)
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("月季花园")
+    clock = pygame.time.Clock()
+    sim_clock = SimulationClock()
+    profiler = FrameProfiler()
+
+    garden = RoseGarden(profiler=profiler)
+    garden.scatter(args.roses, seed=args.seed)
+    background = SeasonalBackground()
+    camera = Camera()
+    print(f"种下了 {len(garden)} 朵月季花（每朵 {garden.state_bytes} 字节状态）")
+
+    running = True
+    clock.tick()
+    while running:
+        profiler.begin_frame()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+                elif event.key == pygame.K_HOME:
+                    camera.reset()
+            elif event.type == pygame.MOUSEWHEEL:
+                camera.zoom_at(1.25 ** event.y, pygame.mouse.get_pos())
+            elif event.type == pygame.MOUSEMOTION and event.buttons[0]:
+                camera.pan(*event.rel)
+
+        for _ in range(sim_clock.advance(clock.get_time() / 1000.0)):
+            garden.update()
+            background.set_season(garden.season)
+            background.update()
+
+        with profiler.scope("draw.background"):
+            background.draw(screen)
+        garden.draw(screen, camera)
+        profiler.draw_overlay(screen)
+        with profiler.scope("present"):
+            pygame.display.flip()
+        profiler.end_frame()
+        clock.tick(args.fps)
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
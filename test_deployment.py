@@ -152,6 +152,550 @@ def test_animation_logic():
         traceback.print_exc()
         return False
 
+def test_particle_store():
+    """Test vectorized particle engine"""
+    print("\n🔍 Testing particle store...")
+    
+    try:
+        from rose_animation import ParticleStore, PARTICLE_TYPES, SeasonalBloomColors
+        
+        colors = SeasonalBloomColors.get_season_colors('summer')
+        store = ParticleStore(capacity=4)
+        for particle_type in PARTICLE_TYPES:
+            store.spawn(particle_type, 600, 400, 10, colors)
+        
+        if len(store) != 10 * len(PARTICLE_TYPES):
+            raise ValueError(f"Unexpected particle count: {len(store)}")
+        if store.count('summer_firefly') != 10:
+            raise ValueError("Per-type count mismatch")
+        print(f"✅ Spawned {len(store)} particles across {len(PARTICLE_TYPES)} types")
+        
+        # Fast-decaying rain and wind must be compacted away first
+        for _ in range(60):
+            store.update()
+        if store.count('spring_rain') != 0 or store.count('autumn_wind') != 0:
+            raise ValueError("Dead particles were not compacted")
+        
+        for _ in range(400):
+            store.update()
+        if len(store) != 0:
+            raise ValueError(f"{len(store)} particles outlived their life")
+        
+        print("✅ Particle update and compaction working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Particle store test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_random_streams():
+    """Test deterministic per-frame random streams"""
+    print("\n🔍 Testing random streams...")
+    
+    try:
+        import numpy as np
+        from rose_animation import SeasonalRose, RandomStreams
+        
+        first = SeasonalRose()
+        second = SeasonalRose()
+        for _ in range(250):
+            first.update()
+            second.update()
+        if len(first.particles) != len(second.particles):
+            raise ValueError("Particle counts differ between identical roses")
+        if not np.array_equal(first.particles.pos[:len(first.particles)],
+                              second.particles.pos[:len(second.particles)]):
+            raise ValueError("Particle positions differ between identical roses")
+        print(f"✅ Two roses stayed identical for 250 frames ({len(first.particles)} particles)")
+        
+        # Per-frame streams depend only on the frame number
+        streams = RandomStreams()
+        streams.begin_frame(120)
+        expected = (streams.emission.random(), streams.weather.random())
+        state = streams.get_state()
+        streams.begin_frame(500)
+        streams.set_state(state)
+        streams.begin_frame(120)
+        if (streams.emission.random(), streams.weather.random()) != expected:
+            raise ValueError("Streams are not reproducible per frame")
+        
+        print("✅ Random streams are reproducible")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Random streams test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_seek():
+    """Test keyframe seeking matches continuous simulation"""
+    print("\n🔍 Testing seek...")
+    
+    try:
+        import numpy as np
+        from rose_animation import SeasonalRose
+        
+        continuous = SeasonalRose()
+        for _ in range(700):
+            continuous.update()
+        
+        seeker = SeasonalRose()
+        for frame in (700, 250, 700):
+            seeker.seek(frame)
+        
+        if seeker.frame_count != 700 or seeker.life_stage != continuous.life_stage:
+            raise ValueError("Seek landed on the wrong frame")
+        for a, b in zip(continuous.petals, seeker.petals):
+            if a.get_state() != b.get_state():
+                raise ValueError("Petal state differs after seek")
+        if not np.array_equal(continuous.particles.pos[:len(continuous.particles)],
+                              seeker.particles.pos[:len(seeker.particles)]):
+            raise ValueError("Particle state differs after seek")
+        print(f"✅ Seek restored frame 700 from {len(seeker.keyframes)} keyframes")
+        
+        # Seeking several cycles ahead reuses the periodic state of the second cycle
+        target = 3 * continuous.total_cycle_duration + 100
+        while continuous.frame_count < target:
+            continuous.update()
+        jumper = SeasonalRose()
+        jumper.seek(target)
+        first, second = continuous.snapshot(), jumper.snapshot()
+        if first["scalars"] != second["scalars"] or first["petals"] != second["petals"]:
+            raise ValueError("Seek across cycles differs from continuous simulation")
+        if not np.array_equal(first["particles"]["pos"], second["particles"]["pos"]):
+            raise ValueError("Particle state differs after seeking across cycles")
+        if max(jumper.keyframe_frames) >= 2 * jumper.total_cycle_duration:
+            raise ValueError("Seek simulated past the second cycle")
+        print(f"✅ Seek to frame {target} matches continuous simulation")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Seek test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_periodic_state():
+    """Test the simulation state repeats every cycle after one warm-up cycle"""
+    print("\n🔍 Testing periodic state...")
+    
+    try:
+        import numpy as np
+        from rose_animation import SeasonalRose
+        
+        rose = SeasonalRose()
+        cycle = rose.total_cycle_duration
+        snapshots = {}
+        for frame in range(1, 1000 + cycle + 1):
+            rose.update()
+            if frame in (1000, 1000 + cycle):
+                snapshots[frame] = rose.snapshot()
+        
+        first, second = snapshots[1000], snapshots[1000 + cycle]
+        if first["scalars"][1:] != second["scalars"][1:]:
+            raise ValueError("Scalar state differs one cycle later")
+        if first["petals"] != second["petals"] or first["background"] != second["background"]:
+            raise ValueError("Petal or background state differs one cycle later")
+        if first["random"] != second["random"]:
+            raise ValueError("Random streams differ one cycle later")
+        for name, values in first["particles"].items():
+            if not np.array_equal(values, second["particles"][name]):
+                raise ValueError(f"Particle field {name} differs one cycle later")
+        
+        print(f"✅ Frames 1000 and {1000 + cycle} have identical state ({len(first['particles']['life'])} particles)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Periodic state test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_simulation_clock():
+    """Test fixed-timestep simulation clock"""
+    print("\n🔍 Testing simulation clock...")
+    
+    try:
+        from rose_animation import SimulationClock
+        
+        clock = SimulationClock(step=0.01, max_steps=5)
+        steps = [clock.advance(0.004) for _ in range(10)]
+        if sum(steps) != 4 or not 0.0 <= clock.alpha < 1.0:
+            raise ValueError(f"Fast renders should share steps: {steps}")
+        if clock.advance(0.035) != 3:
+            raise ValueError("Slow render should catch up with several steps")
+        if clock.advance(10.0) != 5:
+            raise ValueError("Long stalls should be capped")
+        
+        print("✅ Fixed-timestep clock working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Simulation clock test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_quality_governor():
+    """Test adaptive quality tiers and hysteresis"""
+    print("\n🔍 Testing quality governor...")
+    
+    try:
+        from rose_animation import QualityGovernor, QUALITY_TIERS, SeasonalRose
+        
+        governor = QualityGovernor(target_fps=60, window=10, tier=2)
+        for _ in range(10):
+            governor.record(30.0)
+        if governor.tier != 1:
+            raise ValueError("Slow frames should drop one tier")
+        
+        # Frames between the two thresholds must not change the tier
+        for _ in range(100):
+            governor.record(12.0)
+        if governor.tier != 1:
+            raise ValueError("Governor oscillated inside the hysteresis band")
+        
+        for _ in range(10 * QualityGovernor.UPGRADE_WINDOWS):
+            governor.record(2.0)
+        if governor.tier != 2:
+            raise ValueError("Fast frames should raise one tier")
+        print("✅ Tier changes follow frame times with hysteresis")
+        
+        rose = SeasonalRose()
+        for tier in QUALITY_TIERS:
+            rose.apply_quality(tier)
+            if len(rose.petal_batch.outline) != 2 * tier["petal_points"] - 1:
+                raise ValueError(f"Petal outline not updated for {tier['name']}")
+        print(f"✅ Applied {len(QUALITY_TIERS)} quality tiers")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Quality governor test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_frame_profiler():
+    """Test frame-time scopes and statistics export"""
+    print("\n🔍 Testing frame profiler...")
+    
+    try:
+        import os
+        import tempfile
+        from frame_profiler import FrameProfiler
+        
+        profiler = FrameProfiler(capacity=50)
+        with profiler.scope("idle"):
+            pass
+        profiler.end_frame()
+        if profiler.buffers:
+            raise ValueError("Disabled profiler recorded samples")
+        
+        profiler.enabled = True
+        for _ in range(80):
+            profiler.begin_frame()
+            for _ in range(2):
+                with profiler.scope("step"):
+                    sum(range(100))
+            profiler.end_frame()
+        
+        stats = profiler.stats()
+        if stats["step"]["samples"] != 50 or "frame" not in stats:
+            raise ValueError(f"Unexpected stats: {stats}")
+        if not stats["step"]["p50_ms"] <= stats["step"]["p99_ms"] <= stats["frame"]["max_ms"]:
+            raise ValueError("Percentiles out of order")
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ("timings.csv", "timings.jsonl"):
+                path = os.path.join(tmp, name)
+                profiler.dump(path)
+                with open(path) as f:
+                    if len(f.read().strip().splitlines()) < 2:
+                        raise ValueError(f"{name} is empty")
+        
+        print("✅ Profiler scopes, stats and export working")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Frame profiler test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_benchmark_compare():
+    """Test benchmark regression detection and the petal sweep rose"""
+    print("\n🔍 Testing benchmark comparison...")
+    
+    try:
+        import numpy as np
+        from benchmark import compare_results, create_rose
+        
+        def results(update_ms, draw_ms):
+            stats = lambda ms: {"frames": 10, "mean_ms": ms, "p50_ms": ms, "p95_ms": ms}
+            return {"stages": {"bloom": {"update": stats(update_ms), "draw": stats(draw_ms)}},
+                    "petal_sweep": [{"petals": 84, "update": stats(update_ms), "draw": stats(draw_ms)}],
+                    "particle_sweep": []}
+        
+        rows = compare_results(results(1.0, 5.0), results(1.05, 7.0), threshold=0.10)
+        regressed = sorted(name for name, _, _, _, flagged in rows if flagged)
+        if regressed != ["petal_sweep.84.draw", "stages.bloom.draw"]:
+            raise ValueError(f"Unexpected regressions: {regressed}")
+        
+        # The sweep rose must update every petal, not just the default 84
+        rose = create_rose(500)
+        rose.update()
+        opening = np.array([(petal.length, petal.bloom_progress) for petal in rose.petals])
+        while rose.frame_count < rose.bloom_duration - 1:
+            rose.update()
+        opened = np.array([(petal.length, petal.bloom_progress) for petal in rose.petals])
+        if len(rose.petals) < 490 or not (opened > opening).all():
+            raise ValueError("Some sweep petals did not grow during bloom")
+        
+        print(f"✅ Flagged {len(regressed)} regressions out of {len(rows)} metrics; "
+              f"all {len(rose.petals)} sweep petals bloom")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Benchmark comparison test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_text_cache():
+    """Test font registry and text surface cache"""
+    print("\n🔍 Testing text cache...")
+    
+    try:
+        import pygame
+        from rose_animation import FontRegistry, TextCache
+        
+        if not pygame.font.get_init():
+            pygame.font.init()
+        
+        fonts = FontRegistry()
+        if fonts.get(24) is not fonts.get(24):
+            raise ValueError("Font loaded twice for the same size")
+        
+        cache = TextCache(fonts, max_surfaces=3)
+        day = cache.render("Day", 18, (180, 180, 180))
+        if cache.render("Day", 18, (180, 180, 180)) is not day:
+            raise ValueError("Static label was re-rendered")
+        if cache.render("Day", 18, (255, 255, 255)) is day:
+            raise ValueError("Color must be part of the cache key")
+        
+        for number in range(5):
+            cache.render(str(number), 24, (255, 255, 255))
+        if len(cache.surfaces) != 3:
+            raise ValueError("LRU limit not enforced")
+        
+        print("✅ Fonts and text surfaces cached")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Text cache test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_ui_compositor():
+    """Test cached UI panels and per-panel refresh intervals"""
+    print("\n🔍 Testing UI compositor...")
+    
+    try:
+        import pygame
+        from rose_animation import UICompositor
+        
+        if not pygame.display.get_init():
+            pygame.display.init()
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((1, 1))  # convert_alpha needs a video mode
+        if not pygame.font.get_init():
+            pygame.font.init()
+        
+        state = {"day": 1, "fps": 60}
+        ui = UICompositor(refresh_intervals={"info": 1, "data": 30})
+        info = ui.add("info", (0, 0, 200, 40),
+                      lambda panel: panel.blit_text(f"Day {state['day']}", 24, (255, 255, 255), (5, 5)),
+                      lambda: state["day"])
+        data = ui.add("data", (0, 50, 200, 40),
+                      lambda panel: panel.fill((0, 0, 0, 150)),
+                      lambda: state["fps"])
+        
+        screen = pygame.Surface((200, 100))
+        for _ in range(5):
+            ui.compose(screen)
+        if info.redraws != 1 or data.redraws != 1:
+            raise ValueError("Unchanged panels were redrawn")
+        
+        state["day"] = 2
+        state["fps"] = 59
+        ui.compose(screen)
+        if info.redraws != 2:
+            raise ValueError("Panel not redrawn after its value changed")
+        if data.redraws != 1:
+            raise ValueError("Refresh interval not respected")
+        
+        for _ in range(30):
+            ui.compose(screen)
+        if data.redraws != 2:
+            raise ValueError("Slow panel never refreshed")
+        
+        print("✅ Panels redrawn only when their values change")
+        return True
+        
+    except Exception as e:
+        print(f"❌ UI compositor test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_dirty_rect_tracker():
+    """Test dirty rectangles only recompose UI panels that were erased or changed"""
+    print("\n🔍 Testing dirty rect tracker...")
+    
+    try:
+        import numpy as np
+        import pygame
+        from rose_animation import DirtyRectTracker, UICompositor
+        
+        if not pygame.display.get_init():
+            pygame.display.init()
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((1, 1))  # convert_alpha needs a video mode
+        
+        size = (200, 120)
+        background = pygame.Surface(size)
+        for y in range(size[1]):
+            pygame.draw.line(background, (y * 2, 100, 255 - y * 2), (0, y), (size[0], y))
+        
+        state = {"day": 1}
+        ui = UICompositor(refresh_intervals={})
+        info = ui.add("info", (20, 20, 80, 40), lambda panel: panel.fill((state["day"] * 40, 0, 0, 150)),
+                      lambda: state["day"])
+        controls = ui.add("controls", (20, 55, 80, 30), lambda panel: panel.fill((255, 255, 255, 180)),
+                          lambda: None)
+        
+        dirty = DirtyRectTracker(size)
+        for panel in ui.panels:
+            dirty.add_static(panel.rect)
+        screen = pygame.Surface(size)
+        
+        def render(sprite):
+            """One dirty-rect frame; returns the updated rects and the full redraw of the same frame"""
+            dirty.begin_frame()
+            ui.refresh(dirty)
+            if dirty.full_redraw:
+                screen.blit(background, (0, 0))
+            else:
+                dirty.restore(screen, background)
+            dirty.add(screen.fill((255, 0, 0), sprite))
+            for rect in ui.compose(screen, dirty):
+                dirty.push(rect)
+            expected = background.copy()
+            expected.fill((255, 0, 0), sprite)
+            expected.blits([(panel.surface, panel.rect.topleft, None, panel.blend_flags) for panel in ui.panels])
+            if not np.array_equal(pygame.surfarray.array3d(screen), pygame.surfarray.array3d(expected)):
+                raise ValueError("Dirty-rect frame differs from a full redraw")
+            return dirty.end_frame()
+        
+        # Sprite starts inside the panels and slides out to the right
+        for step in range(25):
+            render(pygame.Rect(30 + step * 6, 30, 10, 10))
+        
+        # Parked away from the panels: only the sprite is pushed, panels stay on screen
+        sprite = pygame.Rect(174, 30, 10, 10)
+        rects = render(sprite)
+        if any(rect.colliderect(panel.rect) for rect in rects for panel in ui.panels):
+            raise ValueError("Untouched panels were pushed again")
+        if any(rect.colliderect(panel.rect) for rect in dirty.previous for panel in ui.panels):
+            raise ValueError("Static panels were queued for erasing")
+        
+        # Changing a panel recomposes it and the panel it overlaps
+        state["day"] = 2
+        rects = render(sprite)
+        if info.rect not in rects or controls.rect not in rects:
+            raise ValueError("Changed panel was not pushed")
+        if info.redraws != 2 or controls.redraws != 1:
+            raise ValueError("Panels redrawn unexpectedly")
+        
+        print("✅ Dirty-rect frames match full redraws and skip untouched panels")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Dirty rect tracker test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_rose_garden():
+    """Test garden mode batching against a single SeasonalRose"""
+    print("\n🔍 Testing rose garden...")
+    
+    try:
+        import numpy as np
+        from rose_animation import SeasonalRose, SCREEN_CENTER
+        from rose_garden import RoseGarden
+        
+        garden = RoseGarden()
+        garden.add(*SCREEN_CENTER)
+        garden.scatter(200)
+        if len(garden) != 201 or garden.state_bytes > 64:
+            raise ValueError(f"Unexpected garden state: {len(garden)} roses, {garden.state_bytes} bytes each")
+        garden.update()
+        if len(set(garden.stage.tolist())) < 3:
+            raise ValueError("Phase offsets not applied")
+        
+        # A rose with no phase, scale 1 at the screen center matches the single-rose animation
+        rose = SeasonalRose()
+        rose.seek(300)
+        garden.frame_count = 300
+        garden._advance()
+        geometry = garden.petal_geometry(np.array([0]))
+        visible = rose.petal_batch.visible()
+        if not np.array_equal(visible, geometry["length"][0] > 0):
+            raise ValueError("Visible petals differ from SeasonalRose")
+        if not np.allclose(garden.vertices(np.array([0]), geometry)[0][visible],
+                           rose.petal_batch.vertices()[visible]):
+            raise ValueError("Petal geometry differs from SeasonalRose")
+        
+        print("✅ Garden roses batched and consistent with a single rose")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Rose garden test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_camera_culling():
+    """Test camera transform, view culling and early particle retirement"""
+    print("\n🔍 Testing camera culling...")
+    
+    try:
+        import numpy as np
+        from rose_animation import Camera, ParticleStore, ParticleSpriteAtlas, SeasonalBloomColors
+        
+        camera = Camera((1200, 800))
+        points = np.array([[320.0, 220.0], [5000.0, 100.0]])
+        if camera.to_screen(points) is not points:
+            raise ValueError("Default camera should not transform coordinates")
+        
+        camera.zoom_at(2.0, (300, 200))
+        anchor = camera.to_screen(np.array([[300.0, 200.0]]))[0]
+        if not np.allclose(anchor, (300, 200)):
+            raise ValueError("Zoom did not keep the anchor point fixed")
+        if camera.contains(points).tolist() != [True, False]:
+            raise ValueError("View culling is wrong")
+        
+        colors = SeasonalBloomColors.get_season_colors("autumn")
+        store = ParticleStore(rng=np.random.default_rng(1))
+        store.spawn("sparkle", [320, 5000], [220, 100], 2, colors)
+        sprites = store.blit_sequence(ParticleSpriteAtlas(), "mid", camera=camera)
+        if len(sprites) != 1:
+            raise ValueError(f"Expected 1 visible particle, got {len(sprites)}")
+        store.update()
+        if len(store) != 1:
+            raise ValueError("Particle outside the world bounds was not retired")
+        
+        print("✅ Off-screen content culled and retired")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Camera culling test failed: {e}")
+        traceback.print_exc()
+        return False
+
 def test_file_structure():
     """Test required files exist"""
     print("\n🔍 Testing file structure...")
@@ -159,6 +703,10 @@ def test_file_structure():
     import os
     required_files = [
         'rose_animation.py',
+        'frame_profiler.py',
+        'frame_capture.py',
+        'cycle_archive.py',
+        'phenology_data.py',
         'config.py', 
         'real_data_config.py',
         'launcher.py',
@@ -198,6 +746,491 @@ def test_requirements():
         print(f"❌ Requirements test failed: {e}")
         return False
 
+def test_easing_tables():
+    """Test easing lookup tables and petal color ramps"""
+    print("\n🔍 Testing easing tables...")
+    
+    try:
+        import numpy as np
+        from rose_animation import (EASE_OUT_ELASTIC, EASE_IN_OUT_CUBIC, ColorRamp,
+                                    SeasonalBloomColors, ease_out_elastic, ease_in_out_cubic)
+        
+        t = np.linspace(0, 1, 1001)
+        for table, func in ((EASE_OUT_ELASTIC, ease_out_elastic), (EASE_IN_OUT_CUBIC, ease_in_out_cubic)):
+            exact = np.array([func(x) for x in t])
+            looked_up = table.lookup(t)
+            if np.abs(looked_up - exact).max() > 1e-5:
+                raise ValueError(f"{func.__name__} table error too large")
+            if [table.scalar(x) for x in t] != looked_up.tolist():
+                raise ValueError("Scalar and array lookups disagree")
+        
+        ramp = ColorRamp((10, 20, 30), (210, 120, 30))
+        if ramp.at(0.0) != (10, 20, 30) or ramp.at(1.0) != (210, 120, 30):
+            raise ValueError("Color ramp endpoints are wrong")
+        colors = SeasonalBloomColors.get_season_colors("spring")
+        if SeasonalBloomColors.petal_ramps(colors) is not SeasonalBloomColors.petal_ramps(dict(colors)):
+            raise ValueError("Petal ramps not cached by palette")
+        
+        print("✅ Easing and color lookups match the exact curves")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Easing table test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_palette_registry():
+    """Test immutable season palettes and per-frame blended palettes"""
+    print("\n🔍 Testing palette registry...")
+    
+    try:
+        from rose_animation import SEASON_PALETTES, SeasonalBloomColors
+        
+        colors = SeasonalBloomColors.get_season_colors("summer")
+        if not isinstance(colors, dict) or colors["bloom"] != SeasonalBloomColors.SUMMER_BLOOM:
+            raise ValueError("get_season_colors must still return a color dict")
+        if SeasonalBloomColors.get_season_colors("unknown") != SEASON_PALETTES["winter"].as_dict():
+            raise ValueError("Unknown seasons should fall back to winter")
+        
+        spring = SEASON_PALETTES["spring"]
+        try:
+            spring.bloom = (0, 0, 0)
+            raise ValueError("Palette was modified")
+        except AttributeError:
+            pass
+        if spring["glow"] is not spring.glow:
+            raise ValueError("Indexing by role name is broken")
+        
+        if SEASON_PALETTES.resolve("spring", "winter", 1.0) is not spring:
+            raise ValueError("Finished transition should use the season palette")
+        if SEASON_PALETTES.resolve("spring", "winter", 0.0).bloom != SEASON_PALETTES["winter"].bloom:
+            raise ValueError("Transition should start from the previous palette")
+        halfway = SEASON_PALETTES.resolve("spring", "winter", 0.5)
+        if SEASON_PALETTES.resolve("spring", "winter", 0.51) is not halfway:
+            raise ValueError("Blended palettes not cached per step")
+        
+        print("✅ Palettes built once and blended during transitions")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Palette registry test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_frame_capture():
+    """Test asynchronous frame capture and its queue policies"""
+    print("\n🔍 Testing frame capture...")
+    
+    try:
+        import os
+        import tempfile
+        import threading
+        import pygame
+        from frame_capture import FrameCapture, frame_path
+        
+        surface = pygame.Surface((64, 48), 0, 32)
+        surface.fill((30, 60, 90))
+        pygame.draw.circle(surface, (250, 120, 10), (32, 24), 15)
+        expected = pygame.image.tobytes(surface, "RGB")
+        
+        with tempfile.TemporaryDirectory() as output_dir:
+            capture = FrameCapture(output_dir, "png")
+            for _ in range(3):
+                capture.capture(surface)
+            stats = capture.close()
+            if stats["written"] != 3 or stats["dropped"] != 0:
+                raise ValueError(f"Unexpected capture stats: {stats}")
+            decoded = pygame.image.load(frame_path(output_dir, 3, "png"))
+            if pygame.image.tobytes(decoded, "RGB") != expected:
+                raise ValueError("PNG frame does not match the surface")
+        
+        class SlowCapture(FrameCapture):
+            """Writer that waits until released, to simulate a slow disk"""
+            release = threading.Event()
+            
+            def write_frame(self, frame, buffer, stream=None):
+                self.release.wait()
+                super().write_frame(frame, buffer, stream)
+        
+        with tempfile.TemporaryDirectory() as output_dir:
+            capture = SlowCapture(output_dir, "rgb", policy="drop", queue_size=2, stream=True)
+            accepted = [capture.capture(surface) for _ in range(6)]
+            if accepted != [True, True, True, False, False, False]:
+                raise ValueError(f"Drop policy accepted {accepted}")
+            SlowCapture.release.set()
+            stats = capture.close()
+            if stats["written"] != 3 or stats["dropped"] != 3:
+                raise ValueError(f"Unexpected capture stats: {stats}")
+            with open(os.path.join(output_dir, "frames.rgb"), "rb") as f:
+                if f.read() != expected * 3:
+                    raise ValueError("RGB stream does not match the surface")
+        
+        print("✅ Frames written in the background, overflow dropped")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Frame capture test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_cycle_archive():
+    """Test baked cycle archive round trip, seeking and loop wrap"""
+    print("\n🔍 Testing cycle archive...")
+    
+    try:
+        import os
+        import tempfile
+        import numpy as np
+        from cycle_archive import CycleArchive, CycleArchiveWriter
+        
+        rng = np.random.default_rng(7)
+        frames = [rng.integers(0, 2 ** 24, (30, 40), dtype=np.uint32)]
+        for i in range(1, 12):
+            frame = frames[-1].copy()
+            if i == 6:
+                frame ^= 0x00101010  # dense change (e.g. a season fade)
+            else:
+                frame[rng.integers(0, 30, 5), rng.integers(0, 40, 5)] = rng.integers(0, 2 ** 24, 5)
+            frames.append(frame)
+        
+        with tempfile.TemporaryDirectory() as output_dir:
+            path = os.path.join(output_dir, "cycle.archive")
+            writer = CycleArchiveWriter(path, (40, 30), (0xFF0000, 0xFF00, 0xFF), keyframe_interval=5)
+            for frame in frames:
+                writer.add(frame)
+            writer.close()
+            
+            archive = CycleArchive(path)
+            try:
+                for i, frame in enumerate(frames):
+                    if not np.array_equal(archive.next_frame(), frame.reshape(-1)):
+                        raise ValueError(f"Frame {i} decoded incorrectly")
+                if not np.array_equal(archive.next_frame(), frames[0].reshape(-1)):
+                    raise ValueError("Loop did not wrap seamlessly back to the first frame")
+                if not np.array_equal(archive.seek(8), frames[8].reshape(-1)):
+                    raise ValueError("Seek through a keyframe failed")
+            finally:
+                archive.close()
+        
+        print("✅ Archived frames decode exactly and wrap back to the first frame")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Cycle archive test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_petal_tracks():
+    """Test baked bloom/maintain petal tracks against per-petal updates"""
+    print("\n🔍 Testing petal tracks...")
+    
+    try:
+        import random
+        import numpy as np
+        from rose_animation import EnhancedPetal, PetalTracks, SeasonalRose, SeasonalBloomColors
+        
+        rng = random.Random(3)
+        petals = [EnhancedPetal(layer, i, 6, rng) for layer in range(3) for i in range(6)]
+        tracks = PetalTracks(petals, SeasonalRose.bloom_duration, SeasonalRose.maintain_duration)
+        if tracks.bloom.dtype != np.float32 or tracks.bloom.shape != (SeasonalRose.bloom_duration, 18, 8):
+            raise ValueError(f"Unexpected track layout {tracks.bloom.dtype} {tracks.bloom.shape}")
+        
+        colors = SeasonalBloomColors.get_season_colors("spring")
+        for stage, duration in (("bloom", SeasonalRose.bloom_duration), ("maintain", SeasonalRose.maintain_duration)):
+            for frame in (0, duration // 3, duration - 1):
+                for petal in petals:
+                    petal.update_lifecycle(stage, frame / duration, colors)
+                expected = np.array([[getattr(p, name) for name in PetalTracks.FIELDS] for p in petals])
+                baked = tracks.tracks[stage][frame]
+                if stage == "bloom":
+                    opened = tracks.bloom_opened[frame]
+                    expected, baked = expected[opened], baked[opened]
+                if not np.allclose(baked, expected, atol=1e-4):
+                    raise ValueError(f"{stage} frame {frame} does not match update_lifecycle")
+        
+        # A track baked for other petals must not silently skip the extras
+        try:
+            tracks.apply("bloom", 0, petals + petals[:1], colors, SeasonalBloomColors.petal_ramps(colors))
+        except ValueError:
+            pass
+        else:
+            raise ValueError("Petal count mismatch was not reported")
+        
+        # Rebuilding the petals re-bakes the tracks, so every petal follows them in bloom
+        rose = SeasonalRose()
+        rose.rebuild_petals([10, 14, 18])
+        while rose.frame_count < 200:
+            rose.update()
+        bloom = [petal.bloom_progress for petal in rose.petals]
+        if len(bloom) != 42 or not np.allclose(bloom, rose.petal_tracks.bloom[200][:, 5]):
+            raise ValueError("Rebuilt petals were not updated from the re-baked tracks")
+        
+        print("✅ Baked tracks match the per-petal lifecycle math")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Petal tracks test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_phenology_data():
+    """Test phenology conversion, (site, date) lookup and cycle-to-date mapping"""
+    print("\n🔍 Testing phenology data...")
+    
+    try:
+        import datetime
+        import json
+        import math
+        import os
+        import tempfile
+        from phenology_data import PhenologyFeed, PhenologyStore, convert
+        
+        header = "date,site,temperature,humidity,sunlight,soil_temperature,phase\n"
+        with tempfile.TemporaryDirectory() as output_dir:
+            csv_path = os.path.join(output_dir, "2020.csv")
+            json_path = os.path.join(output_dir, "2021.json")
+            data_path = os.path.join(output_dir, "phenology.bin")
+            with open(csv_path, "w", encoding="utf-8") as f:
+                f.write(header)
+                f.write("2020-03-01,Beijing,12.5,55,7.5,,budding\n")
+                f.write("2020-03-02,Beijing,13.0,56,7.0,9.5,budding\n")
+                f.write("2020-03-01,Kunming,18.0,60,8.0,15.0,bloom\n")
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump({"records": [{"date": "2021-03-01", "site": "Beijing", "temperature": 11.0,
+                                        "humidity": 50, "sunlight": 6.5, "soil_temperature": 8.0,
+                                        "phase": "budding"}]}, f)
+            
+            result = convert([csv_path, json_path], data_path)
+            if result["records"] != 4 or result["sites"] != 2:
+                raise ValueError(f"Unexpected conversion result {result}")
+            
+            store = PhenologyStore(data_path)
+            try:
+                record = store.record("Beijing", datetime.date(2020, 3, 2))
+                if record["temperature"] != 13.0 or record["phase"] != "budding":
+                    raise ValueError(f"Wrong record {record}")
+                if not math.isnan(store.record("Beijing", datetime.date(2020, 3, 1))["soil_temperature"]):
+                    raise ValueError("Missing value was not stored as NaN")
+                if store.record("Beijing", datetime.date(2020, 3, 3)) is not None:
+                    raise ValueError("Day without observation returned a record")
+                if store.record("Shanghai", datetime.date(2020, 3, 1)) is not None:
+                    raise ValueError("Unknown site returned a record")
+                
+                # Day 1 of each cycle maps to March 1 of successive years, then wraps
+                feed = PhenologyFeed(store, "Beijing")
+                if [feed.date_for(cycle, 1) for cycle in range(3)] != [
+                        datetime.date(2020, 3, 1), datetime.date(2021, 3, 1), datetime.date(2020, 3, 1)]:
+                    raise ValueError("Cycle to date mapping is wrong")
+                if feed.record(1, 1)["temperature"] != 11.0:
+                    raise ValueError("Feed returned the wrong record")
+            finally:
+                store.close()
+            
+            # Two observations for the same site and day are rejected
+            with open(csv_path, "a", encoding="utf-8") as f:
+                f.write("2020-03-02,Beijing,14.0,57,7.0,9.0,budding\n")
+            try:
+                convert([csv_path], data_path)
+            except ValueError:
+                pass
+            else:
+                raise ValueError("Duplicate observation was not rejected")
+        
+        print("✅ Observations convert, index by (site, date) and map to animation cycles")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Phenology data test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_lifecycle_timeline():
+    """Test compiled lifecycle timeline tables, bisect lookup and extra stages"""
+    print("\n🔍 Testing lifecycle timeline...")
+    
+    try:
+        from rose_animation import LifecycleTimeline, SeasonalRose
+        
+        # A real budding stage plus an empty stage that must be skipped
+        timeline = LifecycleTimeline((("bud", 10, "winter"), ("bloom", 20, "spring"), ("pause", 0, "spring"),
+                                      ("maintain", 30, "summer"), ("reset", 5, "winter")),
+                                     day_spans={"spring": (1, 10), "summer": (11, 15)}, dormant_day=25)
+        if timeline.cycle != 65 or timeline.ends != [10, 30, 30, 60, 65]:
+            raise ValueError(f"Unexpected boundaries {timeline.ends}")
+        if timeline.frames[0] != ("bud", 0, 0.0, "winter", 25):
+            raise ValueError(f"Unexpected first frame {timeline.frames[0]}")
+        if timeline.frames[20] != ("bloom", 10, 0.5, "spring", 6):
+            raise ValueError(f"Unexpected bloom frame {timeline.frames[20]}")
+        if timeline.frames[30][0] != "maintain" or timeline.stage_at(95) != timeline.stage_ids["maintain"]:
+            raise ValueError("Empty stage was not skipped or lookup did not wrap")
+        if timeline.frame_stage[64] != timeline.stage_ids["reset"] or timeline.frame_day[45] != 18:
+            raise ValueError("Array tables disagree with frame tuples")
+        if timeline.frame_for_day(11) != 30 or [name for name, _, _ in timeline.spans()] != [
+                "bud", "bloom", "maintain", "reset"]:
+            raise ValueError("Day lookup or stage spans are wrong")
+        
+        # The rose's own timeline maps days exactly like the 25/40/30 season split
+        rose_timeline = SeasonalRose.compile_timeline()
+        if rose_timeline.cycle != 900 or SeasonalRose.compile_timeline() is not rose_timeline:
+            raise ValueError("Rose timeline length is wrong or was not cached")
+        for position, day in ((0, 1), (224, 25), (225, 26), (599, 65), (600, 66), (824, 95), (899, 95)):
+            if rose_timeline.frames[position][4] != day:
+                raise ValueError(f"Cycle position {position} maps to day {rose_timeline.frames[position][4]}")
+        
+        # Changed durations on a subclass or an instance take effect on the next update
+        class ShortRose(SeasonalRose):
+            bloom_duration = 100
+        
+        rose = ShortRose()
+        if rose.total_cycle_duration != 775 or rose.timeline.ends[1] != 100 or ShortRose.bloom_duration != 100:
+            raise ValueError("Subclass durations were not used for the timeline")
+        compiled = rose.timeline
+        rose.update()
+        if rose.timeline is not compiled:
+            raise ValueError("Timeline was recompiled without a duration change")
+        rose.maintain_duration = 50
+        if ShortRose.maintain_duration != SeasonalRose.maintain_duration:
+            raise ValueError("Instance assignment leaked into the class duration")
+        while rose.frame_count < 120:
+            rose.update()
+        if rose.total_cycle_duration != 450 or rose.life_stage != "maintain" or rose.stage_progress != 0.4:
+            raise ValueError(f"Instance durations ignored: {rose.life_stage} {rose.stage_progress}")
+        if len(rose.petal_tracks.maintain) != 50:
+            raise ValueError("Petal tracks were not re-baked for the new maintain duration")
+        
+        print("✅ Timeline tables resolve stage, progress, season and day per frame")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Lifecycle timeline test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_petal_draw_order():
+    """Test persistent petal draw order against a full sort"""
+    print("\n🔍 Testing petal draw order...")
+    
+    try:
+        import numpy as np
+        from rose_animation import PetalDrawOrder
+        
+        rng = np.random.default_rng(5)
+        layers = np.repeat([0, 1, 2], 6)
+        y = rng.uniform(0, 100, 18)
+        order = PetalDrawOrder(layers, y)
+        is_falling = np.zeros(18, dtype=bool)
+        
+        def expected(positions):
+            return sorted(range(18), key=lambda i: (-layers[i], positions[i], i))
+        
+        for frame in range(40):
+            y = y + rng.uniform(-1, 1, 18)
+            if frame < 10:
+                order.set_static_y(y)  # geometry still changing, as in the bloom stage
+            if frame in (12, 15, 20):
+                is_falling[rng.choice(18, 3, replace=False)] = True
+            y[is_falling] += rng.uniform(0, 8, int(is_falling.sum()))  # falling petals overtake each other
+            positions = np.stack([np.zeros(18), y], axis=1)
+            static_y = np.where(is_falling, y, [key[1] for key in order.static_keys])
+            if order.update(is_falling, positions) != expected(static_y):
+                raise ValueError(f"Draw order differs from a full sort at frame {frame}")
+        
+        print("✅ Persistent draw order matches a full sort")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Petal draw order test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_ambient_light():
+    """Test cached ambient light against the original per-frame ring drawing"""
+    print("\n🔍 Testing ambient light cache...")
+    
+    try:
+        import pygame
+        import numpy as np
+        from rose_animation import AmbientLightCache, SEASON_LIGHT_COLORS
+        
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((1, 1))  # convert_alpha needs a video mode
+        
+        cache = AmbientLightCache()
+        center = (300, 300)
+        for season, (color, max_alpha) in SEASON_LIGHT_COLORS.items():
+            intensity = 0.5
+            # Original drawing: rings from the inside out on a full-screen overlay
+            expected = pygame.Surface((600, 600)).convert()
+            expected.fill((30, 60, 90))
+            overlay = pygame.Surface((600, 600), pygame.SRCALPHA)
+            light_alpha = int(intensity * max_alpha)
+            for radius in range(50, 300, 20):
+                alpha = int(light_alpha * (300 - radius) / 300)
+                if alpha > 0:
+                    pygame.draw.circle(overlay, (*color, alpha), center, radius)
+            expected.blit(overlay, (0, 0))
+            
+            cached = pygame.Surface((600, 600)).convert()
+            cached.fill((30, 60, 90))
+            cache.draw(cached, season, intensity, center)
+            diff = np.abs(pygame.surfarray.array3d(expected).astype(int) - pygame.surfarray.array3d(cached)).max()
+            if diff > 2:
+                raise ValueError(f"{season} light differs from the original by {diff}")
+        
+        print("✅ Cached ambient light matches the original drawing")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Ambient light test failed: {e}")
+        traceback.print_exc()
+        return False
+
+def test_seasonal_background():
+    """Test baked season gradients and the season cross-fade"""
+    print("\n🔍 Testing seasonal background...")
+    
+    try:
+        import pygame
+        from rose_animation import SCREEN_HEIGHT, SCREEN_WIDTH, SEASON_FADE_FRAMES, SEASON_GRADIENTS, SeasonalBackground
+        
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((1, 1))  # convert needs a video mode
+        
+        background = SeasonalBackground()
+        screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        
+        # The baked gradient matches the original per-line drawing
+        top_color, bottom_color = SEASON_GRADIENTS["autumn"]
+        baked = background.get_surface("autumn")
+        for y in (0, 1, SCREEN_HEIGHT // 3, SCREEN_HEIGHT // 2, SCREEN_HEIGHT - 1):
+            ratio = y / SCREEN_HEIGHT
+            expected = tuple(int(top * (1 - ratio) + bottom * ratio) for top, bottom in zip(top_color, bottom_color))
+            for x in (0, SCREEN_WIDTH // 2, SCREEN_WIDTH - 1):
+                if tuple(baked.get_at((x, y)))[:3] != expected:
+                    raise ValueError(f"Gradient pixel ({x}, {y}) is {tuple(baked.get_at((x, y)))}, expected {expected}")
+        
+        # A season change cross-fades and ends on the new season's surface
+        background.set_season("spring")
+        background.set_season("summer")
+        background.draw(screen)
+        if not background.is_fading or screen.get_at((0, 0)) == background.get_surface("summer").get_at((0, 0)):
+            raise ValueError("Season change did not start a cross-fade")
+        for _ in range(SEASON_FADE_FRAMES):
+            background.update()
+        background.draw(screen)
+        summer = background.get_surface("summer")
+        if background.is_fading or any(screen.get_at((SCREEN_WIDTH // 2, y)) != summer.get_at((SCREEN_WIDTH // 2, y))
+                                       for y in (0, SCREEN_HEIGHT // 2, SCREEN_HEIGHT - 1)):
+            raise ValueError(f"Cross-fade did not reach the new season after {SEASON_FADE_FRAMES} frames")
+        
+        print(f"✅ Baked gradients match the per-line drawing and fade over {SEASON_FADE_FRAMES} frames")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Seasonal background test failed: {e}")
+        traceback.print_exc()
+        return False
+
 def main():
     """Run all tests"""
     print("🚀 Starting comprehensive GitHub deployment test...\n")
@@ -209,6 +1242,29 @@ def main():
         test_data_configuration,
         test_core_classes,
         test_animation_logic,
+        test_particle_store,
+        test_random_streams,
+        test_seek,
+        test_periodic_state,
+        test_simulation_clock,
+        test_quality_governor,
+        test_frame_profiler,
+        test_benchmark_compare,
+        test_text_cache,
+        test_ui_compositor,
+        test_dirty_rect_tracker,
+        test_rose_garden,
+        test_camera_culling,
+        test_easing_tables,
+        test_palette_registry,
+        test_frame_capture,
+        test_cycle_archive,
+        test_petal_tracks,
+        test_phenology_data,
+        test_lifecycle_timeline,
+        test_petal_draw_order,
+        test_ambient_light,
+        test_seasonal_background,
     ]
     
     passed = 0